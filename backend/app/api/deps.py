@@ -0,0 +1,79 @@
+"""
+Shared API dependencies.
+"""
+
+import secrets
+from typing import Any, Optional
+
+from fastapi import Depends, Header, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.http_cache import http_date, not_modified
+from app.db.session import get_session
+from app.models import Document, Hack, Homebrew, Translation, Utility
+
+
+async def require_admin(
+    x_admin_token: Optional[str] = Header(None, description="Admin token from settings"),
+) -> None:
+    """
+    Allow the request only if it carries the configured admin token.
+
+    Admin endpoints are disabled entirely while ``ADMIN_TOKEN`` is unset.
+
+    Raises:
+        HTTPException: 403 if admin endpoints are disabled or the token is wrong
+    """
+    if not settings.admin_token or not secrets.compare_digest(
+        x_admin_token or "", settings.admin_token
+    ):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+class LastModified:
+    """
+    Route dependency answering ``If-Modified-Since`` from a row's ``lastmod``.
+
+    Looks up only the modification time of the requested row (by the path
+    parameter named after its primary key column) before the endpoint runs
+    its full query, and ends the request with 304 if the client's copy is
+    current. Otherwise returns the ``Last-Modified`` header for the endpoint
+    to set on the response it builds (empty if the row has no ``lastmod``).
+    Requests carrying ``If-None-Match`` are left to ETag validation.
+
+    Args:
+        lastmod: Modification time column
+        pk: Primary key column; its name is the path parameter
+    """
+
+    def __init__(self, lastmod: Any, pk: Any) -> None:
+        self.lastmod = lastmod
+        self.pk = pk
+
+    async def __call__(
+        self,
+        request: Request,
+        session: AsyncSession = Depends(get_session),
+    ) -> dict[str, str]:
+        try:
+            key = int(request.path_params[self.pk.key])
+        except (KeyError, ValueError):
+            return {}  # Invalid keys are rejected by the endpoint itself
+        result = await session.execute(select(self.lastmod).where(self.pk == key))
+        lastmod = result.scalar()
+        if lastmod is None:
+            return {}
+        last_modified = http_date(lastmod)
+        if not_modified(request.headers, None, last_modified):
+            raise HTTPException(status_code=304, headers={"Last-Modified": last_modified})
+        return {"Last-Modified": last_modified}
+
+
+# Detail endpoints of entities with a modification time
+hack_last_modified = LastModified(Hack.lastmod, Hack.hackkey)
+translation_last_modified = LastModified(Translation.lastmod, Translation.transkey)
+utility_last_modified = LastModified(Utility.lastmod, Utility.utilkey)
+document_last_modified = LastModified(Document.lastmod, Document.dockey)
+homebrew_last_modified = LastModified(Homebrew.lastmod, Homebrew.homebrewkey)
@@ -6,6 +6,8 @@ Includes all endpoint routers for version 1 of the API.
 from fastapi import APIRouter
 
 from app.api.v1 import (
+    batch,
+    cache,
     documents,
     games,
     hacks,
@@ -13,6 +15,7 @@ from app.api.v1 import (
     homebrew,
     logs,
     metadata,
+    search,
     translations,
     utilities,
 )
@@ -38,3 +41,12 @@ router.include_router(utilities.router)
 router.include_router(documents.router)
 router.include_router(homebrew.router)
 
+# Global search
+router.include_router(search.router)
+
+# Response cache
+router.include_router(cache.router)
+
+# Batched sub-requests
+router.include_router(batch.router)
+
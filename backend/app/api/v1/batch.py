@@ -0,0 +1,27 @@
+"""
+Batch API endpoint.
+Runs several GET requests to the v1 API in a single call.
+"""
+
+from fastapi import APIRouter, Request, Response
+
+from app.core.serialization import json_response
+from app.schemas import BatchRequest, BatchResult
+from app.services import batch_service
+
+router = APIRouter(prefix="/batch", tags=["Batch"])
+
+
+@router.post(
+    "",
+    response_model=BatchResult,
+    summary="Run several requests",
+    description=(
+        "Run GET requests to other v1 endpoints concurrently on the server and return "
+        "every response, with its status, in one reply. Paths are relative to /api/v1."
+    ),
+)
+async def run_batch(batch: BatchRequest, request: Request) -> Response:
+    """Run a batch of GET sub-requests."""
+    payload = await batch_service.run(request.app, batch.requests, request.scope)
+    return json_response(payload)
@@ -0,0 +1,108 @@
+"""
+Response cache endpoints.
+Declares which content routes are cached and exposes cache statistics
+and invalidation.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.routing import APIRoute
+
+from app.api.deps import require_admin
+from app.api.v1 import documents, games, hacks, homebrew, translations, utilities
+from app.core.config import settings
+from app.core.response_cache import CachedRoute, CachePolicy, response_cache
+from app.models import Document, Game, Hack, Homebrew, Translation, Utility
+from app.schemas import CacheInvalidateResponse, ResponseCacheStats
+
+router = APIRouter(prefix="/cache", tags=["Cache"])
+
+
+def _sorts(model: Any) -> frozenset[str]:
+    """Sort fields the list services accept for ``model``."""
+    return frozenset(model.__table__.columns.keys()) | {"relevance"}
+
+
+def _policies() -> Mapping[str, CachePolicy]:
+    """
+    Cached routes by path, with the tables each response is built from.
+
+    Global search is not cached: its sections may time out, and partial
+    results must not be replayed.
+    """
+    list_ttl = settings.response_cache_list_ttl_seconds
+    detail_ttl = settings.response_cache_detail_ttl_seconds
+    games = frozenset({"gamedata", "hacks", "transdata"})
+    hacks = frozenset({"hacks", "gamedata", "hackimages"})
+    translations = frozenset({"transdata", "gamedata", "transimage"})
+    utilities = frozenset({"utilities", "gamedata"})
+    documents = frozenset({"documents", "gamedata"})
+    # A game detail counts, and may embed, every kind of related content
+    game_detail = games | hacks | translations | utilities | documents
+    return {
+        "/api/v1/games": CachePolicy(list_ttl, games, _sorts(Game)),
+        "/api/v1/games/{gamekey}": CachePolicy(detail_ttl, game_detail),
+        "/api/v1/games/{gamekey}/hacks": CachePolicy(list_ttl, hacks),
+        "/api/v1/games/{gamekey}/translations": CachePolicy(list_ttl, translations),
+        "/api/v1/games/{gamekey}/utilities": CachePolicy(list_ttl, utilities),
+        "/api/v1/games/{gamekey}/documents": CachePolicy(list_ttl, documents),
+        "/api/v1/hacks": CachePolicy(list_ttl, hacks, _sorts(Hack)),
+        "/api/v1/hacks/{hackkey}": CachePolicy(detail_ttl, hacks),
+        "/api/v1/hacks/{hackkey}/images": CachePolicy(detail_ttl, hacks),
+        "/api/v1/translations": CachePolicy(list_ttl, translations, _sorts(Translation)),
+        "/api/v1/translations/{transkey}": CachePolicy(detail_ttl, translations),
+        "/api/v1/translations/{transkey}/images": CachePolicy(detail_ttl, translations),
+        "/api/v1/utilities": CachePolicy(list_ttl, utilities, _sorts(Utility)),
+        "/api/v1/utilities/{utilkey}": CachePolicy(detail_ttl, utilities),
+        "/api/v1/documents": CachePolicy(list_ttl, documents, _sorts(Document)),
+        "/api/v1/documents/{dockey}": CachePolicy(detail_ttl, documents),
+        "/api/v1/homebrew": CachePolicy(list_ttl, frozenset({"homebrew"}), _sorts(Homebrew)),
+        "/api/v1/homebrew/{homebrewkey}": CachePolicy(detail_ttl, frozenset({"homebrew"})),
+    }
+
+
+def cached_routes(prefix: str = "/api/v1") -> list[CachedRoute]:
+    """Endpoints of the content routers that have a cache policy."""
+    policies = _policies()
+    found = []
+    for module in (games, hacks, translations, utilities, documents, homebrew):
+        for route in module.router.routes:
+            if isinstance(route, APIRoute) and "GET" in route.methods:
+                policy = policies.get(prefix + route.path)
+                if policy is not None:
+                    found.append(CachedRoute(prefix + route.path, route, policy))
+    return found
+
+
+@router.get(
+    "/stats",
+    response_model=ResponseCacheStats,
+    summary="Response cache statistics",
+    description="Size, memory budget and hit/miss counters of the response cache.",
+)
+async def get_cache_stats() -> ResponseCacheStats:
+    """Get response cache statistics."""
+    stats = await response_cache.stats()
+    return ResponseCacheStats(enabled=settings.response_cache_enabled, **stats)
+
+
+@router.post(
+    "/invalidate",
+    response_model=CacheInvalidateResponse,
+    summary="Invalidate cached responses",
+    description=(
+        "Drops cached responses built from the given tables, or all of them "
+        "(requires X-Admin-Token)."
+    ),
+    dependencies=[Depends(require_admin)],
+)
+async def invalidate_cache(
+    tables: Optional[str] = Query(
+        None, description="Comma-separated table names (default: everything)"
+    ),
+) -> CacheInvalidateResponse:
+    """Drop cached responses."""
+    names = [t.strip() for t in tables.split(",") if t.strip()] if tables else None
+    return CacheInvalidateResponse(dropped=await response_cache.invalidate(names))
@@ -3,23 +3,43 @@ Games API endpoints.
 Provides access to game data with filtering and pagination.
 """
 
-from typing import Optional
+from typing import Optional, Union
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.serialization import json_response
 from app.db.session import get_session
-from app.schemas import GameDetail, GameListItem, HackListItem, PaginatedResponse, TranslationListItem
-from app.services import game_service, hack_service, translation_service
+from app.schemas import (
+    BatchResponse,
+    DocumentListItem,
+    GameDetail,
+    GameDetailWithIncludes,
+    GameListItem,
+    HackListItem,
+    PaginatedResponse,
+    TranslationListItem,
+    UtilityListItem,
+)
+from app.services import (
+    document_service,
+    game_service,
+    hack_service,
+    translation_service,
+    utility_service,
+)
 
 router = APIRouter(prefix="/games", tags=["Games"])
 
 
 @router.get(
     "",
-    response_model=PaginatedResponse[GameListItem],
+    response_model=Union[PaginatedResponse[GameListItem], BatchResponse[GameDetail]],
     summary="List games",
-    description="Get a paginated list of games with optional filters.",
+    description=(
+        "Get a paginated list of games with optional filters. "
+        "With ids, returns the details of those games instead, in the requested order."
+    ),
 )
 async def list_games(
     session: AsyncSession = Depends(get_session),
@@ -30,11 +50,38 @@ async def list_games(
     has_translations: Optional[bool] = Query(None, description="Filter games with translations"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=200, description="Items per page"),
-    sort_by: str = Query("gametitle", description="Sort field"),
+    sort_by: str = Query("gametitle", description="Sort field (or relevance when searching)"),
     sort_order: str = Query("asc", description="Sort order (asc/desc)"),
-) -> PaginatedResponse[GameListItem]:
+    cursor: Optional[str] = Query(
+        None, description="Keyset cursor from a previous response's next_cursor (overrides page)"
+    ),
+    include_total: bool = Query(True, description="Compute the total item count"),
+    count_mode: str = Query(
+        "exact", pattern="^(exact|estimate)$", description="Total count mode (exact/estimate)"
+    ),
+    search_mode: str = Query(
+        "auto",
+        pattern="^(auto|substring|natural|boolean)$",
+        description="Title search mode (auto/substring/natural/boolean)",
+    ),
+    fuzzy: bool = Query(
+        False, description="Typo-tolerant title search ranked by similarity (overrides search_mode)"
+    ),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return (default: all)"
+    ),
+    ids: Optional[str] = Query(
+        None,
+        description=(
+            "Comma-separated IDs to look up instead of listing; other filters are "
+            "ignored and IDs that do not exist are reported in missing"
+        ),
+    ),
+) -> Response:
     """Get paginated list of games."""
-    return await game_service.get_games(
+    if ids is not None:
+        return json_response(await game_service.get_games_by_ids(session, ids, fields=fields))
+    payload = await game_service.get_games(
         session,
         q=q,
         platform=platform,
@@ -45,21 +92,49 @@ async def list_games(
         page_size=page_size,
         sort_by=sort_by,
         sort_order=sort_order,
+        cursor=cursor,
+        include_total=include_total,
+        count_mode=count_mode,
+        search_mode=search_mode,
+        fuzzy=fuzzy,
+        fields=fields,
     )
+    return json_response(payload)
 
 
 @router.get(
     "/{gamekey}",
-    response_model=GameDetail,
+    response_model=GameDetailWithIncludes,
     summary="Get game details",
-    description="Get detailed information for a single game.",
+    description=(
+        "Get detailed information for a single game. Related content listed in "
+        "include is embedded as the first page of each section."
+    ),
 )
 async def get_game(
     gamekey: int,
     session: AsyncSession = Depends(get_session),
-) -> GameDetail:
-    """Get a single game by ID."""
-    return await game_service.get_game(session, gamekey)
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return (default: all)"
+    ),
+    include: Optional[str] = Query(
+        None,
+        description=(
+            "Comma-separated related sections to embed "
+            "(hacks, translations, utilities, documents)"
+        ),
+    ),
+    include_page_size: int = Query(50, ge=1, le=200, description="Items per embedded section"),
+) -> Response:
+    """Get a single game by ID, with its related content when included."""
+    payload = await game_service.get_game(
+        session,
+        gamekey,
+        fields=fields,
+        include=include,
+        include_page_size=include_page_size,
+    )
+    return json_response(payload)
 
 
 @router.get(
@@ -73,11 +148,21 @@ async def get_game_hacks(
     session: AsyncSession = Depends(get_session),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=200, description="Items per page"),
-) -> PaginatedResponse[HackListItem]:
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous page"),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return (default: all)"
+    ),
+) -> Response:
     """Get hacks for a specific game."""
-    return await hack_service.get_hacks_for_game(
-        session, gamekey, page=page, page_size=page_size
+    payload = await hack_service.get_hacks_for_game(
+        session,
+        gamekey,
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        fields=fields,
     )
+    return json_response(payload)
 
 
 @router.get(
@@ -91,8 +176,74 @@ async def get_game_translations(
     session: AsyncSession = Depends(get_session),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=200, description="Items per page"),
-) -> PaginatedResponse[TranslationListItem]:
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous page"),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return (default: all)"
+    ),
+) -> Response:
     """Get translations for a specific game."""
-    return await translation_service.get_translations_for_game(
-        session, gamekey, page=page, page_size=page_size
+    payload = await translation_service.get_translations_for_game(
+        session,
+        gamekey,
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        fields=fields,
+    )
+    return json_response(payload)
+
+
+@router.get(
+    "/{gamekey}/utilities",
+    response_model=PaginatedResponse[UtilityListItem],
+    summary="Get game utilities",
+    description="Get all utilities for a specific game.",
+)
+async def get_game_utilities(
+    gamekey: int,
+    session: AsyncSession = Depends(get_session),
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(50, ge=1, le=200, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous page"),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return (default: all)"
+    ),
+) -> Response:
+    """Get utilities for a specific game."""
+    payload = await utility_service.get_utilities_for_game(
+        session,
+        gamekey,
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        fields=fields,
+    )
+    return json_response(payload)
+
+
+@router.get(
+    "/{gamekey}/documents",
+    response_model=PaginatedResponse[DocumentListItem],
+    summary="Get game documents",
+    description="Get all documents for a specific game.",
+)
+async def get_game_documents(
+    gamekey: int,
+    session: AsyncSession = Depends(get_session),
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(50, ge=1, le=200, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous page"),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return (default: all)"
+    ),
+) -> Response:
+    """Get documents for a specific game."""
+    payload = await document_service.get_documents_for_game(
+        session,
+        gamekey,
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        fields=fields,
     )
+    return json_response(payload)
@@ -3,13 +3,21 @@ Hacks API endpoints.
 Provides access to ROM hack data with filtering and pagination.
 """
 
-from typing import Optional
+from typing import Optional, Union
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import hack_last_modified
+from app.core.serialization import json_response
 from app.db.session import get_session
-from app.schemas import HackDetail, HackImageResponse, HackListItem, PaginatedResponse
+from app.schemas import (
+    BatchResponse,
+    HackDetail,
+    HackImageResponse,
+    HackListItem,
+    PaginatedResponse,
+)
 from app.services import hack_service
 
 router = APIRouter(prefix="/hacks", tags=["Hacks"])
@@ -17,9 +25,12 @@ router = APIRouter(prefix="/hacks", tags=["Hacks"])
 
 @router.get(
     "",
-    response_model=PaginatedResponse[HackListItem],
+    response_model=Union[PaginatedResponse[HackListItem], BatchResponse[HackDetail]],
     summary="List hacks",
-    description="Get a paginated list of ROM hacks with optional filters.",
+    description=(
+        "Get a paginated list of ROM hacks with optional filters. "
+        "With ids, returns the details of those hacks instead, in the requested order."
+    ),
 )
 async def list_hacks(
     session: AsyncSession = Depends(get_session),
@@ -29,11 +40,46 @@ async def list_hacks(
     category: Optional[int] = Query(None, description="Filter by category ID"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=200, description="Items per page"),
-    sort_by: str = Query("hacktitle", description="Sort field"),
+    sort_by: str = Query("hacktitle", description="Sort field (or relevance when searching)"),
     sort_order: str = Query("asc", description="Sort order (asc/desc)"),
-) -> PaginatedResponse[HackListItem]:
+    cursor: Optional[str] = Query(
+        None, description="Keyset cursor from a previous response's next_cursor (overrides page)"
+    ),
+    include_total: bool = Query(True, description="Compute the total item count"),
+    count_mode: str = Query(
+        "exact", pattern="^(exact|estimate)$", description="Total count mode (exact/estimate)"
+    ),
+    search_mode: str = Query(
+        "auto",
+        pattern="^(auto|substring|natural|boolean)$",
+        description="Title search mode (auto/substring/natural/boolean)",
+    ),
+    fuzzy: bool = Query(
+        False, description="Typo-tolerant title search ranked by similarity (overrides search_mode)"
+    ),
+    q_scope: str = Query(
+        "title",
+        pattern="^(title|description)$",
+        description="Match q against the title, or title and description (BM25-ranked)",
+    ),
+    facets: Optional[str] = Query(
+        None, description="Comma-separated facets to count per value (console, category)"
+    ),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return (default: all)"
+    ),
+    ids: Optional[str] = Query(
+        None,
+        description=(
+            "Comma-separated IDs to look up instead of listing; other filters are "
+            "ignored and IDs that do not exist are reported in missing"
+        ),
+    ),
+) -> Response:
     """Get paginated list of hacks."""
-    return await hack_service.get_hacks(
+    if ids is not None:
+        return json_response(await hack_service.get_hacks_by_ids(session, ids, fields=fields))
+    payload = await hack_service.get_hacks(
         session,
         q=q,
         game=game,
@@ -43,7 +89,16 @@ async def list_hacks(
         page_size=page_size,
         sort_by=sort_by,
         sort_order=sort_order,
+        cursor=cursor,
+        include_total=include_total,
+        count_mode=count_mode,
+        search_mode=search_mode,
+        fuzzy=fuzzy,
+        q_scope=q_scope,
+        facets=facets,
+        fields=fields,
     )
+    return json_response(payload)
 
 
 @router.get(
@@ -55,9 +110,14 @@ async def list_hacks(
 async def get_hack(
     hackkey: int,
     session: AsyncSession = Depends(get_session),
-) -> HackDetail:
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return (default: all)"
+    ),
+    validators: dict[str, str] = Depends(hack_last_modified),
+) -> Response:
     """Get a single hack by ID."""
-    return await hack_service.get_hack(session, hackkey)
+    payload = await hack_service.get_hack(session, hackkey, fields=fields)
+    return json_response(payload, headers=validators)
 
 
 @router.get(
@@ -3,13 +3,15 @@ Homebrew API endpoints.
 Provides access to homebrew games with filtering and pagination.
 """
 
-from typing import Optional
+from typing import Optional, Union
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import homebrew_last_modified
+from app.core.serialization import json_response
 from app.db.session import get_session
-from app.schemas.common import PaginatedResponse
+from app.schemas.common import BatchResponse, PaginatedResponse
 from app.schemas.homebrew import HomebrewDetail, HomebrewListItem
 from app.services.homebrew_service import homebrew_service
 
@@ -18,9 +20,12 @@ router = APIRouter(prefix="/homebrew", tags=["Homebrew"])
 
 @router.get(
     "",
-    response_model=PaginatedResponse[HomebrewListItem],
+    response_model=Union[PaginatedResponse[HomebrewListItem], BatchResponse[HomebrewDetail]],
     summary="List homebrew",
-    description="Get a paginated list of homebrew games with optional filters.",
+    description=(
+        "Get a paginated list of homebrew games with optional filters. "
+        "With ids, returns the details of those homebrew games instead, in the requested order."
+    ),
 )
 async def list_homebrew(
     session: AsyncSession = Depends(get_session),
@@ -29,11 +34,39 @@ async def list_homebrew(
     platform: Optional[int] = Query(None, description="Filter by platform ID"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=200, description="Items per page"),
-    sort_by: str = Query("title", description="Sort field"),
+    sort_by: str = Query("title", description="Sort field (or relevance when searching descriptions)"),
     sort_order: str = Query("asc", description="Sort order (asc/desc)"),
-) -> PaginatedResponse[HomebrewListItem]:
+    cursor: Optional[str] = Query(
+        None, description="Keyset cursor from a previous response's next_cursor (overrides page)"
+    ),
+    include_total: bool = Query(True, description="Compute the total item count"),
+    count_mode: str = Query(
+        "exact", pattern="^(exact|estimate)$", description="Total count mode (exact/estimate)"
+    ),
+    q_scope: str = Query(
+        "title",
+        pattern="^(title|description)$",
+        description="Match q against the title, or title and description (BM25-ranked)",
+    ),
+    facets: Optional[str] = Query(
+        None, description="Comma-separated facets to count per value (category, platform)"
+    ),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return (default: all)"
+    ),
+    ids: Optional[str] = Query(
+        None,
+        description=(
+            "Comma-separated IDs to look up instead of listing; other filters are "
+            "ignored and IDs that do not exist are reported in missing"
+        ),
+    ),
+) -> Response:
     """Get paginated list of homebrew games."""
-    return await homebrew_service.get_homebrews(
+    if ids is not None:
+        payload = await homebrew_service.get_homebrews_by_ids(session, ids, fields=fields)
+        return json_response(payload)
+    payload = await homebrew_service.get_homebrews(
         session,
         q=q,
         category=category,
@@ -42,7 +75,14 @@ async def list_homebrew(
         page_size=page_size,
         sort_by=sort_by,
         sort_order=sort_order,
+        cursor=cursor,
+        include_total=include_total,
+        count_mode=count_mode,
+        q_scope=q_scope,
+        facets=facets,
+        fields=fields,
     )
+    return json_response(payload)
 
 
 @router.get(
@@ -54,6 +94,11 @@ async def list_homebrew(
 async def get_homebrew(
     homebrewkey: int,
     session: AsyncSession = Depends(get_session),
-) -> HomebrewDetail:
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return (default: all)"
+    ),
+    validators: dict[str, str] = Depends(homebrew_last_modified),
+) -> Response:
     """Get a single homebrew game by ID."""
-    return await homebrew_service.get_homebrew(session, homebrewkey)
+    payload = await homebrew_service.get_homebrew(session, homebrewkey, fields=fields)
+    return json_response(payload, headers=validators)
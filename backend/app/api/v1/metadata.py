@@ -1,12 +1,13 @@
 """
 Metadata API endpoints.
 Provides cached lookup data for consoles, genres, languages, etc.
+All lookup routes are served from the in-memory metadata store.
 """
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, Request, Response
 
-from app.db.session import get_session
+from app.api.deps import require_admin
+from app.core.config import settings
 from app.schemas import (
     AllMetadataResponse,
     CategoryResponse,
@@ -15,6 +16,7 @@ from app.schemas import (
     HacksCatResponse,
     HomebrewCatResponse,
     LanguageResponse,
+    MetadataVersionResponse,
     OSResponse,
     PatchStatusResponse,
     SkillLevelResponse,
@@ -24,6 +26,15 @@ from app.services import metadata_service
 
 router = APIRouter(prefix="/metadata", tags=["Metadata"])
 
+# Bodies are content-addressed by ETag, so clients may keep them long and revalidate cheaply
+CACHE_CONTROL = f"public, max-age={settings.metadata_cache_max_age_seconds}"
+
+
+async def _rendered(request: Request, name: str) -> Response:
+    """Serve a pre-rendered metadata payload, honoring If-None-Match."""
+    store = await metadata_service.get_store()
+    return store.rendered[name].response(request, CACHE_CONTROL)
+
 
 @router.get(
     "",
@@ -31,33 +42,34 @@ router = APIRouter(prefix="/metadata", tags=["Metadata"])
     summary="Get all metadata",
     description="Returns all lookup tables in a single request for initial app load.",
 )
-async def get_all_metadata(
-    session: AsyncSession = Depends(get_session),
-) -> AllMetadataResponse:
+async def get_all_metadata(request: Request) -> Response:
     """Get all metadata for initial app load."""
-    consoles = await metadata_service.get_consoles(session)
-    genres = await metadata_service.get_genres(session)
-    languages = await metadata_service.get_languages(session)
-    patch_statuses = await metadata_service.get_patch_statuses(session)
-    hack_categories = await metadata_service.get_hack_categories(session)
-    util_categories = await metadata_service.get_util_categories(session)
-    doc_categories = await metadata_service.get_categories(session)
-    homebrew_categories = await metadata_service.get_homebrew_categories(session)
-    skill_levels = await metadata_service.get_skill_levels(session)
-    operating_systems = await metadata_service.get_operating_systems(session)
-
-    return AllMetadataResponse(
-        consoles=[ConsoleResponse.model_validate(c) for c in consoles],
-        genres=[GenreResponse.model_validate(g) for g in genres],
-        languages=[LanguageResponse.model_validate(l) for l in languages],
-        patch_statuses=[PatchStatusResponse.model_validate(p) for p in patch_statuses],
-        hack_categories=[HacksCatResponse.model_validate(h) for h in hack_categories],
-        util_categories=[UtilCatResponse.model_validate(u) for u in util_categories],
-        doc_categories=[CategoryResponse.model_validate(d) for d in doc_categories],
-        homebrew_categories=[HomebrewCatResponse.model_validate(h) for h in homebrew_categories],
-        skill_levels=[SkillLevelResponse.model_validate(s) for s in skill_levels],
-        operating_systems=[OSResponse.model_validate(o) for o in operating_systems],
-    )
+    return await _rendered(request, "all")
+
+
+@router.get(
+    "/version",
+    response_model=MetadataVersionResponse,
+    summary="Get metadata version",
+    description="Returns the content version of the lookup data, for client-side caching.",
+)
+async def get_metadata_version() -> MetadataVersionResponse:
+    """Get the metadata store version."""
+    store = await metadata_service.get_store()
+    return MetadataVersionResponse(version=store.version, loaded_at=store.loaded_at)
+
+
+@router.post(
+    "/reload",
+    response_model=MetadataVersionResponse,
+    summary="Reload metadata",
+    description="Reloads all lookup tables from the database (requires X-Admin-Token).",
+    dependencies=[Depends(require_admin)],
+)
+async def reload_metadata() -> MetadataVersionResponse:
+    """Reload the metadata store from the database."""
+    store = await metadata_service.reload(shared=False)
+    return MetadataVersionResponse(version=store.version, loaded_at=store.loaded_at)
 
 
 @router.get(
@@ -66,12 +78,9 @@ async def get_all_metadata(
     summary="Get all consoles",
     description="Returns all gaming platforms/consoles.",
 )
-async def get_consoles(
-    session: AsyncSession = Depends(get_session),
-) -> list[ConsoleResponse]:
+async def get_consoles(request: Request) -> Response:
     """Get all consoles."""
-    consoles = await metadata_service.get_consoles(session)
-    return [ConsoleResponse.model_validate(c) for c in consoles]
+    return await _rendered(request, "consoles")
 
 
 @router.get(
@@ -80,12 +89,9 @@ async def get_consoles(
     summary="Get all genres",
     description="Returns all game genres.",
 )
-async def get_genres(
-    session: AsyncSession = Depends(get_session),
-) -> list[GenreResponse]:
+async def get_genres(request: Request) -> Response:
     """Get all genres."""
-    genres = await metadata_service.get_genres(session)
-    return [GenreResponse.model_validate(g) for g in genres]
+    return await _rendered(request, "genres")
 
 
 @router.get(
@@ -94,12 +100,9 @@ async def get_genres(
     summary="Get all languages",
     description="Returns all translation languages.",
 )
-async def get_languages(
-    session: AsyncSession = Depends(get_session),
-) -> list[LanguageResponse]:
+async def get_languages(request: Request) -> Response:
     """Get all languages."""
-    languages = await metadata_service.get_languages(session)
-    return [LanguageResponse.model_validate(l) for l in languages]
+    return await _rendered(request, "languages")
 
 
 @router.get(
@@ -108,12 +111,9 @@ async def get_languages(
     summary="Get all patch statuses",
     description="Returns all translation patch status options.",
 )
-async def get_patch_statuses(
-    session: AsyncSession = Depends(get_session),
-) -> list[PatchStatusResponse]:
+async def get_patch_statuses(request: Request) -> Response:
     """Get all patch statuses."""
-    statuses = await metadata_service.get_patch_statuses(session)
-    return [PatchStatusResponse.model_validate(s) for s in statuses]
+    return await _rendered(request, "patch_statuses")
 
 
 @router.get(
@@ -122,12 +122,9 @@ async def get_patch_statuses(
     summary="Get hack categories",
     description="Returns all ROM hack categories.",
 )
-async def get_hack_categories(
-    session: AsyncSession = Depends(get_session),
-) -> list[HacksCatResponse]:
+async def get_hack_categories(request: Request) -> Response:
     """Get hack categories."""
-    categories = await metadata_service.get_hack_categories(session)
-    return [HacksCatResponse.model_validate(c) for c in categories]
+    return await _rendered(request, "hack_categories")
 
 
 @router.get(
@@ -136,12 +133,9 @@ async def get_hack_categories(
     summary="Get utility categories",
     description="Returns all utility categories.",
 )
-async def get_util_categories(
-    session: AsyncSession = Depends(get_session),
-) -> list[UtilCatResponse]:
+async def get_util_categories(request: Request) -> Response:
     """Get utility categories."""
-    categories = await metadata_service.get_util_categories(session)
-    return [UtilCatResponse.model_validate(c) for c in categories]
+    return await _rendered(request, "util_categories")
 
 
 @router.get(
@@ -150,12 +144,9 @@ async def get_util_categories(
     summary="Get document categories",
     description="Returns all document categories.",
 )
-async def get_doc_categories(
-    session: AsyncSession = Depends(get_session),
-) -> list[CategoryResponse]:
+async def get_doc_categories(request: Request) -> Response:
     """Get document categories."""
-    categories = await metadata_service.get_categories(session)
-    return [CategoryResponse.model_validate(c) for c in categories]
+    return await _rendered(request, "doc_categories")
 
 
 @router.get(
@@ -164,12 +155,9 @@ async def get_doc_categories(
     summary="Get homebrew categories",
     description="Returns all homebrew categories.",
 )
-async def get_homebrew_categories(
-    session: AsyncSession = Depends(get_session),
-) -> list[HomebrewCatResponse]:
+async def get_homebrew_categories(request: Request) -> Response:
     """Get homebrew categories."""
-    categories = await metadata_service.get_homebrew_categories(session)
-    return [HomebrewCatResponse.model_validate(c) for c in categories]
+    return await _rendered(request, "homebrew_categories")
 
 
 @router.get(
@@ -178,12 +166,9 @@ async def get_homebrew_categories(
     summary="Get skill levels",
     description="Returns all document skill/experience levels.",
 )
-async def get_skill_levels(
-    session: AsyncSession = Depends(get_session),
-) -> list[SkillLevelResponse]:
+async def get_skill_levels(request: Request) -> Response:
     """Get skill levels."""
-    levels = await metadata_service.get_skill_levels(session)
-    return [SkillLevelResponse.model_validate(l) for l in levels]
+    return await _rendered(request, "skill_levels")
 
 
 @router.get(
@@ -192,9 +177,6 @@ async def get_skill_levels(
     summary="Get operating systems",
     description="Returns all operating systems (for utilities).",
 )
-async def get_operating_systems(
-    session: AsyncSession = Depends(get_session),
-) -> list[OSResponse]:
+async def get_operating_systems(request: Request) -> Response:
     """Get operating systems."""
-    operating_systems = await metadata_service.get_operating_systems(session)
-    return [OSResponse.model_validate(o) for o in operating_systems]
+    return await _rendered(request, "operating_systems")
@@ -0,0 +1,74 @@
+"""
+Global search API endpoint.
+Searches all content sections in a single request.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Query
+
+from app.core.config import settings
+from app.schemas import GlobalSearchResponse, SuggestResponse
+from app.services import search_service
+from app.services.title_index import SUGGEST_MAX_LIMIT
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+def _split_sections(sections: Optional[str]) -> Optional[list[str]]:
+    """Parse a comma-separated ``sections`` parameter."""
+    if not sections:
+        return None
+    return [s.strip() for s in sections.split(",") if s.strip()]
+
+
+@router.get(
+    "",
+    response_model=GlobalSearchResponse,
+    summary="Global search",
+    description=(
+        "Search games, hacks, translations, utilities, documents and homebrew concurrently. "
+        "Sections that miss the time budget are returned with status \"timeout\"."
+    ),
+)
+async def global_search(
+    q: str = Query(..., min_length=1, description="Search query for titles"),
+    limit: int = Query(
+        settings.search_section_limit, ge=1, le=50, description="Maximum items per section"
+    ),
+    sections: Optional[str] = Query(
+        None, description="Comma-separated sections to search (default: all)"
+    ),
+    include_total: bool = Query(False, description="Count all matches per section"),
+    budget_ms: Optional[int] = Query(
+        None, ge=50, le=10_000, description="Overall time budget in milliseconds"
+    ),
+) -> GlobalSearchResponse:
+    """Search all content sections."""
+    return await search_service.search(
+        q,
+        sections=_split_sections(sections),
+        limit=limit,
+        include_total=include_total,
+        budget_ms=budget_ms,
+    )
+
+
+@router.get(
+    "/suggest",
+    response_model=SuggestResponse,
+    summary="Title suggestions",
+    description=(
+        "As-you-type title suggestions across sections, ranked by downloads. "
+        "Matches the start of any word and is served from memory."
+    ),
+)
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100, description="Text typed so far"),
+    limit: int = Query(8, ge=1, le=SUGGEST_MAX_LIMIT, description="Maximum suggestions"),
+    sections: Optional[str] = Query(
+        None, description="Comma-separated sections to suggest from (default: all)"
+    ),
+) -> SuggestResponse:
+    """Suggest titles for a prefix."""
+    return search_service.suggest(q, sections=_split_sections(sections), limit=limit)
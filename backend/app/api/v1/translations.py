@@ -3,13 +3,16 @@ Translations API endpoints.
 Provides access to translation data with filtering and pagination.
 """
 
-from typing import Optional
+from typing import Optional, Union
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import translation_last_modified
+from app.core.serialization import json_response
 from app.db.session import get_session
 from app.schemas import (
+    BatchResponse,
     PaginatedResponse,
     TransImageResponse,
     TranslationDetail,
@@ -22,9 +25,12 @@ router = APIRouter(prefix="/translations", tags=["Translations"])
 
 @router.get(
     "",
-    response_model=PaginatedResponse[TranslationListItem],
+    response_model=Union[PaginatedResponse[TranslationListItem], BatchResponse[TranslationDetail]],
     summary="List translations",
-    description="Get a paginated list of translations with optional filters.",
+    description=(
+        "Get a paginated list of translations with optional filters. "
+        "With ids, returns the details of those translations instead, in the requested order."
+    ),
 )
 async def list_translations(
     session: AsyncSession = Depends(get_session),
@@ -35,11 +41,39 @@ async def list_translations(
     status: Optional[int] = Query(None, description="Filter by patch status ID"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=200, description="Items per page"),
-    sort_by: str = Query("created", description="Sort field"),
+    sort_by: str = Query("created", description="Sort field (or relevance when searching descriptions)"),
     sort_order: str = Query("desc", description="Sort order (asc/desc)"),
-) -> PaginatedResponse[TranslationListItem]:
+    cursor: Optional[str] = Query(
+        None, description="Keyset cursor from a previous response's next_cursor (overrides page)"
+    ),
+    include_total: bool = Query(True, description="Compute the total item count"),
+    count_mode: str = Query(
+        "exact", pattern="^(exact|estimate)$", description="Total count mode (exact/estimate)"
+    ),
+    q_scope: str = Query(
+        "title",
+        pattern="^(title|description)$",
+        description="Match q against the title, or title and description (BM25-ranked)",
+    ),
+    facets: Optional[str] = Query(
+        None, description="Comma-separated facets to count per value (console, language, status)"
+    ),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return (default: all)"
+    ),
+    ids: Optional[str] = Query(
+        None,
+        description=(
+            "Comma-separated IDs to look up instead of listing; other filters are "
+            "ignored and IDs that do not exist are reported in missing"
+        ),
+    ),
+) -> Response:
     """Get paginated list of translations."""
-    return await translation_service.get_translations(
+    if ids is not None:
+        payload = await translation_service.get_translations_by_ids(session, ids, fields=fields)
+        return json_response(payload)
+    payload = await translation_service.get_translations(
         session,
         q=q,
         game=game,
@@ -50,7 +84,14 @@ async def list_translations(
         page_size=page_size,
         sort_by=sort_by,
         sort_order=sort_order,
+        cursor=cursor,
+        include_total=include_total,
+        count_mode=count_mode,
+        q_scope=q_scope,
+        facets=facets,
+        fields=fields,
     )
+    return json_response(payload)
 
 
 @router.get(
@@ -62,9 +103,14 @@ async def list_translations(
 async def get_translation(
     transkey: int,
     session: AsyncSession = Depends(get_session),
-) -> TranslationDetail:
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return (default: all)"
+    ),
+    validators: dict[str, str] = Depends(translation_last_modified),
+) -> Response:
     """Get a single translation by ID."""
-    return await translation_service.get_translation(session, transkey)
+    payload = await translation_service.get_translation(session, transkey, fields=fields)
+    return json_response(payload, headers=validators)
 
 
 @router.get(
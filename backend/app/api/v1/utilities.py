@@ -3,13 +3,15 @@ Utilities API endpoints.
 Provides access to ROM hacking utilities/tools with filtering and pagination.
 """
 
-from typing import Optional
+from typing import Optional, Union
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import utility_last_modified
+from app.core.serialization import json_response
 from app.db.session import get_session
-from app.schemas.common import PaginatedResponse
+from app.schemas.common import BatchResponse, PaginatedResponse
 from app.schemas.utilities import UtilityDetail, UtilityListItem
 from app.services.utility_service import utility_service
 
@@ -18,25 +20,63 @@ router = APIRouter(prefix="/utilities", tags=["Utilities"])
 
 @router.get(
     "",
-    response_model=PaginatedResponse[UtilityListItem],
+    response_model=Union[PaginatedResponse[UtilityListItem], BatchResponse[UtilityDetail]],
     summary="List utilities",
-    description="Get a paginated list of ROM hacking utilities with optional filters.",
+    description=(
+        "Get a paginated list of ROM hacking utilities with optional filters. "
+        "With ids, returns the details of those utilities instead, in the requested order."
+    ),
 )
 async def list_utilities(
     session: AsyncSession = Depends(get_session),
     q: Optional[str] = Query(None, description="Search query for title"),
+    game: Optional[int] = Query(None, description="Filter by game ID"),
     category: Optional[int] = Query(None, description="Filter by category ID"),
     console: Optional[int] = Query(None, description="Filter by console ID"),
     os: Optional[int] = Query(None, description="Filter by operating system ID"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=200, description="Items per page"),
-    sort_by: str = Query("title", description="Sort field"),
+    sort_by: str = Query("title", description="Sort field (or relevance when searching)"),
     sort_order: str = Query("asc", description="Sort order (asc/desc)"),
-) -> PaginatedResponse[UtilityListItem]:
+    cursor: Optional[str] = Query(
+        None, description="Keyset cursor from a previous response's next_cursor (overrides page)"
+    ),
+    include_total: bool = Query(True, description="Compute the total item count"),
+    count_mode: str = Query(
+        "exact", pattern="^(exact|estimate)$", description="Total count mode (exact/estimate)"
+    ),
+    search_mode: str = Query(
+        "auto",
+        pattern="^(auto|substring|natural|boolean)$",
+        description="Title search mode (auto/substring/natural/boolean)",
+    ),
+    q_scope: str = Query(
+        "title",
+        pattern="^(title|description)$",
+        description="Match q against the title, or title and description (BM25-ranked)",
+    ),
+    facets: Optional[str] = Query(
+        None, description="Comma-separated facets to count per value (category, console, os)"
+    ),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return (default: all)"
+    ),
+    ids: Optional[str] = Query(
+        None,
+        description=(
+            "Comma-separated IDs to look up instead of listing; other filters are "
+            "ignored and IDs that do not exist are reported in missing"
+        ),
+    ),
+) -> Response:
     """Get paginated list of utilities."""
-    return await utility_service.get_utilities(
+    if ids is not None:
+        payload = await utility_service.get_utilities_by_ids(session, ids, fields=fields)
+        return json_response(payload)
+    payload = await utility_service.get_utilities(
         session,
         q=q,
+        game=game,
         category=category,
         console=console,
         os=os,
@@ -44,7 +84,15 @@ async def list_utilities(
         page_size=page_size,
         sort_by=sort_by,
         sort_order=sort_order,
+        cursor=cursor,
+        include_total=include_total,
+        count_mode=count_mode,
+        search_mode=search_mode,
+        q_scope=q_scope,
+        facets=facets,
+        fields=fields,
     )
+    return json_response(payload)
 
 
 @router.get(
@@ -56,6 +104,11 @@ async def list_utilities(
 async def get_utility(
     utilkey: int,
     session: AsyncSession = Depends(get_session),
-) -> UtilityDetail:
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return (default: all)"
+    ),
+    validators: dict[str, str] = Depends(utility_last_modified),
+) -> Response:
     """Get a single utility by ID."""
-    return await utility_service.get_utility(session, utilkey)
+    payload = await utility_service.get_utility(session, utilkey, fields=fields)
+    return json_response(payload, headers=validators)
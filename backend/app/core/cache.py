@@ -0,0 +1,119 @@
+"""
+In-process caching primitives.
+Provides a size-bounded LRU cache with TTLs for hot, recomputable values,
+and coalescing of identical in-flight computations.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class SizedTTLCache:
+    """
+    LRU cache bounded by the total size of its values, with per-entry TTLs.
+
+    Callers state each value's size (typically its length in bytes); the
+    least recently used entries are evicted until the total fits
+    ``max_size``. Values larger than ``max_size`` are not stored. Counts
+    hits, misses and evictions. Not thread-safe; intended for use from the
+    event loop only.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[float, int, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for ``key``, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= time.monotonic():
+            self._remove(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[2]
+
+    def set(self, key: Hashable, value: Any, size: int, ttl_seconds: float) -> bool:
+        """
+        Store ``value`` under ``key`` for ``ttl_seconds``, evicting the least
+        recently used entries until it fits.
+
+        Returns:
+            False if the value is larger than the whole cache and was not stored
+        """
+        if size > self.max_size:
+            return False
+        if key in self._entries:
+            self._remove(key)
+        while self._entries and self.size + size > self.max_size:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+        self._entries[key] = (time.monotonic() + ttl_seconds, size, value)
+        self.size += size
+        return True
+
+    def clear(self) -> int:
+        """Drop all entries; returns how many."""
+        dropped = len(self._entries)
+        self._entries.clear()
+        self.size = 0
+        return dropped
+
+    def discard_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every entry whose key matches ``predicate``; returns how many."""
+        keys = [key for key in self._entries if predicate(key)]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self.size -= size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one in-flight call.
+
+    The first caller for a key starts the computation as a task; callers
+    arriving before it finishes await the same task instead of starting
+    their own. A caller being cancelled does not cancel the shared task.
+    Intended for use from the event loop only.
+    """
+
+    def __init__(self) -> None:
+        self.coalesced = 0
+        self._calls: dict[Hashable, asyncio.Task] = {}
+
+    async def run(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Return the result of ``fn()``, shared with concurrent calls for ``key``."""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+    def __len__(self) -> int:
+        return len(self._calls)
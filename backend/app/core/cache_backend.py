@@ -0,0 +1,310 @@
+"""
+Storage backends for cached bytes.
+
+Cached list totals and rendered responses are stored through a
+``CacheBackend``: either in process memory, or in a SQLite file shared by
+every worker process on the host, so ``uvicorn --workers N`` warms one
+cache instead of N.
+"""
+
+import asyncio
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, TypeVar
+
+from app.core.cache import SizedTTLCache
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Default location of the shared cache file, next to the search index snapshot
+DEFAULT_SQLITE_PATH = Path(__file__).parent.parent.parent / "data" / "cache.sqlite3"
+
+# Last-access times are refreshed at most this often (seconds), so hits are
+# mostly reads; LRU order is approximate to within this interval
+_TOUCH_INTERVAL = 1.0
+
+T = TypeVar("T")
+
+
+class CacheBackend(ABC):
+    """
+    Byte store with per-entry TTLs, a total size budget and LRU eviction.
+
+    Entries are addressed by ``(scope, namespace, key)``. The scope
+    separates the users of one backend (``"responses"``, ``"counts"``,
+    ``"metadata"``); namespaces group entries that are invalidated together
+    (a route, a table). Hit and miss counters are per process.
+    """
+
+    name: str
+    # Whether other worker processes see the same entries
+    shared: bool
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    async def get(self, scope: str, namespace: str, key: str) -> Optional[bytes]:
+        """Return the stored value, or None if missing or expired."""
+
+    @abstractmethod
+    async def set(
+        self, scope: str, namespace: str, key: str, value: bytes, ttl_seconds: float
+    ) -> None:
+        """Store ``value``, evicting least recently used entries to stay within budget."""
+
+    @abstractmethod
+    async def invalidate(self, scope: str, namespaces: Optional[Iterable[str]] = None) -> int:
+        """
+        Drop the entries of ``namespaces`` within ``scope`` (the whole scope if None).
+
+        Returns:
+            Number of dropped entries
+        """
+
+    @abstractmethod
+    async def stats(self) -> dict[str, int]:
+        """Entry count, total size, budget and hit/miss/eviction counters."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Backend private to the current process."""
+
+    name = "memory"
+    shared = False
+
+    def __init__(self, max_bytes: int) -> None:
+        super().__init__(max_bytes)
+        self._entries = SizedTTLCache(max_bytes)
+
+    async def get(self, scope: str, namespace: str, key: str) -> Optional[bytes]:
+        value = self._entries.get((scope, namespace, key))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(
+        self, scope: str, namespace: str, key: str, value: bytes, ttl_seconds: float
+    ) -> None:
+        self._entries.set((scope, namespace, key), value, len(value), ttl_seconds)
+
+    async def invalidate(self, scope: str, namespaces: Optional[Iterable[str]] = None) -> int:
+        if namespaces is None:
+            return self._entries.discard_where(lambda key: key[0] == scope)
+        names = set(namespaces)
+        return self._entries.discard_where(lambda key: key[0] == scope and key[1] in names)
+
+    async def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._entries.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self._entries.evictions,
+        }
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Backend in a SQLite file shared by all processes on the host.
+
+    The database runs in WAL mode, so readers in one worker do not block
+    writers in another. The total size is maintained by triggers; when a
+    write exceeds the budget, entries with the oldest access time are
+    evicted. Expired entries are skipped on read and removed on eviction.
+    Each process opens its own connection on first use (after forking).
+
+    SQLite calls block (up to ``busy_timeout`` while another worker holds
+    the write lock), so they run on a dedicated thread, one at a time,
+    instead of on the event loop. A busy or broken cache file never fails
+    a request: reads miss, writes and invalidations are skipped.
+    """
+
+    name = "sqlite"
+    shared = True
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            scope TEXT NOT NULL,
+            namespace TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            expires REAL NOT NULL,
+            accessed REAL NOT NULL,
+            PRIMARY KEY (scope, namespace, key)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+        CREATE TABLE IF NOT EXISTS usage (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL);
+        INSERT OR IGNORE INTO usage VALUES (0, 0);
+        CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries
+            BEGIN UPDATE usage SET bytes = bytes + NEW.size WHERE id = 0; END;
+        CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries
+            BEGIN UPDATE usage SET bytes = bytes - OLD.size WHERE id = 0; END;
+        CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries
+            BEGIN UPDATE usage SET bytes = bytes - OLD.size + NEW.size WHERE id = 0; END;
+    """
+
+    def __init__(self, max_bytes: int, path: Path) -> None:
+        super().__init__(max_bytes)
+        self.path = path
+        self.evictions = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def _run(self, fn: Callable[..., T], *args: object) -> T:
+        """Run a blocking call on the cache thread."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-sqlite")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=1000")
+            conn.executescript(self._SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    async def get(self, scope: str, namespace: str, key: str) -> Optional[bytes]:
+        return await self._run(self._get, scope, namespace, key)
+
+    def _get(self, scope: str, namespace: str, key: str) -> Optional[bytes]:
+        now = time.time()
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, expires, accessed FROM entries"
+                " WHERE scope = ? AND namespace = ? AND key = ?",
+                (scope, namespace, key),
+            ).fetchone()
+            if row is not None and row[1] > now and now - row[2] > _TOUCH_INTERVAL:
+                conn.execute(
+                    "UPDATE entries SET accessed = ? WHERE scope = ? AND namespace = ? AND key = ?",
+                    (now, scope, namespace, key),
+                )
+        except sqlite3.Error:
+            # A busy or broken cache file must not fail the request
+            logger.warning(f"Cache read failed ({self.path})", exc_info=True)
+            row = None
+        if row is None or row[1] <= now:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    async def set(
+        self, scope: str, namespace: str, key: str, value: bytes, ttl_seconds: float
+    ) -> None:
+        if len(value) <= self.max_bytes:
+            await self._run(self._set, scope, namespace, key, value, ttl_seconds)
+
+    def _set(self, scope: str, namespace: str, key: str, value: bytes, ttl_seconds: float) -> None:
+        now = time.time()
+        try:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # An upsert, so the size triggers see replaced entries
+                conn.execute(
+                    "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT (scope, namespace, key) DO UPDATE SET"
+                    " value = excluded.value, size = excluded.size,"
+                    " expires = excluded.expires, accessed = excluded.accessed",
+                    (scope, namespace, key, value, len(value), now + ttl_seconds, now),
+                )
+                self._evict(conn, now)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error:
+            logger.warning(f"Cache write failed ({self.path})", exc_info=True)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Delete expired, then least recently used, entries until within budget."""
+        (used,) = conn.execute("SELECT bytes FROM usage WHERE id = 0").fetchone()
+        if used <= self.max_bytes:
+            return
+        conn.execute("DELETE FROM entries WHERE expires <= ?", (now,))
+        (used,) = conn.execute("SELECT bytes FROM usage WHERE id = 0").fetchone()
+        victims = []
+        for scope, namespace, key, size in conn.execute(
+            "SELECT scope, namespace, key, size FROM entries ORDER BY accessed"
+        ):
+            if used <= self.max_bytes:
+                break
+            victims.append((scope, namespace, key))
+            used -= size
+        conn.executemany(
+            "DELETE FROM entries WHERE scope = ? AND namespace = ? AND key = ?", victims
+        )
+        self.evictions += len(victims)
+
+    async def invalidate(self, scope: str, namespaces: Optional[Iterable[str]] = None) -> int:
+        names = None if namespaces is None else list(namespaces)
+        if names is not None and not names:
+            return 0
+        return await self._run(self._invalidate, scope, names)
+
+    def _invalidate(self, scope: str, names: Optional[list[str]]) -> int:
+        try:
+            conn = self._connection()
+            if names is None:
+                return conn.execute("DELETE FROM entries WHERE scope = ?", (scope,)).rowcount
+            placeholders = ", ".join("?" * len(names))
+            return conn.execute(
+                f"DELETE FROM entries WHERE scope = ? AND namespace IN ({placeholders})",
+                (scope, *names),
+            ).rowcount
+        except sqlite3.Error:
+            logger.warning(f"Cache invalidation failed ({self.path})", exc_info=True)
+            return 0
+
+    async def stats(self) -> dict[str, int]:
+        return await self._run(self._stats)
+
+    def _stats(self) -> dict[str, int]:
+        try:
+            conn = self._connection()
+            (entries,) = conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+            (used,) = conn.execute("SELECT bytes FROM usage WHERE id = 0").fetchone()
+        except sqlite3.Error:
+            logger.warning(f"Cache statistics failed ({self.path})", exc_info=True)
+            entries = used = 0
+        return {
+            "entries": entries,
+            "bytes": used,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def create_backend() -> CacheBackend:
+    """Build the backend selected by ``cache_backend``."""
+    if settings.cache_backend == "sqlite":
+        path = Path(settings.cache_sqlite_path) if settings.cache_sqlite_path else DEFAULT_SQLITE_PATH
+        return SQLiteCacheBackend(settings.cache_max_bytes, path)
+    if settings.cache_backend != "memory":
+        logger.warning(f"Unknown cache backend '{settings.cache_backend}'; using memory")
+    return MemoryCacheBackend(settings.cache_max_bytes)
+
+
+# Singleton instance shared by the count and response caches
+cache_backend = create_backend()
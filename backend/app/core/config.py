@@ -21,6 +21,8 @@ class Settings(BaseSettings):
     database_user: str = "root"
     database_password: str = ""
     database_name: str = "romhackingnet"
+    database_pool_size: int = 10
+    database_max_overflow: int = 20
 
     # Application Settings
     app_name: str = "RomHacking.net Archive Explorer"
@@ -30,6 +32,66 @@ class Settings(BaseSettings):
     # CORS Origins
     cors_origins: str = "http://localhost:5173"
 
+    # Admin endpoints (disabled while empty)
+    admin_token: str = ""
+
+    # Metadata Store (0 disables periodic reload)
+    metadata_reload_interval_seconds: int = 0
+    metadata_cache_max_age_seconds: int = 86400
+
+    # Title Search (match innodb_ft_min_token_size on the server)
+    fulltext_search_enabled: bool = True
+    fulltext_min_token_size: int = 3
+    title_index_enabled: bool = True
+    title_index_max_candidates: int = 5000
+    fuzzy_min_similarity: float = 0.6
+    fuzzy_max_results: int = 200
+
+    # Description Search (BM25 over titles and descriptions)
+    text_index_enabled: bool = True
+    text_search_max_results: int = 500
+
+    # Search Index Maintenance (0 disables polling for lastmod changes)
+    index_refresh_interval_seconds: int = 300
+    index_snapshot_enabled: bool = True
+    index_delta_max_rows: int = 5000
+
+    # Global Search
+    search_time_budget_ms: int = 1500
+    search_section_limit: int = 5
+
+    # Batch Lookups (?ids= on list endpoints)
+    batch_lookup_max_ids: int = 200
+
+    # Batch Requests (POST /batch)
+    batch_max_requests: int = 20
+    batch_max_concurrency: int = 4
+
+    # List Total Counts
+    count_cache_ttl_seconds: int = 300
+    concurrent_count_queries: bool = True
+
+    # Shared Cache (counts, responses and metadata rows; "memory" per process,
+    # or "sqlite" shared by all workers on the host, default path data/cache.sqlite3)
+    cache_backend: str = "memory"
+    cache_sqlite_path: str = ""
+    cache_max_bytes: int = 64 * 1024 * 1024
+
+    # Conditional GET (API responses get ETags; clients store and revalidate them)
+    api_cache_control: str = "public, no-cache"
+
+    # Response Compression (br/zstd when installed, else gzip; large bodies off the event loop)
+    compression_enabled: bool = True
+    compression_min_bytes: int = 1024
+    compression_offload_bytes: int = 64 * 1024
+
+    # Response Cache (rendered GET responses, dropped when their tables change)
+    response_cache_enabled: bool = True
+    response_cache_max_entry_bytes: int = 1024 * 1024
+    response_cache_list_ttl_seconds: int = 300
+    response_cache_detail_ttl_seconds: int = 3600
+    response_coalescing_enabled: bool = True
+
     @property
     def database_url(self) -> str:
         """Construct the async MySQL database URL."""
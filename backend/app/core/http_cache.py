@@ -0,0 +1,395 @@
+"""
+HTTP caching helpers for pre-rendered responses, conditional GETs and
+response compression.
+
+A ``RenderedPayload`` holds a JSON body serialized once, its compressed
+variants and content-hash ETags (one per coding), so serving it is a
+dictionary lookup plus a memory copy. ``ConditionalGetMiddleware`` gives every other API
+response a weak ETag and answers ``If-None-Match`` / ``If-Modified-Since``
+with 304. ``CompressionMiddleware`` compresses the remaining bodies.
+"""
+
+import asyncio
+import gzip
+import hashlib
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from types import MappingProxyType
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+try:  # Brotli is optional; gzip is always available
+    import brotli
+except ImportError:
+    brotli = None
+
+try:  # Zstandard is optional as well
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Preferred order when the client accepts several encodings equally
+SUPPORTED_ENCODINGS = tuple(
+    coding
+    for coding, available in (("br", brotli), ("zstd", zstandard), ("gzip", gzip))
+    if available is not None
+)
+
+# Compression levels: fast ones for bodies compressed per response, denser
+# ones for bodies compressed once and stored, the densest for tiny payloads
+# built at startup
+FAST_LEVELS = {"br": 4, "zstd": 3, "gzip": 6}
+STORED_LEVELS = {"br": 8, "zstd": 12, "gzip": 9}
+MAX_LEVELS = {"br": 11, "zstd": 19, "gzip": 9}
+
+# Media types worth compressing
+_COMPRESSIBLE_TYPES = ("application/json", "application/javascript", "text/", "image/svg+xml")
+
+
+def compress(body: bytes, coding: str, level: int) -> bytes:
+    """Compress ``body`` with one of ``SUPPORTED_ENCODINGS``."""
+    if coding == "br":
+        return brotli.compress(body, quality=level)
+    if coding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(body)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+async def compress_async(body: bytes, coding: str, level: int) -> bytes:
+    """``compress``, run in a worker thread for bodies of ``compression_offload_bytes`` or more."""
+    if len(body) >= settings.compression_offload_bytes:
+        return await asyncio.to_thread(compress, body, coding, level)
+    return compress(body, coding, level)
+
+
+def is_compressible(headers: Headers) -> bool:
+    """Whether a response with ``headers`` should be compressed for transfer."""
+    media_type = headers.get("content-type", "")
+    return "content-encoding" not in headers and media_type.startswith(_COMPRESSIBLE_TYPES)
+
+
+def add_vary(raw: list[tuple[bytes, bytes]], field_name: bytes) -> None:
+    """Add ``field_name`` to the ``Vary`` header of raw response headers in place."""
+    for i, (name, value) in enumerate(raw):
+        if name.lower() == b"vary":
+            if field_name.lower() not in value.lower():
+                raw[i] = (name, value + b", " + field_name)
+            return
+    raw.append((b"vary", field_name))
+
+
+def encoded_headers(
+    raw: list[tuple[bytes, bytes]], coding: str, length: int
+) -> list[tuple[bytes, bytes]]:
+    """Raw headers of ``raw``'s response once its body is ``coding``-encoded."""
+    headers = [(name, value) for name, value in raw if name.lower() != b"content-length"]
+    headers.append((b"content-encoding", coding.encode("latin-1")))
+    headers.append((b"content-length", str(length).encode("latin-1")))
+    add_vary(headers, b"Accept-Encoding")
+    return headers
+
+
+def _compress(body: bytes) -> dict[str, bytes]:
+    """Build every supported compressed variant of ``body``, in preference order."""
+    return {coding: compress(body, coding, MAX_LEVELS[coding]) for coding in SUPPORTED_ENCODINGS}
+
+
+def parse_accept_encoding(header: Optional[str]) -> dict[str, float]:
+    """
+    Parse an ``Accept-Encoding`` header into ``coding -> q`` weights.
+
+    Codings with ``q=0`` are kept so callers can tell "refused" from "absent".
+    """
+    weights: dict[str, float] = {}
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding] = q
+    return weights
+
+
+def negotiate_encoding(header: Optional[str], available: tuple[str, ...]) -> Optional[str]:
+    """
+    Pick the best content coding from ``available`` for an ``Accept-Encoding`` header.
+
+    Returns:
+        The chosen coding, or None to send the identity body
+    """
+    weights = parse_accept_encoding(header)
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for coding in available:
+        q = weights.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def weak_etag(body: bytes) -> str:
+    """Weak validator of a body; weak, so it stays valid for compressed variants."""
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def http_date(value: datetime) -> str:
+    """Format a datetime as an HTTP date; naive datetimes are taken as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def parse_http_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse an HTTP date header, or None if absent or malformed."""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+
+
+def not_modified(
+    request_headers: Headers, etag: Optional[str], last_modified: Optional[str]
+) -> bool:
+    """
+    Evaluate a request's conditional headers against a representation (RFC 9110).
+
+    ``If-None-Match`` takes precedence; ``If-Modified-Since`` is only
+    considered when it is absent.
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag is not None and etag_matches(if_none_match, etag)
+    since = parse_http_date(request_headers.get("if-modified-since"))
+    modified = parse_http_date(last_modified)
+    return since is not None and modified is not None and modified <= since
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match`` header against ``etag`` (RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+@dataclass(frozen=True)
+class RenderedPayload:
+    """
+    An immutable JSON body with its compressed variants and strong ETags.
+
+    ``etag`` validates the identity body; each compressed variant is a
+    different byte stream, so it gets its own strong ETag (``etag_for``).
+    """
+
+    body: bytes
+    etag: str
+    encoded: Mapping[str, bytes] = field(default_factory=dict)
+    media_type: str = "application/json"
+
+    @classmethod
+    def from_bytes(cls, body: bytes, media_type: str = "application/json") -> "RenderedPayload":
+        """Hash and compress an already serialized body."""
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        return cls(
+            body=body,
+            etag=f'"{digest}"',
+            encoded=MappingProxyType(_compress(body)),
+            media_type=media_type,
+        )
+
+    def etag_for(self, coding: Optional[str]) -> str:
+        """Strong ETag of the body encoded with ``coding`` (None for identity)."""
+        return self.etag if coding is None else f'{self.etag[:-1]}-{coding}"'
+
+    def response(self, request: Request, cache_control: str) -> Response:
+        """
+        Build the response for ``request``: 304 if the client's copy is current,
+        otherwise the best encoded variant of the body.
+
+        A copy of any variant is current, since they all decode to the same body.
+        """
+        coding = negotiate_encoding(
+            request.headers.get("accept-encoding"), tuple(self.encoded)
+        )
+        headers = {
+            "ETag": self.etag_for(coding),
+            "Cache-Control": cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if_none_match = request.headers.get("if-none-match")
+        if any(
+            etag_matches(if_none_match, self.etag_for(variant))
+            for variant in (None, *self.encoded)
+        ):
+            return Response(status_code=304, headers=headers)
+
+        if coding is None:
+            return Response(self.body, media_type=self.media_type, headers=headers)
+        headers["Content-Encoding"] = coding
+        return Response(self.encoded[coding], media_type=self.media_type, headers=headers)
+
+
+# Response headers repeated on a 304 (RFC 9110 section 15.4.5)
+_NOT_MODIFIED_HEADERS = (b"cache-control", b"etag", b"expires", b"last-modified", b"vary")
+
+
+class ConditionalGetMiddleware:
+    """
+    Adds validators to API GET responses and answers conditional requests.
+
+    Successful responses without an ETag get a weak one hashed from the
+    body (routes and the response cache may set their own), plus a default
+    ``Cache-Control`` so browsers and proxies store and revalidate them.
+    When the request's ``If-None-Match`` or ``If-Modified-Since`` matches,
+    the body is replaced by an empty 304 carrying the 200's ``Vary``, which
+    includes ``Accept-Encoding`` for compressible bodies when
+    ``compression`` is set (``CompressionMiddleware`` only adds it to 200s).
+    """
+
+    def __init__(
+        self, app: ASGIApp, path_prefix: str, cache_control: str, compression: bool = False
+    ) -> None:
+        self.app = app
+        self.path_prefix = path_prefix
+        self.cache_control = cache_control.encode("latin-1")
+        self.compression = compression
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not scope["path"].startswith(self.path_prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        chunks: list[bytes] = []
+
+        async def buffered(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                if start["status"] != 200:
+                    await send(message)
+                return
+            if start is None or start["status"] != 200:
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                await self._finish(scope, start, b"".join(chunks), send)
+
+        await self.app(scope, receive, buffered)
+
+    async def _finish(self, scope: Scope, start: Message, body: bytes, send: Send) -> None:
+        """Send the buffered 200 response, or a 304 if the client's copy is current."""
+        headers = Headers(raw=start.get("headers", []))
+        raw = list(start.get("headers", []))
+        if "etag" not in headers and "content-encoding" not in headers:
+            raw.append((b"etag", weak_etag(body).encode("latin-1")))
+        if "cache-control" not in headers:
+            raw.append((b"cache-control", self.cache_control))
+        validators = Headers(raw=raw)
+
+        if not_modified(
+            Headers(scope=scope), validators.get("etag"), validators.get("last-modified")
+        ):
+            kept = [(name, value) for name, value in raw if name.lower() in _NOT_MODIFIED_HEADERS]
+            if self.compression and is_compressible(headers):
+                add_vary(kept, b"Accept-Encoding")
+            await send({"type": "http.response.start", "status": 304, "headers": kept})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send({**start, "headers": raw})
+        await send({"type": "http.response.body", "body": body})
+
+
+class CompressionMiddleware:
+    """
+    Compresses response bodies with the best encoding the client accepts.
+
+    Bodies smaller than ``minimum_size``, non-text media types and
+    responses that are already encoded (such as precompressed cache
+    entries) are passed through untouched. Large bodies are compressed in
+    a worker thread (see ``compress_async``).
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        coding = None
+        if scope["type"] == "http":
+            coding = negotiate_encoding(
+                Headers(scope=scope).get("accept-encoding"), SUPPORTED_ENCODINGS
+            )
+        if coding is None:
+            await self.app(scope, receive, self._identity(send) if scope["type"] == "http" else send)
+            return
+
+        start: Optional[Message] = None
+        chunks: list[bytes] = []
+
+        async def buffered(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                if not is_compressible(Headers(raw=start.get("headers", []))):
+                    await send(message)
+                return
+            if start is None or not is_compressible(Headers(raw=start.get("headers", []))):
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            body = b"".join(chunks)
+            raw = list(start.get("headers", []))
+            if len(body) >= self.minimum_size:
+                body = await compress_async(body, coding, FAST_LEVELS[coding])
+                raw = encoded_headers(raw, coding, len(body))
+            else:
+                add_vary(raw, b"Accept-Encoding")
+            await send({**start, "headers": raw})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, buffered)
+
+    @staticmethod
+    def _identity(send: Send) -> Send:
+        """Wrap ``send`` to mark compressible responses as varying by encoding."""
+
+        async def vary(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                raw = list(message.get("headers", []))
+                if is_compressible(Headers(raw=raw)):
+                    add_vary(raw, b"Accept-Encoding")
+                    message = {**message, "headers": raw}
+            await send(message)
+
+        return vary
@@ -0,0 +1,443 @@
+"""
+Response cache for read-only API routes.
+
+The archive is a static snapshot, so a rendered GET response can be served
+again until its data changes. Responses are cached as raw bytes, keyed by
+route plus normalized parameters, in a size-bounded LRU; index refreshes
+and metadata reloads drop the entries that depend on changed tables.
+Concurrent misses for the same key are rendered once and shared.
+"""
+
+from collections.abc import Awaitable, Hashable, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from fastapi.dependencies.utils import request_params_to_args
+from fastapi.routing import APIRoute
+from starlette.datastructures import Headers, QueryParams
+from starlette.routing import compile_path
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache import SingleFlight
+from app.core.cache_backend import CacheBackend, cache_backend
+from app.core.config import settings
+from app.core.http_cache import (
+    STORED_LEVELS,
+    SUPPORTED_ENCODINGS,
+    compress_async,
+    encoded_headers,
+    is_compressible,
+    negotiate_encoding,
+    weak_etag,
+)
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Response headers that make a response unsuitable for sharing between clients
+_UNCACHEABLE_HEADERS = (b"set-cookie", b"content-encoding")
+
+# Request headers that can turn a 200 into a 304
+_CONDITIONAL_HEADERS = (b"if-none-match", b"if-modified-since")
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    How responses of one route are cached.
+
+    Attributes:
+        ttl_seconds: Time a cached response is served
+        tables: Tables the response is built from; a change to any of them
+            drops the cached responses of the route
+        sort_fields: Accepted ``sort_by`` values; others are keyed as the
+            route's default, which is how the services treat them. Empty
+            leaves ``sort_by`` as given.
+    """
+
+    ttl_seconds: float
+    tables: frozenset[str]
+    sort_fields: frozenset[str] = frozenset()
+
+
+@dataclass
+class RouteStats:
+    """Hit and miss counters of one cached route."""
+
+    hits: int = 0
+    misses: int = 0
+    bypasses: int = 0
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A complete rendered response."""
+
+    status: int
+    headers: tuple[tuple[bytes, bytes], ...]
+    body: bytes
+
+    @property
+    def cacheable(self) -> bool:
+        """Whether the response may be stored and replayed to other clients."""
+        return self.status == 200 and not any(
+            name.lower() in _UNCACHEABLE_HEADERS for name, _ in self.headers
+        )
+
+    @property
+    def encoding(self) -> Optional[str]:
+        """Content coding of the body, or None for identity."""
+        for name, value in self.headers:
+            if name.lower() == b"content-encoding":
+                return value.decode("latin-1")
+        return None
+
+    async def compressed(self, coding: str) -> "CachedResponse":
+        """This response with its body compressed for storage and transfer."""
+        body = await compress_async(self.body, coding, STORED_LEVELS[coding])
+        return CachedResponse(
+            self.status, tuple(encoded_headers(list(self.headers), coding, len(body))), body
+        )
+
+    async def send(self, send: Send) -> None:
+        """Replay the response to an ASGI ``send``."""
+        await send(
+            {"type": "http.response.start", "status": self.status, "headers": list(self.headers)}
+        )
+        await send({"type": "http.response.body", "body": self.body})
+
+    def to_bytes(self) -> bytes:
+        """Serialize as a status line and header block followed by the body."""
+        lines = [str(self.status).encode("ascii")]
+        lines.extend(name + b": " + value for name, value in self.headers)
+        return b"\r\n".join(lines) + b"\r\n\r\n" + self.body
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CachedResponse":
+        """Inverse of ``to_bytes``."""
+        head, _, body = data.partition(b"\r\n\r\n")
+        status, *lines = head.split(b"\r\n")
+        headers = tuple(tuple(line.split(b": ", 1)) for line in lines)
+        return cls(int(status), headers, body)
+
+
+class CachedRoute:
+    """
+    An endpoint served through the response cache.
+
+    Args:
+        path: Full path template of the endpoint (``/api/v1/hacks/{hackkey}``)
+        route: The endpoint's route, whose parameter declarations build the key
+        policy: How its responses are cached
+    """
+
+    def __init__(self, path: str, route: APIRoute, policy: CachePolicy) -> None:
+        self.path = path
+        self.route = route
+        self.policy = policy
+        self._regex, _, self._convertors = compile_path(path)
+        self.sort_default = next(
+            (f.default for f in route.dependant.query_params if f.alias == "sort_by"), None
+        )
+
+    def match(self, path: str) -> Optional[dict[str, Any]]:
+        """Path parameters if ``path`` is handled by this endpoint, else None."""
+        found = self._regex.match(path)
+        if found is None:
+            return None
+        return {
+            name: self._convertors[name].convert(value)
+            for name, value in found.groupdict().items()
+        }
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class ResponseCache:
+    """
+    Store of rendered responses with per-route statistics.
+
+    Keys are ``(route path, path params, query params)`` tuples. Responses
+    are kept in the shared ``CacheBackend`` under the route path, expire
+    after their route's TTL and are evicted least recently used first once
+    ``cache_max_bytes`` is reached. ``flights`` coalesces concurrent
+    renders of the same key within this process.
+    """
+
+    scope = "responses"
+
+    def __init__(self, backend: CacheBackend) -> None:
+        self.backend = backend
+        self.flights = SingleFlight()
+        self._tables: dict[str, frozenset[str]] = {}
+        self.routes: dict[str, RouteStats] = {}
+
+    def register(self, path: str, policy: CachePolicy) -> None:
+        """Declare a cached route so it can be invalidated by table."""
+        self._tables[path] = policy.tables
+        self.routes.setdefault(path, RouteStats())
+
+    async def get(
+        self, key: tuple[Any, ...], coding: Optional[str] = None
+    ) -> Optional[CachedResponse]:
+        """
+        Cached response for ``key``, counting a hit or miss for its route.
+
+        With a ``coding``, the stored variant compressed with it is
+        preferred, falling back to the uncompressed response.
+        """
+        stats = self.routes[key[0]]
+        if coding is not None:
+            data = await self.backend.get(self.scope, key[0], repr(key[1:] + (coding,)))
+            if data is not None:
+                stats.hits += 1
+                return CachedResponse.from_bytes(data)
+        data = await self.backend.get(self.scope, key[0], repr(key[1:]))
+        if data is None:
+            stats.misses += 1
+            return None
+        stats.hits += 1
+        return CachedResponse.from_bytes(data)
+
+    async def set(
+        self,
+        key: tuple[Any, ...],
+        response: CachedResponse,
+        ttl_seconds: float,
+        coding: Optional[str] = None,
+    ) -> None:
+        """
+        Store a response (or its variant compressed with ``coding``) unless it
+        exceeds ``response_cache_max_entry_bytes``.
+        """
+        if len(response.body) <= settings.response_cache_max_entry_bytes:
+            variant = key[1:] + (coding,) if coding is not None else key[1:]
+            await self.backend.set(
+                self.scope, key[0], repr(variant), response.to_bytes(), ttl_seconds
+            )
+
+    def bypass(self, path: str) -> None:
+        """Count a request to a cached route that could not use the cache."""
+        self.routes[path].bypasses += 1
+
+    async def invalidate(self, tables: Optional[Iterable[str]] = None) -> int:
+        """
+        Drop cached responses built from any of ``tables`` (all if None).
+
+        Returns:
+            Number of dropped responses
+        """
+        if tables is None:
+            dropped = await self.backend.invalidate(self.scope)
+        else:
+            changed = set(tables)
+            paths = [path for path, used in self._tables.items() if used & changed]
+            dropped = await self.backend.invalidate(self.scope, paths)
+        if dropped:
+            logger.info(f"🧹 Dropped {dropped} cached responses")
+        return dropped
+
+    async def stats(self) -> dict[str, Any]:
+        """
+        Current size and counters, overall and per route.
+
+        Size and entry counts cover the whole backend (cached counts
+        included); route counters are those of this process.
+        """
+        return {
+            "backend": self.backend.name,
+            **(await self.backend.stats()),
+            "coalesced": self.flights.coalesced,
+            "in_flight": len(self.flights),
+            "routes": {path: vars(stats).copy() for path, stats in self.routes.items()},
+        }
+
+
+class ResponseCacheMiddleware:
+    """
+    Serves cached GET responses of ``routes``.
+
+    The endpoint is matched by path template, and its query and path
+    parameters are validated against the endpoint's declarations, so the
+    key holds typed values with defaults filled in (``?page=1`` and no
+    ``page`` share an entry), a case-folded ``q``, a whitelisted
+    ``sort_by`` and order-insensitive ``fields`` and ``include``.
+    Requests that fail validation bypass the cache, and only uncompressed
+    200 responses are stored. Concurrent misses for one key share a single
+    render (``response_coalescing_enabled``).
+
+    Compressed variants are stored next to the response, one per content
+    coding, and served as they are to clients accepting that coding, so a
+    cached body is compressed at most once.
+    """
+
+    def __init__(
+        self, app: ASGIApp, routes: Sequence[CachedRoute], cache: ResponseCache
+    ) -> None:
+        self.app = app
+        self.routes = routes
+        self.cache = cache
+        for cached_route in routes:
+            cache.register(cached_route.path, cached_route.policy)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        caching = settings.response_cache_enabled
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not (caching or settings.response_coalescing_enabled)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        resolved = self._resolve(scope)
+        if resolved is None:
+            await self.app(scope, receive, send)
+            return
+        cached_route, key = resolved
+        if key is None:
+            self.cache.bypass(cached_route.path)
+            await self.app(scope, receive, send)
+            return
+
+        coding = None
+        if settings.compression_enabled:
+            coding = negotiate_encoding(
+                Headers(scope=scope).get("accept-encoding"), SUPPORTED_ENCODINGS
+            )
+
+        response = await self.cache.get(key, coding) if caching else None
+        if response is None:
+            def render() -> Awaitable[CachedResponse]:
+                return self._render(scope, receive, key, cached_route.policy, caching)
+
+            if settings.response_coalescing_enabled:
+                # Identical requests arriving meanwhile wait for this render
+                # instead of each taking a pooled connection
+                response = await self.cache.flights.run(key, render)
+            else:
+                response = await render()
+
+        if (
+            coding is not None
+            and response.cacheable
+            and len(response.body) >= settings.compression_min_bytes
+            and is_compressible(Headers(raw=list(response.headers)))
+        ):
+            def encode() -> Awaitable[CachedResponse]:
+                return self._encode(key, response, coding, cached_route.policy, caching)
+
+            # Compressed once per key and coding, then served from the cache
+            response = await self.cache.flights.run((key, coding), encode)
+        await response.send(send)
+
+    async def _encode(
+        self,
+        key: tuple[Any, ...],
+        response: CachedResponse,
+        coding: str,
+        policy: CachePolicy,
+        store: bool,
+    ) -> CachedResponse:
+        """Compress a response and store the variant next to it if allowed."""
+        variant = await response.compressed(coding)
+        if store:
+            await self.cache.set(key, variant, policy.ttl_seconds, coding)
+        return variant
+
+    async def _render(
+        self,
+        scope: Scope,
+        receive: Receive,
+        key: tuple[Any, ...],
+        policy: CachePolicy,
+        store: bool,
+    ) -> CachedResponse:
+        """Run the endpoint, buffer its response and cache it if allowed."""
+        # The render is shared and stored, so it must not depend on the first
+        # client's cached copy; 304s are decided outside, per request
+        scope = {
+            **scope,
+            "headers": [
+                (name, value)
+                for name, value in scope["headers"]
+                if name not in _CONDITIONAL_HEADERS
+            ],
+        }
+        status = 500
+        headers: tuple[tuple[bytes, bytes], ...] = ()
+        chunks: list[bytes] = []
+
+        async def capture(message: Message) -> None:
+            nonlocal status, headers
+            if message["type"] == "http.response.start":
+                status, headers = message["status"], tuple(message.get("headers", ()))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+        body = b"".join(chunks)
+        if status == 200 and not any(name.lower() == b"etag" for name, _ in headers):
+            # Hashed once here, so cache hits can be revalidated without rehashing
+            headers += ((b"etag", weak_etag(body).encode("latin-1")),)
+        response = CachedResponse(status, headers, body)
+        if store and response.cacheable:
+            await self.cache.set(key, response, policy.ttl_seconds)
+        return response
+
+    def _resolve(
+        self, scope: Scope
+    ) -> Optional[tuple[CachedRoute, Optional[tuple[Any, ...]]]]:
+        """
+        Find the cached route handling ``scope`` and build its cache key.
+
+        Returns:
+            None for uncached routes, otherwise the route and its key (None
+            if the parameters do not validate)
+        """
+        for cached_route in self.routes:
+            path_params = cached_route.match(scope["path"])
+            if path_params is not None:
+                return cached_route, self._key(cached_route, scope, path_params)
+        return None
+
+    @staticmethod
+    def _key(
+        cached_route: CachedRoute, scope: Scope, path_params: Mapping[str, Any]
+    ) -> Optional[tuple[Any, ...]]:
+        route, policy = cached_route.route, cached_route.policy
+        path_values, path_errors = request_params_to_args(route.dependant.path_params, path_params)
+        values, errors = request_params_to_args(
+            route.dependant.query_params, QueryParams(scope.get("query_string", b""))
+        )
+        if path_errors or errors:
+            return None
+
+        q = values.get("q")
+        if isinstance(q, str):
+            # Title and description matching ignore case and spacing
+            values["q"] = " ".join(q.casefold().split()) or None
+        if policy.sort_fields and values.get("sort_by") not in policy.sort_fields:
+            values["sort_by"] = cached_route.sort_default
+        if isinstance(values.get("sort_order"), str):
+            values["sort_order"] = "desc" if values["sort_order"].lower() == "desc" else "asc"
+        for name in ("fields", "include"):
+            # Fields and included sections are returned in a fixed order
+            # whatever order they were asked in
+            names = values.get(name)
+            if isinstance(names, str):
+                values[name] = ",".join(sorted({n.strip() for n in names.split(",") if n.strip()}))
+
+        return (
+            cached_route.path,
+            tuple(sorted((name, _freeze(value)) for name, value in path_values.items())),
+            tuple(sorted((name, _freeze(value)) for name, value in values.items())),
+        )
+
+
+# Singleton instance
+response_cache = ResponseCache(cache_backend)
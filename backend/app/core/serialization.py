@@ -0,0 +1,66 @@
+"""
+Fast JSON rendering for list responses.
+
+List services return plain dict payloads; routes encode them straight to
+bytes here instead of building a Pydantic model per row and letting
+FastAPI validate and re-encode it. The output matches FastAPI's default
+encoding of the declared ``response_model`` (compact, UTF-8, ISO 8601
+datetimes with ``Z`` for UTC), so the OpenAPI schema and the wire format are unchanged.
+"""
+
+import json
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from collections.abc import Mapping
+from typing import Any, Optional
+
+from starlette.responses import Response
+
+try:  # orjson is optional; the stdlib encoder produces the same bytes without it
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Encode the non-JSON types found in database rows."""
+    if isinstance(value, datetime) and value.utcoffset() == timedelta(0):
+        return value.replace(tzinfo=None).isoformat() + "Z"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def dumps_stdlib(value: Any) -> bytes:
+    """Compact UTF-8 JSON with the standard library encoder."""
+    return json.dumps(
+        value, ensure_ascii=False, separators=(",", ":"), default=_default
+    ).encode("utf-8")
+
+
+def dumps(value: Any) -> bytes:
+    """Compact UTF-8 JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_UTC_Z)
+    return dumps_stdlib(value)
+
+
+def raw_json(data: bytes) -> Any:
+    """
+    An already encoded JSON document, to embed in a payload passed to ``dumps``.
+
+    With orjson's ``Fragment`` the bytes are copied into the output as they
+    are; otherwise they are parsed and encoded again.
+    """
+    if orjson is not None:
+        if hasattr(orjson, "Fragment"):
+            return orjson.Fragment(data)
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_response(payload: Any, headers: Optional[Mapping[str, str]] = None) -> Response:
+    """A JSON response for an already validated payload, skipping ``response_model`` checks."""
+    return Response(dumps(payload), headers=headers, media_type="application/json")
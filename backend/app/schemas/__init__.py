@@ -2,7 +2,22 @@
 Pydantic Schemas: Request/Response validation models.
 """
 
-from app.schemas.common import HealthResponse, MessageResponse, PaginatedResponse
+from app.schemas.batch import (
+    BatchRequest,
+    BatchRequestItem,
+    BatchResult,
+    BatchResultItem,
+)
+from app.schemas.common import (
+    BatchResponse,
+    CacheInvalidateResponse,
+    FacetValue,
+    HealthResponse,
+    MessageResponse,
+    PaginatedResponse,
+    ResponseCacheStats,
+    RouteCacheStats,
+)
 from app.schemas.documents import (
     DocumentBase,
     DocumentDetail,
@@ -12,6 +27,7 @@ from app.schemas.documents import (
 from app.schemas.games import (
     GameBase,
     GameDetail,
+    GameDetailWithIncludes,
     GameListItem,
     GameQueryParams,
 )
@@ -37,6 +53,7 @@ from app.schemas.metadata import (
     HomebrewCatResponse,
     LanguageResponse,
     LicenseResponse,
+    MetadataVersionResponse,
     OSResponse,
     PatchHintsResponse,
     PatchStatusResponse,
@@ -44,6 +61,12 @@ from app.schemas.metadata import (
     SkillLevelResponse,
     UtilCatResponse,
 )
+from app.schemas.search import (
+    GlobalSearchResponse,
+    SearchSection,
+    Suggestion,
+    SuggestResponse,
+)
 from app.schemas.translations import (
     TransImageResponse,
     TranslationBase,
@@ -60,9 +83,14 @@ from app.schemas.utilities import (
 
 __all__ = [
     # Common
+    "BatchResponse",
+    "CacheInvalidateResponse",
+    "FacetValue",
     "HealthResponse",
     "MessageResponse",
     "PaginatedResponse",
+    "ResponseCacheStats",
+    "RouteCacheStats",
     # Metadata
     "AllMetadataResponse",
     "CategoryResponse",
@@ -72,6 +100,7 @@ __all__ = [
     "HomebrewCatResponse",
     "LanguageResponse",
     "LicenseResponse",
+    "MetadataVersionResponse",
     "OSResponse",
     "PatchHintsResponse",
     "PatchStatusResponse",
@@ -110,4 +139,14 @@ __all__ = [
     "HomebrewDetail",
     "HomebrewListItem",
     "HomebrewQueryParams",
+    # Search
+    "GlobalSearchResponse",
+    "SearchSection",
+    "Suggestion",
+    "SuggestResponse",
+    # Batch
+    "BatchRequest",
+    "BatchRequestItem",
+    "BatchResult",
+    "BatchResultItem",
 ]
@@ -0,0 +1,49 @@
+"""
+Batch request schemas.
+Several GET requests to the v1 API sent and answered in one call.
+"""
+
+from typing import Any, Optional
+
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+
+
+class BatchRequestItem(BaseModel):
+    """One GET sub-request."""
+
+    id: Optional[str] = Field(None, description="Client reference, echoed in the result")
+    method: str = Field("GET", pattern="^GET$", description="HTTP method (only GET is supported)")
+    path: str = Field(
+        ...,
+        description="Path relative to /api/v1, with its query string (e.g. /games?page_size=1)",
+    )
+
+
+class BatchRequest(BaseModel):
+    """Sub-requests to run."""
+
+    requests: list[BatchRequestItem] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.batch_max_requests,
+        description="GET sub-requests, answered in the same order",
+    )
+
+
+class BatchResultItem(BaseModel):
+    """Response to one sub-request."""
+
+    id: Optional[str] = Field(None, description="Client reference of the sub-request")
+    path: str = Field(..., description="Requested path")
+    status: int = Field(..., description="HTTP status code of the sub-request")
+    body: Any = Field(None, description="Response body (JSON, or text for other content types)")
+    elapsed_ms: float = Field(..., description="Time the sub-request took to answer")
+
+
+class BatchResult(BaseModel):
+    """Responses to a batch, in request order."""
+
+    results: list[BatchResultItem] = Field(..., description="One result per sub-request")
+    elapsed_ms: float = Field(..., description="Total time spent on the batch")
@@ -2,7 +2,7 @@
 Common schemas used across the application.
 """
 
-from typing import Generic, TypeVar
+from typing import Generic, Optional, TypeVar
 
 from pydantic import BaseModel, Field
 
@@ -23,11 +23,77 @@ class MessageResponse(BaseModel):
     message: str = Field(..., description="Response message")
 
 
+class FacetValue(BaseModel):
+    """Number of results one filter value would return."""
+
+    value: int = Field(..., description="Filter value (ID)")
+    name: Optional[str] = Field(None, description="Display name of the value")
+    count: int = Field(..., description="Matching items with this value")
+
+
 class PaginatedResponse(BaseModel, Generic[T]):
     """Generic paginated response schema."""
 
     items: list[T] = Field(..., description="List of items")
-    total: int = Field(..., description="Total number of items")
+    total: Optional[int] = Field(
+        ..., description="Total number of items (null when include_total=false)"
+    )
     page: int = Field(..., description="Current page number")
     page_size: int = Field(..., description="Number of items per page")
-    total_pages: int = Field(..., description="Total number of pages")
+    total_pages: Optional[int] = Field(
+        ..., description="Total number of pages (null when include_total=false)"
+    )
+    total_accuracy: Optional[str] = Field(
+        "exact",
+        description='Whether total is "exact" or "estimated"; null when the total was skipped',
+    )
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Keyset cursor for the next page (pass as `cursor`); null on the last page",
+    )
+    facets: Optional[dict[str, list[FacetValue]]] = Field(
+        None,
+        description=(
+            "Per-value counts of the requested facets, most common first; each facet "
+            "ignores its own filter (null unless facets were requested)"
+        ),
+    )
+
+
+class BatchResponse(BaseModel, Generic[T]):
+    """Details looked up by ID, in the order they were requested."""
+
+    items: list[T] = Field(..., description="Found items, in requested order")
+    missing: list[int] = Field(..., description="Requested IDs that do not exist")
+
+
+class RouteCacheStats(BaseModel):
+    """Response cache counters of one route."""
+
+    hits: int = Field(..., description="Requests answered from the cache")
+    misses: int = Field(..., description="Requests rendered and stored")
+    bypasses: int = Field(..., description="Requests whose parameters did not validate")
+
+
+class ResponseCacheStats(BaseModel):
+    """Size and counters of the response cache."""
+
+    enabled: bool = Field(..., description="Whether responses are being cached")
+    backend: str = Field(..., description='Cache storage ("memory" or "sqlite", shared by workers)')
+    entries: int = Field(..., description="Cached entries (responses and counts)")
+    bytes: int = Field(..., description="Total size of the cached entries")
+    max_bytes: int = Field(..., description="Size budget; least recently used entries are evicted")
+    hits: int = Field(..., description="Lookups answered from the cache (this worker)")
+    misses: int = Field(..., description="Lookups not in the cache or expired (this worker)")
+    evictions: int = Field(..., description="Entries evicted to stay within the budget (this worker)")
+    coalesced: int = Field(..., description="Requests that awaited an identical in-flight render")
+    in_flight: int = Field(..., description="Renders currently in progress")
+    routes: dict[str, RouteCacheStats] = Field(
+        default_factory=dict, description="Counters per route path"
+    )
+
+
+class CacheInvalidateResponse(BaseModel):
+    """Result of a response cache invalidation."""
+
+    dropped: int = Field(..., description="Number of cached responses dropped")
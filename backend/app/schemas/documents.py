@@ -73,10 +73,19 @@ class DocumentQueryParams(BaseModel):
     """Query parameters for document list filtering."""
 
     q: Optional[str] = Field(None, description="Search query for title")
+    game: Optional[int] = Field(None, description="Filter by game ID")
     category: Optional[int] = Field(None, description="Filter by category ID")
     console: Optional[int] = Field(None, description="Filter by console ID")
     skill_level: Optional[int] = Field(None, description="Filter by skill level ID")
     page: int = Field(1, ge=1, description="Page number")
     page_size: int = Field(50, ge=1, le=200, description="Items per page")
-    sort_by: str = Field("title", description="Sort field")
+    sort_by: str = Field("title", description="Sort field (or relevance when searching)")
     sort_order: str = Field("asc", description="Sort order (asc/desc)")
+    cursor: Optional[str] = Field(None, description="Keyset cursor from a previous page")
+    include_total: bool = Field(True, description="Compute the total item count")
+    count_mode: str = Field("exact", description="Total count mode (exact/estimate)")
+    search_mode: str = Field("auto", description="Title search mode (auto/substring/natural/boolean)")
+    q_scope: str = Field("title", description="Match q against the title, or title and description")
+    facets: Optional[str] = Field(None, description="Comma-separated facets to count (category, console, skill_level)")
+    fields: Optional[str] = Field(None, description="Comma-separated fields to return (default: all)")
+    ids: Optional[str] = Field(None, description="Comma-separated IDs to look up instead of listing")
@@ -7,6 +7,12 @@ from typing import Optional
 
 from pydantic import BaseModel, Field
 
+from app.schemas.common import PaginatedResponse
+from app.schemas.documents import DocumentListItem
+from app.schemas.hacks import HackListItem
+from app.schemas.translations import TranslationListItem
+from app.schemas.utilities import UtilityListItem
+
 
 class GameBase(BaseModel):
     """Base game schema with common fields."""
@@ -55,6 +61,28 @@ class GameDetail(GameBase):
     document_count: int = Field(0, description="Number of documents for this game")
 
 
+class GameDetailWithIncludes(GameDetail):
+    """
+    Game detail with the related content requested through ``include``.
+
+    Each included section is the first page of the matching
+    ``/games/{gamekey}/...`` list; sections that were not requested are omitted.
+    """
+
+    hacks: Optional[PaginatedResponse[HackListItem]] = Field(
+        None, description="First page of the game's hacks (include=hacks)"
+    )
+    translations: Optional[PaginatedResponse[TranslationListItem]] = Field(
+        None, description="First page of the game's translations (include=translations)"
+    )
+    utilities: Optional[PaginatedResponse[UtilityListItem]] = Field(
+        None, description="First page of the game's utilities (include=utilities)"
+    )
+    documents: Optional[PaginatedResponse[DocumentListItem]] = Field(
+        None, description="First page of the game's documents (include=documents)"
+    )
+
+
 class GameQueryParams(BaseModel):
     """Query parameters for game list filtering."""
 
@@ -65,5 +93,12 @@ class GameQueryParams(BaseModel):
     has_translations: Optional[bool] = Field(None, description="Filter games with translations")
     page: int = Field(1, ge=1, description="Page number")
     page_size: int = Field(50, ge=1, le=200, description="Items per page")
-    sort_by: str = Field("gametitle", description="Sort field")
+    sort_by: str = Field("gametitle", description="Sort field (or relevance when searching)")
     sort_order: str = Field("asc", description="Sort order (asc/desc)")
+    cursor: Optional[str] = Field(None, description="Keyset cursor from a previous page")
+    include_total: bool = Field(True, description="Compute the total item count")
+    count_mode: str = Field("exact", description="Total count mode (exact/estimate)")
+    search_mode: str = Field("auto", description="Title search mode (auto/substring/natural/boolean)")
+    fuzzy: bool = Field(False, description="Typo-tolerant title search ranked by similarity")
+    fields: Optional[str] = Field(None, description="Comma-separated fields to return (default: all)")
+    ids: Optional[str] = Field(None, description="Comma-separated IDs to look up instead of listing")
@@ -96,5 +96,14 @@ class HackQueryParams(BaseModel):
     category: Optional[int] = Field(None, description="Filter by category ID")
     page: int = Field(1, ge=1, description="Page number")
     page_size: int = Field(50, ge=1, le=200, description="Items per page")
-    sort_by: str = Field("hacktitle", description="Sort field")
+    sort_by: str = Field("hacktitle", description="Sort field (or relevance when searching)")
     sort_order: str = Field("asc", description="Sort order (asc/desc)")
+    cursor: Optional[str] = Field(None, description="Keyset cursor from a previous page")
+    include_total: bool = Field(True, description="Compute the total item count")
+    count_mode: str = Field("exact", description="Total count mode (exact/estimate)")
+    search_mode: str = Field("auto", description="Title search mode (auto/substring/natural/boolean)")
+    fuzzy: bool = Field(False, description="Typo-tolerant title search ranked by similarity")
+    q_scope: str = Field("title", description="Match q against the title, or title and description")
+    facets: Optional[str] = Field(None, description="Comma-separated facets to count (console, category)")
+    fields: Optional[str] = Field(None, description="Comma-separated fields to return (default: all)")
+    ids: Optional[str] = Field(None, description="Comma-separated IDs to look up instead of listing")
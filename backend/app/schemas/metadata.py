@@ -3,6 +3,7 @@ Schemas for lookup/metadata tables.
 Used for API responses when serving cached lookup data.
 """
 
+from datetime import datetime
 from typing import Optional
 
 from pydantic import BaseModel, Field
@@ -130,9 +131,17 @@ class PatchHintsResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class MetadataVersionResponse(BaseModel):
+    """Version of the in-memory metadata store."""
+
+    version: int = Field(..., description="Content version; changes only when lookup data changes")
+    loaded_at: datetime = Field(..., description="When this worker loaded the store")
+
+
 class AllMetadataResponse(BaseModel):
     """Combined metadata response for initial app load."""
 
+    version: int = Field(..., description="Content version of the metadata store")
     consoles: list[ConsoleResponse] = Field(..., description="All consoles")
     genres: list[GenreResponse] = Field(..., description="All genres")
     languages: list[LanguageResponse] = Field(..., description="All languages")
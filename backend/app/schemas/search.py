@@ -0,0 +1,65 @@
+"""
+Global search schemas.
+Categorized results of a search across all content sections.
+"""
+
+from typing import Generic, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+from app.schemas.documents import DocumentListItem
+from app.schemas.games import GameListItem
+from app.schemas.hacks import HackListItem
+from app.schemas.homebrew import HomebrewListItem
+from app.schemas.translations import TranslationListItem
+from app.schemas.utilities import UtilityListItem
+
+T = TypeVar("T")
+
+
+class SearchSection(BaseModel, Generic[T]):
+    """Results of one content section."""
+
+    status: str = Field(
+        "ok",
+        description='"ok", "timeout" (missed the time budget), "error" or "skipped"',
+    )
+    items: list[T] = Field(default_factory=list, description="Top matches, up to the limit")
+    total: Optional[int] = Field(
+        None, description="Total number of matches (null unless include_total=true)"
+    )
+    elapsed_ms: Optional[float] = Field(None, description="Time the section took to answer")
+
+
+class GlobalSearchResponse(BaseModel):
+    """Categorized results of a global search."""
+
+    query: str = Field(..., description="The search query")
+    partial: bool = Field(
+        False, description="True if any section timed out or failed and is incomplete"
+    )
+    elapsed_ms: float = Field(..., description="Total time spent searching")
+    games: SearchSection[GameListItem] = Field(default_factory=SearchSection)
+    hacks: SearchSection[HackListItem] = Field(default_factory=SearchSection)
+    translations: SearchSection[TranslationListItem] = Field(default_factory=SearchSection)
+    utilities: SearchSection[UtilityListItem] = Field(default_factory=SearchSection)
+    documents: SearchSection[DocumentListItem] = Field(default_factory=SearchSection)
+    homebrew: SearchSection[HomebrewListItem] = Field(default_factory=SearchSection)
+
+
+class Suggestion(BaseModel):
+    """One autocomplete suggestion."""
+
+    section: str = Field(..., description="Content section (games, hacks, ...)")
+    id: int = Field(..., description="Primary key within the section")
+    title: str = Field(..., description="Display title")
+    downloads: int = Field(
+        ..., description="Downloads used for ranking (games: of their hacks and translations)"
+    )
+
+
+class SuggestResponse(BaseModel):
+    """Autocomplete suggestions for a title prefix."""
+
+    query: str = Field(..., description="The typed prefix")
+    items: list[Suggestion] = Field(..., description="Suggestions, most downloaded first")
@@ -100,5 +100,12 @@ class TranslationQueryParams(BaseModel):
     status: Optional[int] = Field(None, description="Filter by patch status ID")
     page: int = Field(1, ge=1, description="Page number")
     page_size: int = Field(50, ge=1, le=200, description="Items per page")
-    sort_by: str = Field("created", description="Sort field")
+    sort_by: str = Field("created", description="Sort field (or relevance when searching descriptions)")
     sort_order: str = Field("desc", description="Sort order (asc/desc)")
+    cursor: Optional[str] = Field(None, description="Keyset cursor from a previous page")
+    include_total: bool = Field(True, description="Compute the total item count")
+    count_mode: str = Field("exact", description="Total count mode (exact/estimate)")
+    q_scope: str = Field("title", description="Match q against the title, or title and description")
+    facets: Optional[str] = Field(None, description="Comma-separated facets to count (console, language, status)")
+    fields: Optional[str] = Field(None, description="Comma-separated fields to return (default: all)")
+    ids: Optional[str] = Field(None, description="Comma-separated IDs to look up instead of listing")
@@ -3,16 +3,20 @@ Services: Business logic layer.
 Contains all service classes for database operations and business logic.
 """
 
+from app.services.batch_service import BatchService, batch_service
 from app.services.document_service import DocumentService, document_service
 from app.services.game_service import GameService, game_service
 from app.services.hack_service import HackService, hack_service
 from app.services.health_service import check_health
 from app.services.homebrew_service import HomebrewService, homebrew_service
 from app.services.metadata_service import MetadataService, metadata_service
+from app.services.search_service import SearchService, search_service
 from app.services.translation_service import TranslationService, translation_service
 from app.services.utility_service import UtilityService, utility_service
 
 __all__ = [
+    "BatchService",
+    "batch_service",
     "check_health",
     "DocumentService",
     "document_service",
@@ -24,6 +28,8 @@ __all__ = [
     "homebrew_service",
     "MetadataService",
     "metadata_service",
+    "SearchService",
+    "search_service",
     "TranslationService",
     "translation_service",
     "UtilityService",
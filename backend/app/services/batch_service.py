@@ -0,0 +1,150 @@
+"""
+Batch request service.
+Runs several GET requests to the v1 API in-process, concurrently and with
+bounded parallelism.
+"""
+
+import asyncio
+import time
+from typing import Any
+from urllib.parse import unquote
+
+from starlette.types import ASGIApp, Message, Scope
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.core.serialization import raw_json
+from app.schemas import BatchRequestItem
+
+logger = get_logger(__name__)
+
+# Sub-request paths are relative to this prefix
+API_PREFIX = "/api/v1"
+
+# Scope keys a sub-request inherits from the batch request
+_INHERITED_SCOPE = ("asgi", "http_version", "scheme", "server", "client", "root_path")
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+class BatchService:
+    """
+    Dispatches sub-requests straight into the ASGI application.
+
+    Each sub-request goes through the same middleware, routing, validation,
+    response cache and error handling as a separate HTTP request, and gets
+    its own database session, but skips the network round trip and HTTP
+    parsing. Bodies are requested uncompressed and embedded as JSON.
+    """
+
+    async def run(
+        self, app: ASGIApp, requests: list[BatchRequestItem], parent: Scope
+    ) -> dict[str, Any]:
+        """
+        Run sub-requests concurrently, at most ``batch_max_concurrency`` at a time.
+
+        Args:
+            app: Application to dispatch into
+            requests: GET sub-requests
+            parent: Scope of the batch request
+
+        Returns:
+            Payload shaped like ``BatchResult``, with results in request order
+        """
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(settings.batch_max_concurrency)
+
+        async def bounded(item: BatchRequestItem) -> dict[str, Any]:
+            async with semaphore:
+                return await self._dispatch(app, item, parent)
+
+        results = await asyncio.gather(*(bounded(item) for item in requests))
+        return {"results": results, "elapsed_ms": _elapsed_ms(start)}
+
+    async def _dispatch(
+        self, app: ASGIApp, item: BatchRequestItem, parent: Scope
+    ) -> dict[str, Any]:
+        """Run one sub-request and capture its response."""
+        start = time.perf_counter()
+        path, _, query = item.path.partition("?")
+        if not path.startswith("/") or path == "/batch" or path.startswith("/batch/"):
+            return self._result(
+                item, 400, {"detail": "Path must start with / and cannot be /batch"}, start
+            )
+
+        raw_path = API_PREFIX + path
+        scope: Scope = {key: parent[key] for key in _INHERITED_SCOPE if key in parent}
+        scope.update(
+            type="http",
+            method="GET",
+            path=unquote(raw_path),
+            raw_path=raw_path.encode(),
+            query_string=query.encode(),
+            headers=[
+                (b"host", dict(parent["headers"]).get(b"host", b"localhost")),
+                (b"accept", b"application/json"),
+                (b"accept-encoding", b"identity"),
+            ],
+            state=dict(parent.get("state", {})),
+        )
+
+        status = None
+        content_type = b""
+        body: list[bytes] = []
+        complete = asyncio.Event()
+        requested = False
+
+        async def receive() -> Message:
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await complete.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Message) -> None:
+            nonlocal status, content_type
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                content_type = dict(message.get("headers", [])).get(b"content-type", b"")
+            elif message["type"] == "http.response.body":
+                body.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    complete.set()
+
+        try:
+            await app(scope, receive, send)
+        except Exception:
+            # The error handler has already logged the failure and answered 500,
+            # unless it happened before a response was started
+            if status is None:
+                logger.exception(f"Batch sub-request GET {item.path} failed")
+                return self._result(item, 500, {"detail": "Internal server error"}, start)
+        finally:
+            complete.set()
+
+        data = b"".join(body)
+        if not data:
+            content = None
+        elif content_type.startswith(b"application/json"):
+            content = raw_json(data)
+        else:
+            content = data.decode("utf-8", errors="replace")
+        return self._result(item, status or 500, content, start)
+
+    @staticmethod
+    def _result(item: BatchRequestItem, status: int, body: Any, start: float) -> dict[str, Any]:
+        """Result of one sub-request, shaped like ``BatchResultItem``."""
+        return {
+            "id": item.id,
+            "path": item.path,
+            "status": status,
+            "body": body,
+            "elapsed_ms": _elapsed_ms(start),
+        }
+
+
+# Singleton instance
+batch_service = BatchService()
@@ -0,0 +1,398 @@
+"""
+Count strategy layer for paginated list endpoints.
+Serves exact totals from the shared cache, estimates totals from cached
+per-column cardinalities, or skips counting entirely. Also computes
+per-value facet counts for filter sidebars.
+"""
+
+import asyncio
+import json
+from collections.abc import Awaitable, Mapping
+from dataclasses import dataclass
+from typing import Any, Optional, TypeVar
+
+from fastapi import HTTPException
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.cache_backend import CacheBackend, cache_backend
+from app.core.config import settings
+from app.db.session import async_session_maker
+from app.services.metadata_service import LookupSnapshot
+
+COUNT_MODES = ("exact", "estimate")
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class FilterTerm:
+    """
+    A single equality filter on a list query.
+
+    Flag terms match existence flags (``column > 0``) such as
+    ``Game.hackexist``; all other terms match ``column == value``.
+    """
+
+    column: Any
+    value: Any
+    flag: bool = False
+
+    @property
+    def clause(self) -> ColumnElement[bool]:
+        """SQL predicate for this term."""
+        return self.column > 0 if self.flag else self.column == self.value
+
+    @property
+    def key(self) -> tuple[str, bool, Any]:
+        """Hashable, normalized representation used in cache keys."""
+        return (self.column.key, self.flag, True if self.flag else self.value)
+
+
+def active_terms(*terms: FilterTerm) -> list[FilterTerm]:
+    """Keep only the terms whose filter value was actually supplied."""
+    return [term for term in terms if term.value]
+
+
+@dataclass(frozen=True)
+class Facet:
+    """
+    A filter whose per-value counts can be requested with ``facets=``.
+
+    Attributes:
+        column: Filtered column; also matched against ``FilterTerm.column``
+        lookup: ``LookupSnapshot`` attribute naming the values, if any
+    """
+
+    column: Any
+    lookup: Optional[str] = None
+
+
+def parse_facets(requested: Optional[str], available: Mapping[str, Facet]) -> list[str]:
+    """
+    Parse a comma-separated ``facets`` parameter.
+
+    Raises:
+        HTTPException: If an unknown facet is requested
+    """
+    if not requested:
+        return []
+    names = list(dict.fromkeys(name.strip() for name in requested.split(",") if name.strip()))
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Unknown facet(s): {', '.join(unknown)}; "
+                f"available: {', '.join(available)}"
+            ),
+        )
+    return names
+
+
+def facet_values(
+    counts: Mapping[str, Mapping[int, int]],
+    available: Mapping[str, Facet],
+    lookups: LookupSnapshot,
+) -> Optional[dict[str, list[dict[str, Any]]]]:
+    """
+    Name the values of computed facet counts; None if no facets were requested.
+
+    Values are ``FacetValue``-shaped dicts for ``page_payload``.
+    """
+    if not counts:
+        return None
+    result = {}
+    for name, values in counts.items():
+        lookup = available[name].lookup
+        names = getattr(lookups, lookup) if lookup else {}
+        result[name] = [
+            {"value": value, "name": names.get(value), "count": n}
+            for value, n in sorted(values.items(), key=lambda item: (-item[1], item[0]))
+        ]
+    return result
+
+
+@dataclass(frozen=True)
+class TotalCount:
+    """Total item count of a list query and how it was obtained."""
+
+    total: Optional[int] = None
+    accuracy: Optional[str] = None  # "exact", "estimated" or None when skipped
+
+    def total_pages(self, page_size: int) -> Optional[int]:
+        """Number of pages for ``page_size``, or None when the total is unknown."""
+        if self.total is None:
+            return None
+        return (self.total + page_size - 1) // page_size
+
+
+def page_payload(
+    items: list[dict[str, Any]],
+    count: TotalCount,
+    *,
+    page: int,
+    page_size: int,
+    next_cursor: Optional[str] = None,
+    facets: Optional[dict[str, list[dict[str, Any]]]] = None,
+) -> dict[str, Any]:
+    """
+    A list page as a plain dict with the fields of ``PaginatedResponse``.
+
+    List services build rows as dicts and routes encode the page directly
+    (see ``app.core.serialization``), skipping per-row model validation.
+    Keys are in the order of the schema's fields, so the encoded bytes
+    match what FastAPI would produce from the model.
+    """
+    return {
+        "items": items,
+        "total": count.total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": count.total_pages(page_size),
+        "total_accuracy": count.accuracy,
+        "next_cursor": next_cursor,
+        "facets": facets,
+    }
+
+
+class CountStrategy:
+    """
+    Resolves list totals using the cheapest strategy the caller allows.
+
+    Exact counts are cached per normalized filter tuple. Estimates combine
+    cached per-column histograms (``GROUP BY column``) under an independence
+    assumption; free-text searches cannot be estimated and are counted exactly.
+
+    Counts run on their own pooled session so callers can await them
+    concurrently with the page query (see ``with_total``).
+
+    Cached values are stored as JSON in the shared ``CacheBackend``, one
+    namespace per table, for ``count_cache_ttl_seconds``.
+    """
+
+    scope = "counts"
+
+    def __init__(self, backend: CacheBackend) -> None:
+        self._backend = backend
+
+    async def _cached(self, key: tuple[Any, ...]) -> Optional[Any]:
+        """Cached total, histogram or facet counts for ``key`` (table second)."""
+        data = await self._backend.get(self.scope, key[1], repr(key))
+        if data is None:
+            return None
+        value = json.loads(data)
+        # Mappings are stored as pairs, as JSON object keys are always strings
+        return {k: v for k, v in value} if isinstance(value, list) else value
+
+    async def _store(self, key: tuple[Any, ...], value: Any) -> None:
+        if isinstance(value, dict):
+            value = list(value.items())
+        await self._backend.set(
+            self.scope,
+            key[1],
+            repr(key),
+            json.dumps(value, separators=(",", ":")).encode("utf-8"),
+            settings.count_cache_ttl_seconds,
+        )
+
+    async def count(
+        self,
+        entity: Any,
+        count_query: Select,
+        *,
+        terms: list[FilterTerm],
+        search: tuple[Any, ...] = (),
+        include_total: bool = True,
+        mode: str = "exact",
+    ) -> TotalCount:
+        """
+        Resolve the total for a list query.
+
+        Args:
+            entity: ORM model being listed
+            count_query: Fully filtered ``SELECT COUNT(*)`` statement
+            terms: Equality filters applied to ``count_query``
+            search: Normalized description of any free-text filter
+            include_total: If False, skip counting entirely
+            mode: "exact" or "estimate"
+
+        Returns:
+            The resolved total and its accuracy
+        """
+        if not include_total:
+            return TotalCount()
+
+        key = (
+            "exact",
+            entity.__tablename__,
+            tuple(sorted(term.key for term in terms)),
+            search,
+        )
+        total = await self._cached(key)
+        if total is not None:
+            return TotalCount(total=total, accuracy="exact")
+
+        async with async_session_maker() as session:
+            if mode == "estimate" and terms and not search:
+                return await self._estimate(session, entity, terms)
+
+            result = await session.execute(count_query)
+            total = result.scalar() or 0
+        await self._store(key, total)
+        return TotalCount(total=total, accuracy="exact")
+
+    async def _estimate(
+        self, session: AsyncSession, entity: Any, terms: list[FilterTerm]
+    ) -> TotalCount:
+        """Estimate a total from per-column cardinalities."""
+        table_total = await self._table_total(session, entity)
+        if table_total == 0:
+            return TotalCount(total=0, accuracy="exact")
+
+        estimate = float(table_total)
+        for term in terms:
+            histogram = await self._histogram(session, entity, term.column)
+            if term.flag:
+                matching = sum(n for value, n in histogram.items() if value and value > 0)
+            else:
+                matching = histogram.get(term.value, 0)
+            estimate *= matching / table_total
+
+        # A single term is answered exactly by its histogram
+        accuracy = "exact" if len(terms) == 1 else "estimated"
+        return TotalCount(total=round(estimate), accuracy=accuracy)
+
+    async def _table_total(self, session: AsyncSession, entity: Any) -> int:
+        """Unfiltered row count of the entity's table."""
+        key = ("exact", entity.__tablename__, (), ())
+        total = await self._cached(key)
+        if total is None:
+            result = await session.execute(select(func.count()).select_from(entity))
+            total = result.scalar() or 0
+            await self._store(key, total)
+        return total
+
+    async def _histogram(
+        self, session: AsyncSession, entity: Any, column: Any
+    ) -> dict[Any, int]:
+        """Cached ``value -> row count`` mapping for one column."""
+        key = ("histogram", entity.__tablename__, column.key)
+        histogram = await self._cached(key)
+        if histogram is None:
+            result = await session.execute(
+                select(column, func.count()).select_from(entity).group_by(column)
+            )
+            histogram = {value: n for value, n in result.all()}
+            await self._store(key, histogram)
+        return histogram
+
+    async def facets(
+        self,
+        entity: Any,
+        base_query: Select,
+        available: Mapping[str, Facet],
+        names: list[str],
+        *,
+        terms: list[FilterTerm],
+        search: tuple[Any, ...] = (),
+    ) -> dict[str, dict[int, int]]:
+        """
+        Count list results per value of each requested facet.
+
+        Each facet applies every filter except its own, so the counts say
+        how many results selecting that value instead would return. All
+        uncached facets are computed in a single ``UNION ALL`` of
+        ``GROUP BY`` queries; results are cached like exact totals.
+
+        Args:
+            entity: ORM model being listed
+            base_query: ``SELECT COUNT(*)`` with the search applied but no filter terms
+            available: Facets of the endpoint by name
+            names: Requested facet names (see ``parse_facets``)
+            terms: Equality filters of the request
+            search: Normalized description of any free-text filter
+
+        Returns:
+            ``value -> count`` per requested facet
+        """
+        counts: dict[str, dict[int, int]] = {}
+        pending: dict[str, tuple[Any, ...]] = {}
+        for name in names:
+            column = available[name].column
+            others = [term for term in terms if term.column.key != column.key]
+            key = (
+                "facets",
+                entity.__tablename__,
+                name,
+                tuple(sorted(term.key for term in others)),
+                search,
+            )
+            cached = await self._cached(key)
+            if cached is not None:
+                counts[name] = cached
+            else:
+                pending[name] = key
+
+        if pending:
+            selects = []
+            for name in pending:
+                column = available[name].column
+                query = base_query.with_only_columns(
+                    literal(name).label("facet"),
+                    column.label("value"),
+                    func.count().label("n"),
+                    maintain_column_froms=True,
+                )
+                for term in terms:
+                    if term.column.key != column.key:
+                        query = query.where(term.clause)
+                selects.append(query.group_by(column))
+
+            async with async_session_maker() as session:
+                result = await session.execute(union_all(*selects))
+            computed: dict[str, dict[int, int]] = {name: {} for name in pending}
+            for facet, value, n in result.all():
+                if value is not None:
+                    computed[facet][value] = n
+            for name, key in pending.items():
+                await self._store(key, computed[name])
+            counts.update(computed)
+
+        return {name: counts[name] for name in names}
+
+    async def clear(self) -> None:
+        """Forget all cached totals and histograms."""
+        await self._backend.invalidate(self.scope)
+
+    async def invalidate(self, table: str) -> None:
+        """Forget cached totals and histograms of one table after its rows changed."""
+        await self._backend.invalidate(self.scope, [table])
+
+
+async def with_total(
+    count: Awaitable[TotalCount],
+    page: Awaitable[T],
+    facets: Optional[Awaitable[dict[str, dict[int, int]]]] = None,
+) -> tuple[TotalCount, T, dict[str, dict[int, int]]]:
+    """
+    Await a count, a page query and optional facet counts, concurrently
+    unless disabled in settings.
+
+    The count and facets use their own pooled connections, so running them
+    at once with the page query saves database round-trip latency.
+    """
+    facets = facets if facets is not None else _no_facets()
+    if settings.concurrent_count_queries:
+        return tuple(await asyncio.gather(count, page, facets))
+    return await count, await page, await facets
+
+
+async def _no_facets() -> dict[str, dict[int, int]]:
+    return {}
+
+
+# Singleton instance
+count_strategy = CountStrategy(cache_backend)
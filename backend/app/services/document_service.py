@@ -3,15 +3,56 @@ Document service for document-related operations.
 Handles fetching, filtering, and searching documents.
 """
 
-from typing import Optional
+from typing import Any, Optional
 
 from fastapi import HTTPException
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Category, Console, Document, Game, SkillLevel
-from app.schemas.common import PaginatedResponse
+from app.models import Document, Game
 from app.schemas.documents import DocumentDetail, DocumentListItem
+from app.services.counting import (
+    Facet,
+    FilterTerm,
+    active_terms,
+    count_strategy,
+    facet_values,
+    page_payload,
+    parse_facets,
+    with_total,
+)
+from app.services.fields import FieldSet, ItemField
+from app.services.lookup import lookup_by_ids
+from app.services.metadata_service import metadata_service
+from app.services.pagination import paginate, resolve_sort_column, split_page
+from app.services.search_engine import RELEVANCE, SearchTarget, normalize_query, search_engine
+
+
+# Title search: trigram index, then the FULLTEXT index on these columns
+DOCUMENT_SEARCH = SearchTarget("documents", (Document.title,), Document.dockey)
+
+# Description search: BM25 index over the title and description
+DOCUMENT_TEXT_SEARCH = SearchTarget(
+    "documents", (Document.title, Document.description), Document.dockey, fulltext=False
+)
+
+# Facets: filter parameter -> column and lookup naming its values
+DOCUMENT_FACETS = {
+    "category": Facet(Document.categorykey, "doc_categories"),
+    "console": Facet(Document.consolekey, "consoles"),
+    "skill_level": Facet(Document.explevel, "skill_levels"),
+}
+
+# Response fields that are not plain document columns
+_GAME_JOIN = (Game, Document.gamekey == Game.gamekey)
+_DOCUMENT_SOURCES = {
+    "category_name": ItemField(Document.categorykey, lookup="doc_categories"),
+    "console_name": ItemField(Document.consolekey, lookup="consoles"),
+    "game_title": ItemField(Game.gametitle, join=_GAME_JOIN),
+    "skill_level": ItemField(Document.explevel, lookup="skill_levels"),
+}
+DOCUMENT_LIST_FIELDS = FieldSet(Document, DocumentListItem, **_DOCUMENT_SOURCES)
+DOCUMENT_DETAIL_FIELDS = FieldSet(Document, DocumentDetail, **_DOCUMENT_SOURCES)
 
 
 class DocumentService:
@@ -22,6 +63,7 @@ class DocumentService:
         session: AsyncSession,
         *,
         q: Optional[str] = None,
+        game: Optional[int] = None,
         category: Optional[int] = None,
         console: Optional[int] = None,
         skill_level: Optional[int] = None,
@@ -29,141 +71,152 @@ class DocumentService:
         page_size: int = 50,
         sort_by: str = "title",
         sort_order: str = "asc",
-    ) -> PaginatedResponse[DocumentListItem]:
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        count_mode: str = "exact",
+        search_mode: str = "auto",
+        q_scope: str = "title",
+        facets: Optional[str] = None,
+        fields: Optional[str] = None,
+    ) -> dict[str, Any]:
         """
         Get paginated list of documents with filters.
 
         Args:
             session: Database session
-            q: Search query for title
+            q: Search query for title (FULLTEXT, LIKE for short words)
+            game: Filter by game ID
             category: Filter by category ID
             console: Filter by console ID
             skill_level: Filter by skill level ID
             page: Page number (1-indexed)
             page_size: Items per page
-            sort_by: Field to sort by
+            sort_by: Field to sort by, or "relevance" when searching
             sort_order: Sort direction (asc/desc)
+            cursor: Keyset cursor from a previous page (overrides page)
+            include_total: Whether to compute the total item count
+            count_mode: How to compute the total ("exact" or "estimate")
+            search_mode: How ``q`` is matched ("auto", "substring", "natural" or "boolean")
+            q_scope: Match ``q`` against the "title" or the "description"
+                (title plus description, ranked by BM25)
+            facets: Comma-separated facets to count per value (category, console, skill_level)
+            fields: Comma-separated item fields to select and return (default: all)
 
         Returns:
-            Paginated response with document list items
+            Page payload shaped like ``PaginatedResponse[DocumentListItem]``
         """
-        # Build base query with joins for resolved names
-        query = (
-            select(
-                Document,
-                Category.catname.label("category_name"),
-                Console.description.label("console_name"),
-                Game.gametitle.label("game_title"),
-                SkillLevel.name.label("skill_level"),
-            )
-            .outerjoin(Category, Document.categorykey == Category.categorykey)
-            .outerjoin(Console, Document.consolekey == Console.consoleid)
-            .outerjoin(Game, Document.gamekey == Game.gamekey)
-            .outerjoin(SkillLevel, Document.explevel == SkillLevel.id)
-        )
+        facet_names = parse_facets(facets, DOCUMENT_FACETS)
 
-        # Apply filters
-        if q:
-            query = query.where(Document.title.ilike(f"%{q}%"))
-        if category:
-            query = query.where(Document.categorykey == category)
-        if console:
-            query = query.where(Document.consolekey == console)
-        if skill_level:
-            query = query.where(Document.explevel == skill_level)
-
-        # Get total count
+        # Collect filters; the page query is built once its columns are known
+        terms = active_terms(
+            FilterTerm(Document.gamekey, game),
+            FilterTerm(Document.categorykey, category),
+            FilterTerm(Document.consolekey, console),
+            FilterTerm(Document.explevel, skill_level),
+        )
         count_query = select(func.count()).select_from(Document)
+        search: tuple[str, ...] = ()
+        relevance = None
+        clauses = []
+        q = normalize_query(q)
+        if q and q_scope == "description":
+            # BM25 matches are only meaningful best-first
+            sort_by = RELEVANCE
         if q:
-            count_query = count_query.where(Document.title.ilike(f"%{q}%"))
-        if category:
-            count_query = count_query.where(Document.categorykey == category)
-        if console:
-            count_query = count_query.where(Document.consolekey == console)
-        if skill_level:
-            count_query = count_query.where(Document.explevel == skill_level)
-
-        total_result = await session.execute(count_query)
-        total = total_result.scalar() or 0
-
-        # Apply sorting
-        sort_column = getattr(Document, sort_by, Document.title)
-        if sort_order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-
-        # Apply pagination
-        offset = (page - 1) * page_size
-        query = query.offset(offset).limit(page_size)
-
-        # Execute query
-        result = await session.execute(query)
-        rows = result.all()
+            plan = (
+                search_engine.plan_description(DOCUMENT_TEXT_SEARCH, q)
+                if q_scope == "description"
+                else search_engine.plan(DOCUMENT_SEARCH, q, search_mode, ranked=sort_by == RELEVANCE)
+            )
+            clauses.append(plan.clause)
+            count_query = count_query.where(plan.clause)
+            search, relevance = plan.key, plan.relevance
+        facet_query = count_query
+        for term in terms:
+            clauses.append(term.clause)
+            count_query = count_query.where(term.clause)
 
-        # Build response items
-        items = []
-        for row in rows:
-            doc = row[0]
-            items.append(
-                DocumentListItem(
-                    dockey=doc.dockey,
-                    title=doc.title,
-                    description=doc.description,
-                    categorykey=doc.categorykey,
-                    consolekey=doc.consolekey,
-                    gamekey=doc.gamekey,
-                    explevel=doc.explevel,
-                    category_name=row[1],
-                    console_name=row[2],
-                    game_title=row[3],
-                    skill_level=row[4],
-                    downloads=doc.downloads,
-                    created=doc.created,
-                    lastmod=doc.lastmod,
-                )
+        # Apply sorting and pagination (offset, or keyset when a cursor is given);
+        # relevance always ranks best matches first and is offset-paginated
+        sort_key, sort_column = resolve_sort_column(
+            Document, sort_by, "title", {RELEVANCE: relevance}
+        )
+        descending = sort_key == RELEVANCE or sort_order.lower() == "desc"
+
+        # Select only the requested fields, plus the sort and primary key the
+        # next cursor is built from; lookup names come from the in-memory snapshot
+        projection = DOCUMENT_LIST_FIELDS.project(
+            fields, () if sort_key == RELEVANCE else (sort_column, Document.dockey)
+        )
+        query = paginate(
+            projection.query.where(*clauses),
+            sort_column,
+            Document.dockey,
+            sort_key=sort_key,
+            descending=descending,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+        )
+
+        # Run the count (cached, estimated or skipped per the count strategy),
+        # the page query and any facet counts concurrently on separate connections
+        count, result, facet_counts = await with_total(
+            count_strategy.count(
+                Document,
+                count_query,
+                terms=terms,
+                search=search,
+                include_total=include_total,
+                mode=count_mode,
+            ),
+            session.execute(query),
+            count_strategy.facets(
+                Document, facet_query, DOCUMENT_FACETS, facet_names, terms=terms, search=search
             )
+            if facet_names
+            else None,
+        )
+        rows, next_cursor = split_page(
+            result.all(),
+            page_size,
+            sort_key=sort_key,
+            descending=descending,
+            key=None if sort_key == RELEVANCE else projection.key,
+        )
 
-        total_pages = (total + page_size - 1) // page_size
+        # Build response items
+        lookups = await metadata_service.get_lookups()
+        items = [projection.item(row, lookups) for row in rows]
 
-        return PaginatedResponse[DocumentListItem](
-            items=items,
-            total=total,
+        return page_payload(
+            items,
+            count,
             page=page,
             page_size=page_size,
-            total_pages=total_pages,
+            next_cursor=next_cursor,
+            facets=facet_values(facet_counts, DOCUMENT_FACETS, lookups),
         )
 
-    async def get_document(self, session: AsyncSession, dockey: int) -> DocumentDetail:
+    async def get_document(
+        self, session: AsyncSession, dockey: int, *, fields: Optional[str] = None
+    ) -> dict[str, Any]:
         """
         Get a single document by ID with full details.
-
+        
         Args:
             session: Database session
             dockey: Document primary key
-
+            fields: Comma-separated fields to select and return (default: all)
+        
         Returns:
-            Detailed document information
-
+            Document shaped like ``DocumentDetail``, narrowed to ``fields``
+        
         Raises:
-            HTTPException: If document not found
+            HTTPException: If document not found or an unknown field is requested
         """
-        query = (
-            select(
-                Document,
-                Category.catname.label("category_name"),
-                Console.description.label("console_name"),
-                Game.gametitle.label("game_title"),
-                SkillLevel.name.label("skill_level"),
-            )
-            .outerjoin(Category, Document.categorykey == Category.categorykey)
-            .outerjoin(Console, Document.consolekey == Console.consoleid)
-            .outerjoin(Game, Document.gamekey == Game.gamekey)
-            .outerjoin(SkillLevel, Document.explevel == SkillLevel.id)
-            .where(Document.dockey == dockey)
-        )
-
-        result = await session.execute(query)
+        projection = DOCUMENT_DETAIL_FIELDS.project(fields, (Document.dockey,))
+        result = await session.execute(projection.query.where(Document.dockey == dockey))
         row = result.first()
 
         if not row:
@@ -171,28 +224,62 @@ class DocumentService:
                 status_code=404, detail=f"Document with ID {dockey} not found"
             )
 
-        doc = row[0]
-
-        return DocumentDetail(
-            dockey=doc.dockey,
-            title=doc.title,
-            description=doc.description,
-            categorykey=doc.categorykey,
-            consolekey=doc.consolekey,
-            gamekey=doc.gamekey,
-            authorkey=doc.authorkey,
-            explevel=doc.explevel,
-            version=doc.version,
-            category_name=row[1],
-            console_name=row[2],
-            game_title=row[3],
-            skill_level=row[4],
-            filename=doc.filename,
-            downloads=doc.downloads,
-            reldate=doc.reldate,
-            nofile=doc.nofile,
-            created=doc.created,
-            lastmod=doc.lastmod,
+        lookups = await metadata_service.get_lookups()
+        return projection.item(row, lookups)
+
+    async def get_documents_by_ids(
+        self, session: AsyncSession, ids: str, *, fields: Optional[str] = None
+    ) -> dict[str, Any]:
+        """
+        Get document details for a list of IDs with a single query.
+        
+        Args:
+            session: Database session
+            ids: Comma-separated document IDs
+            fields: Comma-separated fields to select and return (default: all)
+        
+        Returns:
+            Payload shaped like ``BatchResponse[DocumentDetail]``, in requested order
+        
+        Raises:
+            HTTPException: If the IDs are invalid or an unknown field is requested
+        """
+        return await lookup_by_ids(session, DOCUMENT_DETAIL_FIELDS, Document.dockey, ids, fields)
+
+    async def get_documents_for_game(
+        self,
+        session: AsyncSession,
+        gamekey: int,
+        *,
+        page: int = 1,
+        page_size: int = 50,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        fields: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """
+        Get all documents for a specific game.
+        
+        Args:
+            session: Database session
+            gamekey: Game primary key
+            page: Page number
+            page_size: Items per page
+            cursor: Keyset cursor from a previous page (overrides page)
+            include_total: Whether to compute the total item count
+            fields: Comma-separated item fields to select and return (default: all)
+        
+        Returns:
+            Page payload shaped like ``PaginatedResponse[DocumentListItem]``
+        """
+        return await self.get_documents(
+            session,
+            game=gamekey,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            include_total=include_total,
+            fields=fields,
         )
 
 
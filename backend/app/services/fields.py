@@ -0,0 +1,165 @@
+"""
+Sparse fieldsets shared by the list and detail services.
+
+A ``FieldSet`` maps the fields of a response schema to the SQL they are
+read from, so a ``fields=`` request selects only the columns, joins and
+count subqueries the requested fields need, and items carry only those
+fields.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, Optional, Union
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.engine import Row
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.services.metadata_service import LookupSnapshot
+
+
+@dataclass(frozen=True)
+class ItemField:
+    """
+    How one response field is read from a projected row.
+
+    Attributes:
+        column: Selected expression (a column, a joined column or a scalar
+            subquery); None for fields with a constant ``default``
+        lookup: ``LookupSnapshot`` attribute naming the column's value
+        join: ``(target, onclause)`` outer join the column needs
+        default: Value of fields without a column
+    """
+
+    column: Optional[ColumnElement[Any]] = None
+    lookup: Optional[str] = None
+    join: Optional[tuple[Any, ColumnElement[bool]]] = None
+    default: Any = None
+
+
+class FieldSet:
+    """
+    The fields of ``schema``, in schema order, and how to select them from ``model``.
+
+    Fields named like a column of ``model`` read that column; the others
+    must be given as ``sources``, either as an ``ItemField`` or as a plain
+    expression.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        schema: type[BaseModel],
+        **sources: Union[ItemField, ColumnElement[Any]],
+    ) -> None:
+        self.model = model
+        self.fields: dict[str, ItemField] = {}
+        columns = model.__table__.columns
+        for name in schema.model_fields:
+            source = sources.pop(name, None)
+            if source is None:
+                if name not in columns:
+                    raise ValueError(f"No source for field '{name}' of {schema.__name__}")
+                source = getattr(model, name)
+            self.fields[name] = source if isinstance(source, ItemField) else ItemField(source)
+        if sources:
+            raise ValueError(f"Unknown fields for {schema.__name__}: {', '.join(sources)}")
+
+    def parse(self, requested: Optional[str]) -> tuple[str, ...]:
+        """
+        Parse a comma-separated ``fields`` parameter; all fields if not given.
+
+        Requested fields are returned in schema order.
+
+        Raises:
+            HTTPException: If an unknown field is requested
+        """
+        if not requested:
+            return tuple(self.fields)
+        names = {name.strip() for name in requested.split(",") if name.strip()}
+        unknown = sorted(names - self.fields.keys())
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=(
+                    f"Unknown field(s): {', '.join(unknown)}; "
+                    f"available: {', '.join(self.fields)}"
+                ),
+            )
+        return tuple(name for name in self.fields if name in names) or tuple(self.fields)
+
+    def project(
+        self,
+        requested: Optional[str],
+        keys: Sequence[ColumnElement[Any]] = (),
+        joins: Sequence[tuple[Any, ColumnElement[bool]]] = (),
+    ) -> "Projection":
+        """
+        Plan the query for the requested fields.
+
+        Args:
+            requested: Raw ``fields`` parameter
+            keys: Columns the service reads itself (primary key, sort
+                column), selected whether requested or not
+            joins: Joins the service's filters need, made whether a
+                requested field needs them or not
+
+        Raises:
+            HTTPException: If an unknown field is requested
+        """
+        return Projection(self, self.parse(requested), keys, joins)
+
+
+class Projection:
+    """A SELECT narrowed to some fields of a ``FieldSet``, and how to read its rows."""
+
+    def __init__(
+        self,
+        fieldset: FieldSet,
+        names: Sequence[str],
+        keys: Sequence[ColumnElement[Any]],
+        joins: Sequence[tuple[Any, ColumnElement[bool]]],
+    ) -> None:
+        columns: list[ColumnElement[Any]] = []
+        joins = list(joins)
+
+        def position(column: ColumnElement[Any]) -> int:
+            # Columns are compared by identity; SQL expressions overload ==
+            for index, selected in enumerate(columns):
+                if selected is column:
+                    return index
+            columns.append(column)
+            return len(columns) - 1
+
+        self._readers: list[tuple[str, Optional[int], ItemField]] = []
+        for name in names:
+            field = fieldset.fields[name]
+            index = None if field.column is None else position(field.column)
+            if field.join is not None and not any(field.join is join for join in joins):
+                joins.append(field.join)
+            self._readers.append((name, index, field))
+        self._keys = [position(column) for column in keys]
+
+        query = select(*columns).select_from(fieldset.model)
+        for target, onclause in joins:
+            query = query.outerjoin(target, onclause)
+        self.query: Select = query
+
+    def key(self, row: Row[Any]) -> tuple[Any, ...]:
+        """Values of the ``keys`` columns in ``row``."""
+        return tuple(row[index] for index in self._keys)
+
+    def item(self, row: Row[Any], lookups: LookupSnapshot) -> dict[str, Any]:
+        """The requested fields of ``row``, in schema order."""
+        item = {}
+        for name, index, field in self._readers:
+            if index is None:
+                item[name] = field.default
+            elif field.lookup is not None:
+                item[name] = getattr(lookups, field.lookup).get(row[index])
+            else:
+                item[name] = row[index]
+        return item
@@ -3,14 +3,100 @@ Game service for game-related operations.
 Handles fetching, filtering, and searching games.
 """
 
-from typing import Optional
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any, Optional
 
 from fastapi import HTTPException
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Console, Game, Genre, Hack, Translation
-from app.schemas import GameDetail, GameListItem, PaginatedResponse
+from app.core.config import settings
+from app.db.session import async_session_maker
+from app.models import Document, Game, Hack, Translation, Utility
+from app.schemas import GameDetail, GameListItem
+from app.services.counting import (
+    FilterTerm,
+    TotalCount,
+    active_terms,
+    count_strategy,
+    page_payload,
+    with_total,
+)
+from app.services.document_service import document_service
+from app.services.fields import FieldSet, ItemField
+from app.services.hack_service import hack_service
+from app.services.lookup import lookup_by_ids
+from app.services.metadata_service import metadata_service
+from app.services.pagination import paginate, resolve_sort_column, split_page
+from app.services.search_engine import RELEVANCE, SearchTarget, normalize_query, search_engine
+from app.services.translation_service import translation_service
+from app.services.utility_service import utility_service
+
+
+# Title search: trigram index, then the FULLTEXT index on these columns
+GAME_SEARCH = SearchTarget("games", (Game.gametitle, Game.japtitle), Game.gamekey)
+
+# Response fields that are not plain game columns
+_GAME_SOURCES = {
+    "platform_name": ItemField(Game.platformid, lookup="consoles"),
+    "genre_name": ItemField(Game.genreid, lookup="genres"),
+}
+GAME_LIST_FIELDS = FieldSet(Game, GameListItem, **_GAME_SOURCES)
+GAME_DETAIL_FIELDS = FieldSet(
+    Game,
+    GameDetail,
+    **_GAME_SOURCES,
+    hack_count=select(func.count())
+    .select_from(Hack)
+    .where(Hack.gamekey == Game.gamekey)
+    .scalar_subquery(),
+    translation_count=select(func.count())
+    .select_from(Translation)
+    .where(Translation.gamekey == Game.gamekey)
+    .scalar_subquery(),
+    utility_count=select(func.count())
+    .select_from(Utility)
+    .where(Utility.gamekey == Game.gamekey)
+    .scalar_subquery(),
+    document_count=select(func.count())
+    .select_from(Document)
+    .where(Document.gamekey == Game.gamekey)
+    .scalar_subquery(),
+)
+
+# Related content a game detail can embed with ``include``: the detail
+# field counting the section's rows (its total) and the lister of its pages
+GAME_INCLUDES: dict[str, tuple[str, Callable[..., Awaitable[dict[str, Any]]]]] = {
+    "hacks": ("hack_count", hack_service.get_hacks_for_game),
+    "translations": ("translation_count", translation_service.get_translations_for_game),
+    "utilities": ("utility_count", utility_service.get_utilities_for_game),
+    "documents": ("document_count", document_service.get_documents_for_game),
+}
+
+
+def parse_includes(requested: Optional[str]) -> list[str]:
+    """
+    Parse a comma-separated ``include`` parameter into section names.
+
+    Sections are returned in ``GAME_INCLUDES`` order.
+
+    Raises:
+        HTTPException: If an unknown section is requested
+    """
+    if not requested:
+        return []
+    names = {name.strip() for name in requested.split(",") if name.strip()}
+    unknown = sorted(names - GAME_INCLUDES.keys())
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Unknown include(s): {', '.join(unknown)}; "
+                f"available: {', '.join(GAME_INCLUDES)}"
+            ),
+        )
+    return [name for name in GAME_INCLUDES if name in names]
 
 
 class GameService:
@@ -29,172 +115,204 @@ class GameService:
         page_size: int = 50,
         sort_by: str = "gametitle",
         sort_order: str = "asc",
-    ) -> PaginatedResponse[GameListItem]:
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        count_mode: str = "exact",
+        search_mode: str = "auto",
+        fuzzy: bool = False,
+        fields: Optional[str] = None,
+    ) -> dict[str, Any]:
         """
         Get paginated list of games with filters.
         
         Args:
             session: Database session
-            q: Search query for title (uses LIKE)
+            q: Search query for the English or Japanese title
             platform: Filter by platform ID
             genre: Filter by genre ID
             has_hacks: Filter games that have hacks
             has_translations: Filter games that have translations
             page: Page number (1-indexed)
             page_size: Items per page
-            sort_by: Field to sort by
+            sort_by: Field to sort by, or "relevance" when searching
             sort_order: Sort direction (asc/desc)
+            cursor: Keyset cursor from a previous page (overrides page)
+            include_total: Whether to compute the total item count
+            count_mode: How to compute the total ("exact" or "estimate")
+            search_mode: How ``q`` is matched ("auto", "substring", "natural" or "boolean")
+            fuzzy: Tolerate typos in ``q``; results are ranked by similarity
+            fields: Comma-separated item fields to select and return (default: all)
         
         Returns:
-            Paginated response with game list items
+            Page payload shaped like ``PaginatedResponse[GameListItem]``
         """
-        # Build base query with joins for resolved names
-        query = (
-            select(
-                Game,
-                Console.description.label("platform_name"),
-                Genre.description.label("genre_name"),
-            )
-            .outerjoin(Console, Game.platformid == Console.consoleid)
-            .outerjoin(Genre, Game.genreid == Genre.genrekey)
+        # Collect filters; the page query is built once its columns are known
+        terms = active_terms(
+            FilterTerm(Game.platformid, platform),
+            FilterTerm(Game.genreid, genre),
+            FilterTerm(Game.hackexist, has_hacks, flag=True),
+            FilterTerm(Game.transexist, has_translations, flag=True),
         )
-
-        # Apply filters
-        if q:
-            query = query.where(Game.gametitle.ilike(f"%{q}%"))
-        if platform:
-            query = query.where(Game.platformid == platform)
-        if genre:
-            query = query.where(Game.genreid == genre)
-        if has_hacks is True:
-            query = query.where(Game.hackexist > 0)
-        if has_translations is True:
-            query = query.where(Game.transexist > 0)
-
-        # Get total count
         count_query = select(func.count()).select_from(Game)
+        search: tuple[str, ...] = ()
+        relevance = None
+        clauses = []
+        q = normalize_query(q)
+        if q and fuzzy:
+            # Fuzzy matches are only meaningful best-first
+            search_mode, sort_by = "fuzzy", RELEVANCE
         if q:
-            count_query = count_query.where(Game.gametitle.ilike(f"%{q}%"))
-        if platform:
-            count_query = count_query.where(Game.platformid == platform)
-        if genre:
-            count_query = count_query.where(Game.genreid == genre)
-        if has_hacks is True:
-            count_query = count_query.where(Game.hackexist > 0)
-        if has_translations is True:
-            count_query = count_query.where(Game.transexist > 0)
-
-        total_result = await session.execute(count_query)
-        total = total_result.scalar() or 0
-
-        # Apply sorting
-        sort_column = getattr(Game, sort_by, Game.gametitle)
-        if sort_order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
+            plan = search_engine.plan(
+                GAME_SEARCH, q, search_mode, ranked=sort_by == RELEVANCE
+            )
+            clauses.append(plan.clause)
+            count_query = count_query.where(plan.clause)
+            search, relevance = plan.key, plan.relevance
+        for term in terms:
+            clauses.append(term.clause)
+            count_query = count_query.where(term.clause)
 
-        # Apply pagination
-        offset = (page - 1) * page_size
-        query = query.offset(offset).limit(page_size)
+        # Apply sorting and pagination (offset, or keyset when a cursor is given);
+        # relevance always ranks best matches first and is offset-paginated
+        sort_key, sort_column = resolve_sort_column(
+            Game, sort_by, "gametitle", {RELEVANCE: relevance}
+        )
+        descending = sort_key == RELEVANCE or sort_order.lower() == "desc"
 
-        # Execute query
-        result = await session.execute(query)
-        rows = result.all()
+        # Select only the requested fields, plus the sort and primary key the
+        # next cursor is built from; lookup names come from the in-memory snapshot
+        projection = GAME_LIST_FIELDS.project(
+            fields, () if sort_key == RELEVANCE else (sort_column, Game.gamekey)
+        )
+        query = paginate(
+            projection.query.where(*clauses),
+            sort_column,
+            Game.gamekey,
+            sort_key=sort_key,
+            descending=descending,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+        )
 
-        # Build response items
-        items = []
-        for row in rows:
-            game = row[0]
-            items.append(
-                GameListItem(
-                    gamekey=game.gamekey,
-                    gametitle=game.gametitle,
-                    japtitle=game.japtitle,
-                    publisher=game.publisher,
-                    platformid=game.platformid,
-                    genreid=game.genreid,
-                    platform_name=row[1],
-                    genre_name=row[2],
-                    transexist=game.transexist,
-                    hackexist=game.hackexist,
-                    utilexist=game.utilexist,
-                    docexist=game.docexist,
-                )
-            )
+        # Run the count (cached, estimated or skipped per the count strategy)
+        # and the page query concurrently on separate connections
+        count, result, _ = await with_total(
+            count_strategy.count(
+                Game,
+                count_query,
+                terms=terms,
+                search=search,
+                include_total=include_total,
+                mode=count_mode,
+            ),
+            session.execute(query),
+        )
+        rows, next_cursor = split_page(
+            result.all(),
+            page_size,
+            sort_key=sort_key,
+            descending=descending,
+            key=None if sort_key == RELEVANCE else projection.key,
+        )
 
-        total_pages = (total + page_size - 1) // page_size
+        # Build response items
+        lookups = await metadata_service.get_lookups()
+        items = [projection.item(row, lookups) for row in rows]
 
-        return PaginatedResponse[GameListItem](
-            items=items,
-            total=total,
+        return page_payload(
+            items,
+            count,
             page=page,
             page_size=page_size,
-            total_pages=total_pages,
+            next_cursor=next_cursor,
         )
 
-    async def get_game(self, session: AsyncSession, gamekey: int) -> GameDetail:
+    async def get_game(
+        self,
+        session: AsyncSession,
+        gamekey: int,
+        *,
+        fields: Optional[str] = None,
+        include: Optional[str] = None,
+        include_page_size: int = 50,
+    ) -> dict[str, Any]:
         """
-        Get a single game by ID with full details.
+        Get a single game by ID with full details and, optionally, the first
+        page of its related content.
+        
+        The game row and its related content counts are read in one query;
+        once the game is found, the first pages of the included sections
+        run concurrently, each on its own session, and each total comes from
+        the matching count instead of a separate COUNT query.
         
         Args:
             session: Database session
             gamekey: Game primary key
+            fields: Comma-separated fields to select and return (default: all)
+            include: Comma-separated related sections to embed
+                (hacks, translations, utilities, documents)
+            include_page_size: Items per included section
         
         Returns:
-            Detailed game information
+            Game shaped like ``GameDetailWithIncludes``, narrowed to ``fields``
         
         Raises:
-            HTTPException: If game not found
+            HTTPException: If game not found, or an unknown field or section is requested
         """
-        query = (
-            select(
-                Game,
-                Console.description.label("platform_name"),
-                Genre.description.label("genre_name"),
-            )
-            .outerjoin(Console, Game.platformid == Console.consoleid)
-            .outerjoin(Genre, Game.genreid == Genre.genrekey)
-            .where(Game.gamekey == gamekey)
-        )
+        sections = parse_includes(include)
 
-        result = await session.execute(query)
+        # Related content counts are subqueries, selected when requested or
+        # when they give the total of an included section
+        counts = [GAME_DETAIL_FIELDS.fields[GAME_INCLUDES[name][0]].column for name in sections]
+        projection = GAME_DETAIL_FIELDS.project(fields, (Game.gamekey, *counts))
+        result = await session.execute(projection.query.where(Game.gamekey == gamekey))
         row = result.first()
 
         if not row:
             raise HTTPException(status_code=404, detail=f"Game with ID {gamekey} not found")
 
-        game = row[0]
+        pages = [self._include_page(name, gamekey, include_page_size) for name in sections]
+        if settings.concurrent_count_queries:
+            pages = await asyncio.gather(*pages)
+        else:
+            pages = [await page for page in pages]
 
-        # Get related content counts
-        hack_count_result = await session.execute(
-            select(func.count()).select_from(Hack).where(Hack.gamekey == gamekey)
-        )
-        hack_count = hack_count_result.scalar() or 0
+        lookups = await metadata_service.get_lookups()
+        game = projection.item(row, lookups)
+        _, *totals = projection.key(row)
+        for name, page, total in zip(sections, pages, totals):
+            count = TotalCount(total, "exact")
+            page["total"] = count.total
+            page["total_pages"] = count.total_pages(include_page_size)
+            page["total_accuracy"] = count.accuracy
+            game[name] = page
+        return game
 
-        trans_count_result = await session.execute(
-            select(func.count()).select_from(Translation).where(Translation.gamekey == gamekey)
-        )
-        translation_count = trans_count_result.scalar() or 0
-
-        return GameDetail(
-            gamekey=game.gamekey,
-            gametitle=game.gametitle,
-            japtitle=game.japtitle,
-            publisher=game.publisher,
-            platformid=game.platformid,
-            genreid=game.genreid,
-            platform_name=row[1],
-            genre_name=row[2],
-            transexist=game.transexist,
-            hackexist=game.hackexist,
-            utilexist=game.utilexist,
-            docexist=game.docexist,
-            hack_count=hack_count,
-            translation_count=translation_count,
-            utility_count=0,  # TODO: Add when utility service is implemented
-            document_count=0,  # TODO: Add when document service is implemented
-        )
+    async def get_games_by_ids(
+        self, session: AsyncSession, ids: str, *, fields: Optional[str] = None
+    ) -> dict[str, Any]:
+        """
+        Get game details for a list of IDs with a single query.
+        
+        Args:
+            session: Database session
+            ids: Comma-separated game IDs
+            fields: Comma-separated fields to select and return (default: all)
+        
+        Returns:
+            Payload shaped like ``BatchResponse[GameDetail]``, in requested order
+        
+        Raises:
+            HTTPException: If the IDs are invalid or an unknown field is requested
+        """
+        return await lookup_by_ids(session, GAME_DETAIL_FIELDS, Game.gamekey, ids, fields)
+
+    async def _include_page(self, name: str, gamekey: int, page_size: int) -> dict[str, Any]:
+        """First page of one included section, on its own session and without a count."""
+        _, lister = GAME_INCLUDES[name]
+        async with async_session_maker() as session:
+            return await lister(session, gamekey, page_size=page_size, include_total=False)
 
 
 # Singleton instance
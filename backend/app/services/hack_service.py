@@ -3,14 +3,68 @@ Hack service for ROM hack-related operations.
 Handles fetching, filtering, and searching hacks.
 """
 
-from typing import Optional
+from typing import Any, Optional
 
 from fastapi import HTTPException
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Console, Game, Hack, HackImage, HacksCat, PatchHints
-from app.schemas import HackDetail, HackImageResponse, HackListItem, PaginatedResponse
+from app.models import Game, Hack, HackImage
+from app.schemas import HackDetail, HackImageResponse, HackListItem
+from app.services.counting import (
+    Facet,
+    FilterTerm,
+    active_terms,
+    count_strategy,
+    facet_values,
+    page_payload,
+    parse_facets,
+    with_total,
+)
+from app.services.fields import FieldSet, ItemField
+from app.services.lookup import lookup_by_ids
+from app.services.metadata_service import metadata_service
+from app.services.pagination import paginate, resolve_sort_column, split_page
+from app.services.search_engine import RELEVANCE, SearchTarget, normalize_query, search_engine
+
+
+# Title search: trigram index, then the FULLTEXT index on these columns
+HACK_SEARCH = SearchTarget("hacks", (Hack.hacktitle,), Hack.hackkey)
+
+# Description search: BM25 index over the title and description
+HACK_TEXT_SEARCH = SearchTarget(
+    "hacks", (Hack.hacktitle, Hack.description), Hack.hackkey, fulltext=False
+)
+
+# Facets: filter parameter -> column and lookup naming its values
+HACK_FACETS = {
+    "console": Facet(Hack.consolekey, "consoles"),
+    "category": Facet(Hack.category, "hack_categories"),
+}
+
+# Response fields that are not plain hack columns
+_GAME_JOIN = (Game, Hack.gamekey == Game.gamekey)
+_HACK_SOURCES = {
+    "game_title": ItemField(Game.gametitle, join=_GAME_JOIN),
+    "console_name": ItemField(Hack.consolekey, lookup="consoles"),
+    "category_name": ItemField(Hack.category, lookup="hack_categories"),
+    "releasedate": Hack.reldate,
+}
+HACK_LIST_FIELDS = FieldSet(Hack, HackListItem, **_HACK_SOURCES)
+HACK_DETAIL_FIELDS = FieldSet(
+    Hack,
+    HackDetail,
+    **_HACK_SOURCES,
+    filesize=ItemField(),
+    patchtype=ItemField(),
+    hintskey=Hack.patchhint,
+    patch_hint=ItemField(Hack.patchhint, lookup="patch_hints"),
+    noreadme=ItemField(default=0),
+    image_count=select(func.count())
+    .select_from(HackImage)
+    .where(HackImage.hackkey == Hack.hackkey)
+    .scalar_subquery(),
+)
 
 
 class HackService:
@@ -28,177 +82,182 @@ class HackService:
         page_size: int = 50,
         sort_by: str = "hacktitle",
         sort_order: str = "asc",
-    ) -> PaginatedResponse[HackListItem]:
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        count_mode: str = "exact",
+        search_mode: str = "auto",
+        fuzzy: bool = False,
+        q_scope: str = "title",
+        facets: Optional[str] = None,
+        fields: Optional[str] = None,
+    ) -> dict[str, Any]:
         """
         Get paginated list of hacks with filters.
         
         Args:
             session: Database session
-            q: Search query for title
+            q: Search query for title (FULLTEXT, LIKE for short words)
             game: Filter by game ID
             console: Filter by console ID
             category: Filter by category ID
             page: Page number (1-indexed)
             page_size: Items per page
-            sort_by: Field to sort by
+            sort_by: Field to sort by, or "relevance" when searching
             sort_order: Sort direction (asc/desc)
+            cursor: Keyset cursor from a previous page (overrides page)
+            include_total: Whether to compute the total item count
+            count_mode: How to compute the total ("exact" or "estimate")
+            search_mode: How ``q`` is matched ("auto", "substring", "natural" or "boolean")
+            fuzzy: Tolerate typos in ``q``; results are ranked by similarity
+            q_scope: Match ``q`` against the "title" or the "description"
+                (title plus description, ranked by BM25)
+            facets: Comma-separated facets to count per value (console, category)
+            fields: Comma-separated item fields to select and return (default: all)
         
         Returns:
-            Paginated response with hack list items
+            Page payload shaped like ``PaginatedResponse[HackListItem]``
         """
-        # Build base query with joins for resolved names
-        query = (
-            select(
-                Hack,
-                Game.gametitle.label("game_title"),
-                Console.description.label("console_name"),
-                HacksCat.catname.label("category_name"),
-            )
-            .outerjoin(Game, Hack.gamekey == Game.gamekey)
-            .outerjoin(Console, Hack.consolekey == Console.consoleid)
-            .outerjoin(HacksCat, Hack.category == HacksCat.categorykey)
-        )
-
-        # Apply filters
-        if q:
-            query = query.where(Hack.hacktitle.ilike(f"%{q}%"))
-        if game:
-            query = query.where(Hack.gamekey == game)
-        if console:
-            query = query.where(Hack.consolekey == console)
-        if category:
-            query = query.where(Hack.category == category)
+        facet_names = parse_facets(facets, HACK_FACETS)
 
-        # Get total count
+        # Collect filters; the page query is built once its columns are known
+        terms = active_terms(
+            FilterTerm(Hack.gamekey, game),
+            FilterTerm(Hack.consolekey, console),
+            FilterTerm(Hack.category, category),
+        )
         count_query = select(func.count()).select_from(Hack)
+        search: tuple[str, ...] = ()
+        relevance = None
+        clauses = []
+        q = normalize_query(q)
+        if q and q_scope == "description":
+            # BM25 matches are only meaningful best-first
+            sort_by = RELEVANCE
+        elif q and fuzzy:
+            # Fuzzy matches are only meaningful best-first
+            search_mode, sort_by = "fuzzy", RELEVANCE
         if q:
-            count_query = count_query.where(Hack.hacktitle.ilike(f"%{q}%"))
-        if game:
-            count_query = count_query.where(Hack.gamekey == game)
-        if console:
-            count_query = count_query.where(Hack.consolekey == console)
-        if category:
-            count_query = count_query.where(Hack.category == category)
-
-        total_result = await session.execute(count_query)
-        total = total_result.scalar() or 0
-
-        # Apply sorting
-        sort_column = getattr(Hack, sort_by, Hack.hacktitle)
-        if sort_order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
+            plan = (
+                search_engine.plan_description(HACK_TEXT_SEARCH, q)
+                if q_scope == "description"
+                else search_engine.plan(HACK_SEARCH, q, search_mode, ranked=sort_by == RELEVANCE)
+            )
+            clauses.append(plan.clause)
+            count_query = count_query.where(plan.clause)
+            search, relevance = plan.key, plan.relevance
+        facet_query = count_query
+        for term in terms:
+            clauses.append(term.clause)
+            count_query = count_query.where(term.clause)
 
-        # Apply pagination
-        offset = (page - 1) * page_size
-        query = query.offset(offset).limit(page_size)
+        # Apply sorting and pagination (offset, or keyset when a cursor is given);
+        # relevance always ranks best matches first and is offset-paginated
+        sort_key, sort_column = resolve_sort_column(
+            Hack, sort_by, "hacktitle", {RELEVANCE: relevance}
+        )
+        descending = sort_key == RELEVANCE or sort_order.lower() == "desc"
 
-        # Execute query
-        result = await session.execute(query)
-        rows = result.all()
+        # Select only the requested fields, plus the sort and primary key the
+        # next cursor is built from; lookup names come from the in-memory snapshot
+        projection = HACK_LIST_FIELDS.project(
+            fields, () if sort_key == RELEVANCE else (sort_column, Hack.hackkey)
+        )
+        query = paginate(
+            projection.query.where(*clauses),
+            sort_column,
+            Hack.hackkey,
+            sort_key=sort_key,
+            descending=descending,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+        )
 
-        # Build response items
-        items = []
-        for row in rows:
-            hack = row[0]
-            items.append(
-                HackListItem(
-                    hackkey=hack.hackkey,
-                    hacktitle=hack.hacktitle,
-                    version=hack.version,
-                    description=hack.description,
-                    gamekey=hack.gamekey,
-                    consolekey=hack.consolekey,
-                    category=hack.category,
-                    game_title=row[1],
-                    console_name=row[2],
-                    category_name=row[3],
-                    downloads=hack.downloads,
-                    releasedate=hack.reldate,
-                    created=hack.created,
-                    lastmod=hack.lastmod,
-                )
+        # Run the count (cached, estimated or skipped per the count strategy),
+        # the page query and any facet counts concurrently on separate connections
+        count, result, facet_counts = await with_total(
+            count_strategy.count(
+                Hack,
+                count_query,
+                terms=terms,
+                search=search,
+                include_total=include_total,
+                mode=count_mode,
+            ),
+            session.execute(query),
+            count_strategy.facets(
+                Hack, facet_query, HACK_FACETS, facet_names, terms=terms, search=search
             )
+            if facet_names
+            else None,
+        )
+        rows, next_cursor = split_page(
+            result.all(),
+            page_size,
+            sort_key=sort_key,
+            descending=descending,
+            key=None if sort_key == RELEVANCE else projection.key,
+        )
 
-        total_pages = (total + page_size - 1) // page_size
+        # Build response items
+        lookups = await metadata_service.get_lookups()
+        items = [projection.item(row, lookups) for row in rows]
 
-        return PaginatedResponse[HackListItem](
-            items=items,
-            total=total,
+        return page_payload(
+            items,
+            count,
             page=page,
             page_size=page_size,
-            total_pages=total_pages,
+            next_cursor=next_cursor,
+            facets=facet_values(facet_counts, HACK_FACETS, lookups),
         )
 
-    async def get_hack(self, session: AsyncSession, hackkey: int) -> HackDetail:
+    async def get_hack(
+        self, session: AsyncSession, hackkey: int, *, fields: Optional[str] = None
+    ) -> dict[str, Any]:
         """
         Get a single hack by ID with full details.
         
         Args:
             session: Database session
             hackkey: Hack primary key
+            fields: Comma-separated fields to select and return (default: all)
         
         Returns:
-            Detailed hack information
+            Hack shaped like ``HackDetail``, narrowed to ``fields``
         
         Raises:
-            HTTPException: If hack not found
+            HTTPException: If hack not found or an unknown field is requested
         """
-        query = (
-            select(
-                Hack,
-                Game.gametitle.label("game_title"),
-                Console.description.label("console_name"),
-                HacksCat.catname.label("category_name"),
-                PatchHints.description.label("patch_hint"),
-            )
-            .outerjoin(Game, Hack.gamekey == Game.gamekey)
-            .outerjoin(Console, Hack.consolekey == Console.consoleid)
-            .outerjoin(HacksCat, Hack.category == HacksCat.categorykey)
-            .outerjoin(PatchHints, Hack.patchhint == PatchHints.id)
-            .where(Hack.hackkey == hackkey)
-        )
-
-        result = await session.execute(query)
+        # The screenshot count is a subquery, selected only when requested
+        projection = HACK_DETAIL_FIELDS.project(fields, (Hack.hackkey,))
+        result = await session.execute(projection.query.where(Hack.hackkey == hackkey))
         row = result.first()
 
         if not row:
             raise HTTPException(status_code=404, detail=f"Hack with ID {hackkey} not found")
 
-        hack = row[0]
-
-        # Get image count
-        image_count_result = await session.execute(
-            select(func.count()).select_from(HackImage).where(HackImage.hackkey == hackkey)
-        )
-        image_count = image_count_result.scalar() or 0
+        lookups = await metadata_service.get_lookups()
+        return projection.item(row, lookups)
 
-        return HackDetail(
-            hackkey=hack.hackkey,
-            hacktitle=hack.hacktitle,
-            version=hack.version,
-            description=hack.description,
-            gamekey=hack.gamekey,
-            consolekey=hack.consolekey,
-            authorkey=hack.authorkey,
-            category=hack.category,
-            game_title=row[1],
-            console_name=row[2],
-            category_name=row[3],
-            patch_hint=row[4],
-            filename=hack.filename,
-            filesize=None,
-            downloads=hack.downloads,
-            releasedate=hack.reldate,
-            patchtype=None,
-            hintskey=hack.patchhint,
-            nofile=hack.nofile,
-            noreadme=0,
-            created=hack.created,
-            lastmod=hack.lastmod,
-            image_count=image_count,
-        )
+    async def get_hacks_by_ids(
+        self, session: AsyncSession, ids: str, *, fields: Optional[str] = None
+    ) -> dict[str, Any]:
+        """
+        Get hack details for a list of IDs with a single query.
+        
+        Args:
+            session: Database session
+            ids: Comma-separated hack IDs
+            fields: Comma-separated fields to select and return (default: all)
+        
+        Returns:
+            Payload shaped like ``BatchResponse[HackDetail]``, in requested order
+        
+        Raises:
+            HTTPException: If the IDs are invalid or an unknown field is requested
+        """
+        return await lookup_by_ids(session, HACK_DETAIL_FIELDS, Hack.hackkey, ids, fields)
 
     async def get_hack_images(
         self, session: AsyncSession, hackkey: int
@@ -242,7 +301,10 @@ class HackService:
         *,
         page: int = 1,
         page_size: int = 50,
-    ) -> PaginatedResponse[HackListItem]:
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        fields: Optional[str] = None,
+    ) -> dict[str, Any]:
         """
         Get all hacks for a specific game.
         
@@ -251,15 +313,21 @@ class HackService:
             gamekey: Game primary key
             page: Page number
             page_size: Items per page
+            cursor: Keyset cursor from a previous page (overrides page)
+            include_total: Whether to compute the total item count
+            fields: Comma-separated item fields to select and return (default: all)
         
         Returns:
-            Paginated response with hack list items
+            Page payload shaped like ``PaginatedResponse[HackListItem]``
         """
         return await self.get_hacks(
             session,
             game=gamekey,
             page=page,
             page_size=page_size,
+            cursor=cursor,
+            include_total=include_total,
+            fields=fields,
         )
 
 
@@ -3,15 +3,54 @@ Homebrew service for homebrew-related operations.
 Handles fetching, filtering, and searching homebrew content.
 """
 
-from typing import Optional
+from typing import Any, Optional
 
 from fastapi import HTTPException
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Console, Homebrew, HomebrewCat
-from app.schemas.common import PaginatedResponse
+from app.models import Homebrew
 from app.schemas.homebrew import HomebrewDetail, HomebrewListItem
+from app.services.counting import (
+    Facet,
+    FilterTerm,
+    active_terms,
+    count_strategy,
+    facet_values,
+    page_payload,
+    parse_facets,
+    with_total,
+)
+from app.services.fields import FieldSet, ItemField
+from app.services.lookup import lookup_by_ids
+from app.services.metadata_service import metadata_service
+from app.services.pagination import paginate, resolve_sort_column, split_page
+from app.services.search_engine import RELEVANCE, SearchTarget, normalize_query, search_engine
+
+
+# Title search: trigram index, else LIKE (no FULLTEXT index on homebrew)
+HOMEBREW_SEARCH = SearchTarget(
+    "homebrew", (Homebrew.title,), Homebrew.homebrewkey, fulltext=False
+)
+
+# Description search: BM25 index over the title and description
+HOMEBREW_TEXT_SEARCH = SearchTarget(
+    "homebrew", (Homebrew.title, Homebrew.description), Homebrew.homebrewkey, fulltext=False
+)
+
+# Facets: filter parameter -> column and lookup naming its values
+HOMEBREW_FACETS = {
+    "category": Facet(Homebrew.categorykey, "homebrew_categories"),
+    "platform": Facet(Homebrew.platformkey, "consoles"),
+}
+
+# Response fields that are not plain homebrew columns
+_HOMEBREW_SOURCES = {
+    "category_name": ItemField(Homebrew.categorykey, lookup="homebrew_categories"),
+    "platform_name": ItemField(Homebrew.platformkey, lookup="consoles"),
+}
+HOMEBREW_LIST_FIELDS = FieldSet(Homebrew, HomebrewListItem, **_HOMEBREW_SOURCES)
+HOMEBREW_DETAIL_FIELDS = FieldSet(Homebrew, HomebrewDetail, **_HOMEBREW_SOURCES)
 
 
 class HomebrewService:
@@ -28,7 +67,13 @@ class HomebrewService:
         page_size: int = 50,
         sort_by: str = "title",
         sort_order: str = "asc",
-    ) -> PaginatedResponse[HomebrewListItem]:
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        count_mode: str = "exact",
+        q_scope: str = "title",
+        facets: Optional[str] = None,
+        fields: Optional[str] = None,
+    ) -> dict[str, Any]:
         """
         Get paginated list of homebrew content with filters.
 
@@ -39,117 +84,129 @@ class HomebrewService:
             platform: Filter by platform ID
             page: Page number (1-indexed)
             page_size: Items per page
-            sort_by: Field to sort by
+            sort_by: Field to sort by, or "relevance" when searching descriptions
             sort_order: Sort direction (asc/desc)
+            cursor: Keyset cursor from a previous page (overrides page)
+            include_total: Whether to compute the total item count
+            count_mode: How to compute the total ("exact" or "estimate")
+            q_scope: Match ``q`` against the "title" or the "description"
+                (title plus description, ranked by BM25)
+            facets: Comma-separated facets to count per value (category, platform)
+            fields: Comma-separated item fields to select and return (default: all)
 
         Returns:
-            Paginated response with homebrew list items
+            Page payload shaped like ``PaginatedResponse[HomebrewListItem]``
         """
-        # Build base query with joins for resolved names
-        query = (
-            select(
-                Homebrew,
-                HomebrewCat.catname.label("category_name"),
-                Console.description.label("platform_name"),
-            )
-            .outerjoin(HomebrewCat, Homebrew.categorykey == HomebrewCat.categorykey)
-            .outerjoin(Console, Homebrew.platformkey == Console.consoleid)
-        )
-
-        # Apply filters
-        if q:
-            query = query.where(Homebrew.title.ilike(f"%{q}%"))
-        if category:
-            query = query.where(Homebrew.categorykey == category)
-        if platform:
-            query = query.where(Homebrew.platformkey == platform)
+        facet_names = parse_facets(facets, HOMEBREW_FACETS)
 
-        # Get total count
+        # Collect filters; the page query is built once its columns are known
+        terms = active_terms(
+            FilterTerm(Homebrew.categorykey, category),
+            FilterTerm(Homebrew.platformkey, platform),
+        )
         count_query = select(func.count()).select_from(Homebrew)
+        search: tuple[str, ...] = ()
+        relevance = None
+        clauses = []
+        q = normalize_query(q)
+        if q and q_scope == "description":
+            # BM25 matches are only meaningful best-first
+            sort_by = RELEVANCE
         if q:
-            count_query = count_query.where(Homebrew.title.ilike(f"%{q}%"))
-        if category:
-            count_query = count_query.where(Homebrew.categorykey == category)
-        if platform:
-            count_query = count_query.where(Homebrew.platformkey == platform)
-
-        total_result = await session.execute(count_query)
-        total = total_result.scalar() or 0
-
-        # Apply sorting
-        sort_column = getattr(Homebrew, sort_by, Homebrew.title)
-        if sort_order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-
-        # Apply pagination
-        offset = (page - 1) * page_size
-        query = query.offset(offset).limit(page_size)
-
-        # Execute query
-        result = await session.execute(query)
-        rows = result.all()
+            plan = (
+                search_engine.plan_description(HOMEBREW_TEXT_SEARCH, q)
+                if q_scope == "description"
+                else search_engine.plan(HOMEBREW_SEARCH, q)
+            )
+            clauses.append(plan.clause)
+            count_query = count_query.where(plan.clause)
+            search, relevance = plan.key, plan.relevance
+        facet_query = count_query
+        for term in terms:
+            clauses.append(term.clause)
+            count_query = count_query.where(term.clause)
+
+        # Apply sorting and pagination (offset, or keyset when a cursor is given);
+        # relevance always ranks best matches first and is offset-paginated
+        sort_key, sort_column = resolve_sort_column(
+            Homebrew, sort_by, "title", {RELEVANCE: relevance}
+        )
+        descending = sort_key == RELEVANCE or sort_order.lower() == "desc"
 
-        # Build response items
-        items = []
-        for row in rows:
-            hb = row[0]
-            items.append(
-                HomebrewListItem(
-                    homebrewkey=hb.homebrewkey,
-                    title=hb.title,
-                    version=hb.version,
-                    description=hb.description,
-                    categorykey=hb.categorykey,
-                    platformkey=hb.platformkey,
-                    category_name=row[1],
-                    platform_name=row[2],
-                    downloads=hb.downloads,
-                    reldate=hb.reldate,
-                    created=hb.created,
-                    lastmod=hb.lastmod,
-                )
+        # Select only the requested fields, plus the sort and primary key the
+        # next cursor is built from; lookup names come from the in-memory snapshot
+        projection = HOMEBREW_LIST_FIELDS.project(
+            fields, () if sort_key == RELEVANCE else (sort_column, Homebrew.homebrewkey)
+        )
+        query = paginate(
+            projection.query.where(*clauses),
+            sort_column,
+            Homebrew.homebrewkey,
+            sort_key=sort_key,
+            descending=descending,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+        )
+
+        # Run the count (cached, estimated or skipped per the count strategy),
+        # the page query and any facet counts concurrently on separate connections
+        count, result, facet_counts = await with_total(
+            count_strategy.count(
+                Homebrew,
+                count_query,
+                terms=terms,
+                search=search,
+                include_total=include_total,
+                mode=count_mode,
+            ),
+            session.execute(query),
+            count_strategy.facets(
+                Homebrew, facet_query, HOMEBREW_FACETS, facet_names, terms=terms, search=search
             )
+            if facet_names
+            else None,
+        )
+        rows, next_cursor = split_page(
+            result.all(),
+            page_size,
+            sort_key=sort_key,
+            descending=descending,
+            key=None if sort_key == RELEVANCE else projection.key,
+        )
 
-        total_pages = (total + page_size - 1) // page_size
+        # Build response items
+        lookups = await metadata_service.get_lookups()
+        items = [projection.item(row, lookups) for row in rows]
 
-        return PaginatedResponse[HomebrewListItem](
-            items=items,
-            total=total,
+        return page_payload(
+            items,
+            count,
             page=page,
             page_size=page_size,
-            total_pages=total_pages,
+            next_cursor=next_cursor,
+            facets=facet_values(facet_counts, HOMEBREW_FACETS, lookups),
         )
 
     async def get_homebrew(
-        self, session: AsyncSession, homebrewkey: int
-    ) -> HomebrewDetail:
+        self, session: AsyncSession, homebrewkey: int, *, fields: Optional[str] = None
+    ) -> dict[str, Any]:
         """
         Get a single homebrew by ID with full details.
-
+        
         Args:
             session: Database session
             homebrewkey: Homebrew primary key
-
+            fields: Comma-separated fields to select and return (default: all)
+        
         Returns:
-            Detailed homebrew information
-
+            Homebrew shaped like ``HomebrewDetail``, narrowed to ``fields``
+        
         Raises:
-            HTTPException: If homebrew not found
+            HTTPException: If homebrew not found or an unknown field is requested
         """
-        query = (
-            select(
-                Homebrew,
-                HomebrewCat.catname.label("category_name"),
-                Console.description.label("platform_name"),
-            )
-            .outerjoin(HomebrewCat, Homebrew.categorykey == HomebrewCat.categorykey)
-            .outerjoin(Console, Homebrew.platformkey == Console.consoleid)
-            .where(Homebrew.homebrewkey == homebrewkey)
-        )
-
-        result = await session.execute(query)
+        projection = HOMEBREW_DETAIL_FIELDS.project(fields, (Homebrew.homebrewkey,))
+        result = await session.execute(projection.query.where(Homebrew.homebrewkey == homebrewkey))
         row = result.first()
 
         if not row:
@@ -157,27 +214,28 @@ class HomebrewService:
                 status_code=404, detail=f"Homebrew with ID {homebrewkey} not found"
             )
 
-        hb = row[0]
-
-        return HomebrewDetail(
-            homebrewkey=hb.homebrewkey,
-            title=hb.title,
-            version=hb.version,
-            description=hb.description,
-            categorykey=hb.categorykey,
-            platformkey=hb.platformkey,
-            authorkey=hb.authorkey,
-            category_name=row[1],
-            platform_name=row[2],
-            filename=hb.filename,
-            downloads=hb.downloads,
-            reldate=hb.reldate,
-            titlescreen=hb.titlescreen,
-            readme=hb.readme,
-            nofile=hb.nofile,
-            noreadme=hb.noreadme,
-            created=hb.created,
-            lastmod=hb.lastmod,
+        lookups = await metadata_service.get_lookups()
+        return projection.item(row, lookups)
+
+    async def get_homebrews_by_ids(
+        self, session: AsyncSession, ids: str, *, fields: Optional[str] = None
+    ) -> dict[str, Any]:
+        """
+        Get homebrew details for a list of IDs with a single query.
+        
+        Args:
+            session: Database session
+            ids: Comma-separated homebrew IDs
+            fields: Comma-separated fields to select and return (default: all)
+        
+        Returns:
+            Payload shaped like ``BatchResponse[HomebrewDetail]``, in requested order
+        
+        Raises:
+            HTTPException: If the IDs are invalid or an unknown field is requested
+        """
+        return await lookup_by_ids(
+            session, HOMEBREW_DETAIL_FIELDS, Homebrew.homebrewkey, ids, fields
         )
 
 
@@ -0,0 +1,70 @@
+"""
+Base and delta layers of the in-memory search indexes.
+An entity's indexes are built once from every row; rows changed since then
+are indexed again in a small delta layer and masked in the base, so a
+refresh only rebuilds the delta instead of the whole entity.
+"""
+
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class LayeredIndex(Generic[T]):
+    """
+    Immutable pair of indexes over one entity.
+
+    Attributes:
+        base: Indexes built from every row at the last full load
+        delta: Indexes built from ``rows``
+        rows: Rows inserted or updated since the full load, by primary key
+        masked: Primary keys whose ``base`` entries are stale (updated or
+            deleted since the full load); searches must drop them
+    """
+
+    base: T
+    delta: T
+    rows: Mapping[int, tuple[Any, ...]]
+    masked: frozenset[int]
+
+    @classmethod
+    def build(
+        cls, build: Callable[[Sequence[Sequence[Any]]], T], rows: Sequence[Sequence[Any]]
+    ) -> "LayeredIndex[T]":
+        """Indexes of a full load (empty delta)."""
+        return cls(build(rows), build([]), MappingProxyType({}), frozenset())
+
+    @property
+    def pending(self) -> int:
+        """Rows changed since the full load; a large delta calls for a new full load."""
+        return len(self.masked)
+
+    def changed(
+        self,
+        build: Callable[[Sequence[Sequence[Any]]], T],
+        rows: Iterable[Sequence[Any]],
+        removed: Iterable[int],
+    ) -> "LayeredIndex[T]":
+        """
+        Indexes with rows inserted, updated or deleted; only the delta is rebuilt.
+
+        Args:
+            build: Builds indexes from rows (the same one as the base)
+            rows: Inserted or updated rows, primary key first
+            removed: Primary keys of deleted rows
+        """
+        changed = dict(self.rows)
+        removed = set(removed)
+        for pk in removed:
+            changed.pop(pk, None)
+        changed.update((row[0], tuple(row)) for row in rows)
+        return LayeredIndex(
+            self.base,
+            build([changed[pk] for pk in sorted(changed)]),
+            MappingProxyType(changed),
+            self.masked | changed.keys() | removed,
+        )
@@ -0,0 +1,540 @@
+"""
+Incremental maintenance of the in-memory search indexes.
+Each index feed is persisted as a snapshot of its rows plus a journal of
+the rows changed since, with a per-table ``lastmod`` watermark, so a
+restart resumes from disk plus the rows changed meanwhile, and a polling
+job applies only the changed rows to the indexes and the journal.
+With several workers, only the one holding the writer lock writes these
+files; the others read them at startup and poll on their own.
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import tempfile
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Optional
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.core.response_cache import response_cache
+from app.db.session import async_session_maker
+from app.services.counting import count_strategy
+from app.services.text_index import text_index
+from app.services.title_index import title_index
+
+try:  # File locks are POSIX-only; elsewhere every process writes
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = get_logger(__name__)
+
+# One snapshot and one journal per feed, next to the logs directory
+SNAPSHOT_DIR = Path(__file__).parent.parent.parent / "data" / "search_indexes"
+
+# Held by the one worker that writes snapshots and journals
+_WRITER_LOCK = SNAPSHOT_DIR / ".writer.lock"
+
+# Descriptor holding the writer lock once this process has it
+_writer_fd: Optional[int] = None
+
+# Bumped when the snapshot layout changes; other versions are ignored
+_SNAPSHOT_FORMAT = 2
+
+# Primary keys per query when fetching rows found changed or missing
+_FETCH_CHUNK = 1000
+
+
+@dataclass(frozen=True)
+class IndexFeed:
+    """
+    Rows of one table feeding one in-memory index.
+
+    Attributes:
+        key: Feed name, unique across index services
+        index: Index service the rows are loaded into (``title_index`` or ``text_index``)
+        name: Entity name within that service
+        query: Row query, primary key first
+        pk: Primary key column
+        lastmod: Modification time column, or None if changes are detected
+            by comparing ``watch`` rows
+        watch: Primary key and the columns whose changes are detected when
+            there is no ``lastmod``
+    """
+
+    key: str
+    index: Any
+    name: str
+    query: Select
+    pk: Any
+    lastmod: Any
+    watch: Optional[Select] = None
+
+    @property
+    def table(self) -> str:
+        """Table whose cached list totals depend on this feed."""
+        return self.pk.class_.__tablename__
+
+    @property
+    def signature(self) -> str:
+        """Identifies the row shape; saved rows with another signature are reloaded."""
+        return " | ".join(str(column) for column in self.query.selected_columns)
+
+
+@dataclass
+class FeedState:
+    """
+    What a feed needs to find changed rows; the rows themselves live in the indexes.
+
+    Attributes:
+        pks: Primary keys currently indexed
+        watermark: Newest ``lastmod`` seen
+        boundary: Hash of each row stamped exactly at ``watermark``; such
+            rows are refetched by every poll and skipped while unchanged
+        digests: Checksum of the ``watch`` columns per row, for feeds
+            without ``lastmod``
+    """
+
+    pks: set[int]
+    watermark: Optional[datetime] = None
+    boundary: dict[int, int] = field(default_factory=dict)
+    digests: dict[int, int] = field(default_factory=dict)
+
+
+@dataclass
+class FeedDelta:
+    """Rows inserted or updated, and primary keys deleted, since the last poll."""
+
+    rows: dict[int, tuple[Any, ...]] = field(default_factory=dict)
+    removed: set[int] = field(default_factory=set)
+
+    def __len__(self) -> int:
+        return len(self.rows) + len(self.removed)
+
+
+@dataclass
+class Snapshot:
+    """A feed read back from disk: its snapshot with the journal replayed."""
+
+    signature: str
+    rows: dict[int, tuple[Any, ...]]
+    watermark: Optional[datetime]
+    digests: dict[int, int]
+    journaled: bool = False
+
+
+def _feeds() -> dict[str, IndexFeed]:
+    """Every feed of the enabled index services."""
+    feeds: dict[str, IndexFeed] = {}
+    for prefix, service, enabled in (
+        ("titles", title_index, settings.title_index_enabled),
+        ("text", text_index, settings.text_index_enabled),
+    ):
+        if not enabled:
+            continue
+        for name, source in service.sources.items():
+            key = f"{prefix}.{name}"
+            watch = service.watch_query(name) if source.lastmod is None else None
+            feeds[key] = IndexFeed(
+                key, service, name, service.rows_query(name), source.pk, source.lastmod, watch
+            )
+    return feeds
+
+
+def _ordered(rows: dict[int, tuple[Any, ...]]) -> list[tuple[Any, ...]]:
+    return [rows[pk] for pk in sorted(rows)]
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return int(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=_json_default)
+
+
+def _digest(values: tuple[Any, ...]) -> int:
+    """Checksum of watched column values, stable across processes."""
+    return zlib.crc32(_dumps(values).encode("utf-8"))
+
+
+def _watermark(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _snapshot_path(key: str) -> Path:
+    return SNAPSHOT_DIR / f"{key}.json.gz"
+
+
+def _journal_path(key: str) -> Path:
+    return SNAPSHOT_DIR / f"{key}.journal.gz"
+
+
+def _read_snapshot(key: str) -> Optional[Snapshot]:
+    """
+    Saved rows of a feed with its journal replayed, or None if there is no usable snapshot.
+
+    Journal entries older than the snapshot are skipped; a truncated last
+    entry (interrupted append) is ignored.
+    """
+    try:
+        with gzip.open(_snapshot_path(key), "rt", encoding="utf-8") as file:
+            data = json.load(file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        logger.warning(f"Ignoring unreadable search index snapshot {_snapshot_path(key)}")
+        return None
+    if data.get("format") != _SNAPSHOT_FORMAT:
+        return None
+
+    snapshot = Snapshot(
+        signature=data["signature"],
+        rows={row[0]: tuple(row) for row in data["rows"]},
+        watermark=_watermark(data.get("watermark")),
+        digests={int(pk): digest for pk, digest in data.get("digests", {}).items()},
+    )
+    try:
+        with gzip.open(_journal_path(key), "rt", encoding="utf-8") as file:
+            for line in file:
+                entry = json.loads(line)
+                watermark = _watermark(entry.get("watermark"))
+                if entry.get("signature") != snapshot.signature or (
+                    snapshot.watermark is not None
+                    and watermark is not None
+                    and watermark < snapshot.watermark
+                ):
+                    continue
+                for pk in entry["removed"]:
+                    snapshot.rows.pop(pk, None)
+                    snapshot.digests.pop(pk, None)
+                snapshot.rows.update((row[0], tuple(row)) for row in entry["rows"])
+                snapshot.digests.update(
+                    (int(pk), digest) for pk, digest in entry.get("digests", {}).items()
+                )
+                snapshot.watermark = watermark or snapshot.watermark
+                snapshot.journaled = True
+    except FileNotFoundError:
+        pass
+    except (OSError, EOFError, ValueError):
+        logger.warning(f"Ignoring the rest of search index journal {_journal_path(key)}")
+        snapshot.journaled = True
+    return snapshot
+
+
+def _lock_writer() -> bool:
+    """
+    Take the writer lock without waiting; it is held until the process exits.
+
+    Returns:
+        False if another process holds it (always True where file locks are
+        unavailable)
+    """
+    global _writer_fd
+    if fcntl is None or _writer_fd is not None:
+        return True
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    fd = os.open(_WRITER_LOCK, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return False
+    _writer_fd = fd
+    return True
+
+
+def _write_snapshot(key: str, payload: dict[str, Any]) -> None:
+    """Replace a feed's snapshot atomically (readers never see a partial file) and its journal."""
+    path = _snapshot_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A name of its own, so two writers never share a partial file
+    fd, partial = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.open(
+            raw, "wt", encoding="utf-8", compresslevel=6
+        ) as file:
+            file.write(_dumps(payload))
+        os.replace(partial, path)
+    except BaseException:
+        Path(partial).unlink(missing_ok=True)
+        raise
+    _journal_path(key).unlink(missing_ok=True)
+
+
+def _append_journal(key: str, entry: dict[str, Any]) -> None:
+    """Append one entry to a feed's journal as its own gzip member, in a single write."""
+    data = gzip.compress((_dumps(entry) + "\n").encode("utf-8"), compresslevel=6)
+    with open(_journal_path(key), "ab") as file:
+        file.write(data)
+
+
+class IndexRefreshService:
+    """
+    Keeps the title and description indexes in step with the database.
+
+    Each feed remembers the newest ``lastmod`` it has seen. A refresh
+    fetches only rows with ``lastmod >=`` that watermark (rows stamped in
+    the same second are refetched and ignored when unchanged), and
+    reconciles primary keys when the row count differs (deletes, and
+    inserts without a ``lastmod``). Feeds without a ``lastmod`` column
+    (games) compare a checksum of their watched columns instead, so
+    renames are picked up too. Changed rows go into the delta layer of the
+    indexes and are appended to the feed's journal; once a feed has
+    ``index_delta_max_rows`` changed rows it is reloaded in full and its
+    snapshot rewritten. Cached list totals and responses of changed tables
+    are dropped.
+
+    Known gaps, closed by the next full load: the description index of
+    translations shows their game's title, but only the translation's own
+    ``lastmod`` is polled, so a game rename does not reach it; and the
+    download counts ranking suggestions are only refetched with a changed
+    row.
+
+    Under several workers, the first to start takes a file lock and is the
+    only one writing snapshots and journals; the others resume from them
+    but keep their changes in memory. The lock is taken at startup, so a
+    writer that dies hands over to the worker started in its place, which
+    rewrites the snapshots of the feeds it found stale.
+    """
+
+    def __init__(self) -> None:
+        self._states: dict[str, FeedState] = {}
+        self._lock = asyncio.Lock()
+        self._writer = False
+
+    async def start(self) -> None:
+        """
+        Load every index, resuming from the saved snapshot when possible.
+
+        Feeds found on disk only fetch the rows changed since they were
+        written; the others are loaded in full.
+        """
+        async with self._lock:
+            if settings.index_snapshot_enabled and not self._writer:
+                try:
+                    self._writer = await asyncio.to_thread(_lock_writer)
+                except OSError:
+                    logger.exception(f"Failed to take search index writer lock {_WRITER_LOCK}")
+            feeds = _feeds()
+            resumed = []
+            async with async_session_maker() as session:
+                for key, feed in feeds.items():
+                    saved = None
+                    if settings.index_snapshot_enabled:
+                        saved = await asyncio.to_thread(_read_snapshot, key)
+                    if saved is not None and saved.signature == feed.signature:
+                        state = FeedState(
+                            pks=set(saved.rows), watermark=saved.watermark, digests=saved.digests
+                        )
+                        rows = saved.rows
+                        delta = await self._apply_changes(session, feed, state)
+                        for pk in delta.removed:
+                            rows.pop(pk, None)
+                        rows.update(delta.rows)
+                        stale = saved.journaled or bool(delta)
+                        resumed.append(key)
+                    else:
+                        state, rows = await self._load_all(session, feed)
+                        stale = True
+                    self._states[key] = state
+                    await feed.index.load(feed.name, _ordered(rows))
+                    if stale:
+                        await self._save(feed, state, rows)
+        logger.info(
+            f"🔎 Loaded {len(feeds)} search indexes "
+            f"({len(resumed)} resumed from snapshot, {len(feeds) - len(resumed)} from the database)"
+        )
+
+    async def refresh(self) -> dict[str, int]:
+        """
+        Apply rows changed since the last poll to the affected indexes.
+
+        Returns:
+            Number of inserted, updated or deleted rows per changed feed
+        """
+        async with self._lock:
+            feeds = _feeds()
+            changes: dict[str, int] = {}
+            async with async_session_maker() as session:
+                for key, feed in feeds.items():
+                    state = self._states.get(key)
+                    if state is not None:
+                        delta = await self._apply_changes(session, feed, state)
+                        if not delta:
+                            continue
+                        changes[key] = len(delta)
+                        if feed.index.pending(feed.name) + len(delta) <= (
+                            settings.index_delta_max_rows
+                        ):
+                            await feed.index.update(
+                                feed.name, _ordered(delta.rows), delta.removed
+                            )
+                            await self._journal(feed, state, delta)
+                            continue
+                    # New feed, or too many changes for the delta layer
+                    state, rows = await self._load_all(session, feed)
+                    self._states[key] = state
+                    changes.setdefault(key, max(len(rows), 1))
+                    await feed.index.load(feed.name, _ordered(rows))
+                    await self._save(feed, state, rows)
+
+            for key in changes:
+                await count_strategy.invalidate(feeds[key].table)
+            if changes:
+                await response_cache.invalidate({feeds[key].table for key in changes})
+                logger.info(
+                    "🔎 Refreshed search indexes ("
+                    + ", ".join(f"{key}: {n}" for key, n in changes.items())
+                    + ")"
+                )
+            return changes
+
+    async def auto_refresh(self, interval_seconds: float) -> None:
+        """
+        Refresh every ``interval_seconds`` until cancelled.
+
+        Failed refreshes are logged and the current indexes keep being served.
+        """
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Failed to refresh search indexes; keeping current ones")
+
+    async def _load_all(
+        self, session: AsyncSession, feed: IndexFeed
+    ) -> tuple[FeedState, dict[int, tuple[Any, ...]]]:
+        """Fetch every row of a feed."""
+        state = FeedState(pks=set())
+        if feed.lastmod is not None:
+            # Without a watermark every row is "changed"; this also sets the watermark
+            delta = await self._apply_changes(session, feed, state)
+            return state, delta.rows
+        result = await session.execute(feed.query)
+        rows = {row[0]: tuple(row) for row in result.all()}
+        result = await session.execute(feed.watch)
+        state.digests = {row[0]: _digest(tuple(row[1:])) for row in result.all()}
+        state.pks = set(rows)
+        return state, rows
+
+    async def _apply_changes(
+        self, session: AsyncSession, feed: IndexFeed, state: FeedState
+    ) -> FeedDelta:
+        """Find rows changed since the last poll and advance ``state`` past them."""
+        delta = FeedDelta()
+        if feed.lastmod is None:
+            await self._compare(session, feed, state, delta)
+            return delta
+
+        query = feed.query.add_columns(feed.lastmod)
+        if state.watermark is not None:
+            query = query.where(feed.lastmod >= state.watermark)
+        result = await session.execute(query)
+        newest, stamped = state.watermark, {}
+        for row in result.all():
+            values, lastmod = tuple(row[:-1]), row[-1]
+            digest = hash(values)
+            if lastmod is not None:
+                if newest is None or lastmod > newest:
+                    newest, stamped = lastmod, {}
+                if lastmod == newest:
+                    stamped[values[0]] = digest
+            if lastmod == state.watermark and state.boundary.get(values[0]) == digest:
+                continue
+            delta.rows[values[0]] = values
+        state.watermark, state.boundary = newest, stamped
+        state.pks.update(delta.rows)
+        await self._reconcile(session, feed, state, delta)
+        return delta
+
+    async def _reconcile(
+        self, session: AsyncSession, feed: IndexFeed, state: FeedState, delta: FeedDelta
+    ) -> None:
+        """Drop deleted rows and fetch unseen ones when the row count differs."""
+        result = await session.execute(select(func.count(feed.pk)))
+        if (result.scalar() or 0) == len(state.pks):
+            return
+
+        result = await session.execute(select(feed.pk))
+        current = set(result.scalars().all())
+        delta.removed.update(state.pks - current)
+        added = current - state.pks
+        state.pks = current
+        await self._fetch(session, feed, added, delta)
+
+    async def _compare(
+        self, session: AsyncSession, feed: IndexFeed, state: FeedState, delta: FeedDelta
+    ) -> None:
+        """Find changed, inserted and deleted rows by checksumming the watched columns."""
+        result = await session.execute(feed.watch)
+        current = {row[0]: _digest(tuple(row[1:])) for row in result.all()}
+        delta.removed.update(state.digests.keys() - current.keys())
+        changed = [pk for pk, digest in current.items() if state.digests.get(pk) != digest]
+        state.digests = current
+        state.pks = set(current)
+        await self._fetch(session, feed, changed, delta)
+
+    async def _fetch(
+        self, session: AsyncSession, feed: IndexFeed, pks: Any, delta: FeedDelta
+    ) -> None:
+        """Fetch the rows of ``pks`` into ``delta``, in chunks."""
+        pks = sorted(pks)
+        for start in range(0, len(pks), _FETCH_CHUNK):
+            chunk = pks[start:start + _FETCH_CHUNK]
+            result = await session.execute(feed.query.where(feed.pk.in_(chunk)))
+            delta.rows.update((row[0], tuple(row)) for row in result.all())
+
+    async def _save(
+        self, feed: IndexFeed, state: FeedState, rows: dict[int, tuple[Any, ...]]
+    ) -> None:
+        """Persist every row of a feed as its new snapshot."""
+        if not settings.index_snapshot_enabled or not self._writer:
+            return
+        payload = {
+            "format": _SNAPSHOT_FORMAT,
+            "signature": feed.signature,
+            "watermark": state.watermark,
+            "rows": list(rows.values()),
+            "digests": state.digests,
+        }
+        try:
+            await asyncio.to_thread(_write_snapshot, feed.key, payload)
+        except OSError:
+            logger.exception(f"Failed to save search index snapshot {_snapshot_path(feed.key)}")
+
+    async def _journal(self, feed: IndexFeed, state: FeedState, delta: FeedDelta) -> None:
+        """Append the changed rows of a feed to its journal."""
+        if not settings.index_snapshot_enabled or not self._writer:
+            return
+        entry = {
+            "signature": feed.signature,
+            "watermark": state.watermark,
+            "rows": list(delta.rows.values()),
+            "removed": sorted(delta.removed),
+            "digests": {pk: state.digests[pk] for pk in delta.rows if pk in state.digests},
+        }
+        try:
+            await asyncio.to_thread(_append_journal, feed.key, entry)
+        except OSError:
+            logger.exception(
+                f"Failed to append to search index journal {_journal_path(feed.key)}"
+            )
+
+
+# Singleton instance
+index_refresh = IndexRefreshService()
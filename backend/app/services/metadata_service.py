@@ -3,9 +3,24 @@ Metadata service for cached lookup table operations.
 Loads all lookup tables at startup and provides them from memory.
 """
 
+import asyncio
+import json
+import zlib
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Any, Optional
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache_backend import cache_backend
+from app.core.config import settings
+from app.core.http_cache import RenderedPayload
+from app.core.logging_config import get_logger
+from app.core.response_cache import response_cache
+from app.db.session import async_session_maker
 from app.models import (
     Category,
     Console,
@@ -21,84 +36,339 @@ from app.models import (
     SkillLevel,
     UtilCat,
 )
+from app.schemas import (
+    AllMetadataResponse,
+    CategoryResponse,
+    ConsoleResponse,
+    GenreResponse,
+    HacksCatResponse,
+    HomebrewCatResponse,
+    LanguageResponse,
+    OSResponse,
+    PatchStatusResponse,
+    SkillLevelResponse,
+    UtilCatResponse,
+)
+
+logger = get_logger(__name__)
+
+# Cache backend scope of the lookup rows shared between workers
+_SHARED_SCOPE = "metadata"
+
+# Lifetime of the shared rows without periodic reloads: enough for the
+# workers starting together to load them once
+_SHARED_TTL_SECONDS = 300
+
+# Response schema of each served lookup table, in payload order
+_TABLE_SCHEMAS = {
+    "consoles": ConsoleResponse,
+    "genres": GenreResponse,
+    "languages": LanguageResponse,
+    "patch_statuses": PatchStatusResponse,
+    "hack_categories": HacksCatResponse,
+    "util_categories": UtilCatResponse,
+    "doc_categories": CategoryResponse,
+    "homebrew_categories": HomebrewCatResponse,
+    "skill_levels": SkillLevelResponse,
+    "operating_systems": OSResponse,
+}
+
+
+@dataclass(frozen=True)
+class LookupSnapshot:
+    """
+    Immutable ID -> display name maps for every lookup table.
+
+    Content services use it to resolve names such as ``console_name``
+    in Python instead of outer-joining the lookup tables on every query.
+    """
+
+    consoles: Mapping[int, str]
+    genres: Mapping[int, str]
+    languages: Mapping[int, str]
+    patch_statuses: Mapping[int, str]
+    doc_categories: Mapping[int, str]
+    hack_categories: Mapping[int, str]
+    homebrew_categories: Mapping[int, str]
+    util_categories: Mapping[int, str]
+    skill_levels: Mapping[int, str]
+    operating_systems: Mapping[int, str]
+    patch_hints: Mapping[int, str]
+
+
+@dataclass(frozen=True)
+class MetadataStore:
+    """
+    Immutable, pre-sorted copy of every served lookup table.
+
+    ``rendered`` holds each metadata endpoint's JSON body, serialized and
+    compressed once per load, keyed by table name (``"all"`` for the
+    combined payload).
+
+    A store is never modified after it is built; a reload builds a new one
+    and swaps the service's reference in a single assignment, so readers
+    always see one consistent version.
+    """
+
+    version: int
+    loaded_at: datetime
+    consoles: tuple[ConsoleResponse, ...]
+    genres: tuple[GenreResponse, ...]
+    languages: tuple[LanguageResponse, ...]
+    patch_statuses: tuple[PatchStatusResponse, ...]
+    hack_categories: tuple[HacksCatResponse, ...]
+    util_categories: tuple[UtilCatResponse, ...]
+    doc_categories: tuple[CategoryResponse, ...]
+    homebrew_categories: tuple[HomebrewCatResponse, ...]
+    skill_levels: tuple[SkillLevelResponse, ...]
+    operating_systems: tuple[OSResponse, ...]
+    lookups: LookupSnapshot
+    rendered: Mapping[str, RenderedPayload]
+
+
+def _to_json(value: object, sort_keys: bool = False) -> bytes:
+    """Compact UTF-8 JSON, matching FastAPI's default response encoding."""
+    return json.dumps(
+        value, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys
+    ).encode("utf-8")
+
+
+def _names(rows: Iterable[Any], key: str, name: str) -> Mapping[int, str]:
+    """Read-only ``key -> name`` map over a list of rows."""
+    return MappingProxyType({getattr(row, key): getattr(row, name) for row in rows})
 
 
 class MetadataService:
     """
     Service for managing cached metadata/lookup tables.
-    
-    All lookup tables are loaded into memory for fast access.
+
+    All lookup tables are loaded into memory for fast access. The store is
+    filled at startup and replaced atomically by ``reload``, which runs on
+    a timer (``metadata_reload_interval_seconds``) or on admin request.
+
+    With a cache backend shared by the worker processes, the worker that
+    queries the database publishes the rows there for one reload interval,
+    and the other workers build their store from that copy instead of
+    querying again; lookup changes then reach every worker within two
+    intervals. Each worker still keeps its own store, since name lookups
+    and rendered bodies are served from process memory.
     """
 
-    async def get_consoles(self, session: AsyncSession) -> list[Console]:
-        """Get all consoles/platforms."""
-        result = await session.execute(
-            select(Console).order_by(Console.description)
+    def __init__(self) -> None:
+        self._store: Optional[MetadataStore] = None
+        self._reload_lock = asyncio.Lock()
+
+    async def reload(self, shared: bool = True) -> MetadataStore:
+        """
+        Load every lookup table and atomically replace the in-memory store.
+
+        Concurrent callers share a single reload.
+
+        Args:
+            shared: Whether tables published by another worker may be used;
+                False always queries the database
+
+        Returns:
+            The newly loaded store
+        """
+        previous = self._store
+        async with self._reload_lock:
+            if self._store is not previous:
+                # Another caller reloaded while we waited for the lock
+                return self._store
+            store = await self._shared_store() if shared else None
+            source = "shared cache"
+            if store is None:
+                async with async_session_maker() as session:
+                    data = await self._fetch_tables(session)
+                store = self._build_store(data)
+                source = "database"
+                await self._publish(data)
+            self._store = store
+        if previous is not None and previous.version != store.version:
+            # Cached content responses embed lookup names
+            await response_cache.invalidate()
+        logger.info(
+            f"📚 Loaded metadata store v{store.version} from the {source} "
+            f"({len(store.consoles)} consoles, {len(store.languages)} languages)"
         )
-        return list(result.scalars().all())
+        return store
 
-    async def get_genres(self, session: AsyncSession) -> list[Genre]:
-        """Get all genres."""
-        result = await session.execute(
-            select(Genre).order_by(Genre.description)
+    async def get_store(self) -> MetadataStore:
+        """Return the current store, loading it on first use if startup could not."""
+        if self._store is None:
+            return await self.reload()
+        return self._store
+
+    async def get_lookups(self) -> LookupSnapshot:
+        """Return the ID -> name maps of the current store."""
+        return (await self.get_store()).lookups
+
+    async def auto_reload(self, interval_seconds: float) -> None:
+        """
+        Reload the store every ``interval_seconds`` until cancelled.
+
+        Failed reloads are logged and the previous store keeps being served.
+        """
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.reload()
+            except Exception:
+                logger.exception("Failed to reload metadata store; keeping previous version")
+
+    async def _fetch_tables(self, session: AsyncSession) -> dict[str, Any]:
+        """Query all lookup tables into the JSON-ready form shared between workers."""
+        consoles = await self._fetch(session, Console, Console.description)
+        genres = await self._fetch(session, Genre, Genre.description)
+        languages = await self._fetch(session, Language, Language.name)
+        patch_statuses = await self._fetch(session, PatchStatus, PatchStatus.id)
+        doc_categories = await self._fetch(session, Category, Category.catname)
+        hack_categories = await self._fetch(session, HacksCat, HacksCat.catname)
+        homebrew_categories = await self._fetch(session, HomebrewCat, HomebrewCat.catname)
+        util_categories = await self._fetch(session, UtilCat, UtilCat.catname)
+        skill_levels = await self._fetch(session, SkillLevel, SkillLevel.id)
+        operating_systems = await self._fetch(session, OS, OS.name)
+        patch_hints = await self.get_patch_hints(session)
+
+        rows = {
+            "consoles": consoles,
+            "genres": genres,
+            "languages": languages,
+            "patch_statuses": patch_statuses,
+            "hack_categories": hack_categories,
+            "util_categories": util_categories,
+            "doc_categories": doc_categories,
+            "homebrew_categories": homebrew_categories,
+            "skill_levels": skill_levels,
+            "operating_systems": operating_systems,
+        }
+        return {
+            "tables": {
+                name: [
+                    _TABLE_SCHEMAS[name].model_validate(row).model_dump(mode="json")
+                    for row in table
+                ]
+                for name, table in rows.items()
+            },
+            "patch_hints": [[hint.id, hint.description] for hint in patch_hints],
+        }
+
+    def _build_store(self, data: dict[str, Any]) -> MetadataStore:
+        """Build a new, versioned store from ``_fetch_tables`` output."""
+        tables = {
+            name: tuple(schema.model_validate(row) for row in data["tables"][name])
+            for name, schema in _TABLE_SCHEMAS.items()
+        }
+        lookups = LookupSnapshot(
+            consoles=_names(tables["consoles"], "consoleid", "description"),
+            genres=_names(tables["genres"], "genrekey", "description"),
+            languages=_names(tables["languages"], "id", "name"),
+            patch_statuses=_names(tables["patch_statuses"], "id", "description"),
+            doc_categories=_names(tables["doc_categories"], "categorykey", "catname"),
+            hack_categories=_names(tables["hack_categories"], "categorykey", "catname"),
+            homebrew_categories=_names(tables["homebrew_categories"], "categorykey", "catname"),
+            util_categories=_names(tables["util_categories"], "categorykey", "catname"),
+            skill_levels=_names(tables["skill_levels"], "id", "name"),
+            operating_systems=_names(tables["operating_systems"], "oskey", "name"),
+            patch_hints=MappingProxyType({pk: name for pk, name in data["patch_hints"]}),
         )
-        return list(result.scalars().all())
 
-    async def get_languages(self, session: AsyncSession) -> list[Language]:
-        """Get all languages."""
-        result = await session.execute(
-            select(Language).order_by(Language.name)
+        # The version is derived from the content, so every worker loading
+        # the same data reports the same version and unchanged reloads keep it.
+        # Patch hints are not served as a table but their names are embedded
+        # in hack responses, so they count too
+        dumped = {
+            name: [row.model_dump(mode="json") for row in rows] for name, rows in tables.items()
+        }
+        version = zlib.crc32(
+            _to_json(
+                {**dumped, "patch_hints": sorted(lookups.patch_hints.items())}, sort_keys=True
+            )
         )
-        return list(result.scalars().all())
 
-    async def get_patch_statuses(self, session: AsyncSession) -> list[PatchStatus]:
-        """Get all patch statuses."""
-        result = await session.execute(
-            select(PatchStatus).order_by(PatchStatus.id)
+        # Pre-render every endpoint body; requests then only copy bytes
+        rendered = {
+            name: RenderedPayload.from_bytes(_to_json(rows)) for name, rows in dumped.items()
+        }
+        rendered["all"] = RenderedPayload.from_bytes(
+            AllMetadataResponse(version=version, **tables).model_dump_json().encode()
         )
-        return list(result.scalars().all())
 
-    async def get_categories(self, session: AsyncSession) -> list[Category]:
-        """Get all document categories."""
-        result = await session.execute(
-            select(Category).order_by(Category.catname)
+        return MetadataStore(
+            version=version,
+            loaded_at=datetime.now(timezone.utc),
+            lookups=lookups,
+            rendered=MappingProxyType(rendered),
+            **tables,
         )
+
+    async def _shared_store(self) -> Optional[MetadataStore]:
+        """Store built from the tables another worker published, or None if there is none."""
+        if not cache_backend.shared:
+            return None
+        data = await cache_backend.get(_SHARED_SCOPE, "tables", "all")
+        if data is None:
+            return None
+        try:
+            return self._build_store(json.loads(data))
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring unreadable shared metadata tables", exc_info=True)
+            return None
+
+    @staticmethod
+    async def _publish(data: dict[str, Any]) -> None:
+        """Share freshly queried tables with the other workers."""
+        if not cache_backend.shared:
+            return
+        ttl = settings.metadata_reload_interval_seconds or _SHARED_TTL_SECONDS
+        await cache_backend.set(_SHARED_SCOPE, "tables", "all", _to_json(data), ttl)
+
+    @staticmethod
+    async def _fetch(session: AsyncSession, model: type, order_by) -> list:
+        """Load a whole lookup table in display order."""
+        result = await session.execute(select(model).order_by(order_by))
         return list(result.scalars().all())
 
-    async def get_hack_categories(self, session: AsyncSession) -> list[HacksCat]:
+    async def get_consoles(self) -> tuple[ConsoleResponse, ...]:
+        """Get all consoles/platforms."""
+        return (await self.get_store()).consoles
+
+    async def get_genres(self) -> tuple[GenreResponse, ...]:
+        """Get all genres."""
+        return (await self.get_store()).genres
+
+    async def get_languages(self) -> tuple[LanguageResponse, ...]:
+        """Get all languages."""
+        return (await self.get_store()).languages
+
+    async def get_patch_statuses(self) -> tuple[PatchStatusResponse, ...]:
+        """Get all patch statuses."""
+        return (await self.get_store()).patch_statuses
+
+    async def get_categories(self) -> tuple[CategoryResponse, ...]:
+        """Get all document categories."""
+        return (await self.get_store()).doc_categories
+
+    async def get_hack_categories(self) -> tuple[HacksCatResponse, ...]:
         """Get all hack categories."""
-        result = await session.execute(
-            select(HacksCat).order_by(HacksCat.catname)
-        )
-        return list(result.scalars().all())
+        return (await self.get_store()).hack_categories
 
-    async def get_homebrew_categories(self, session: AsyncSession) -> list[HomebrewCat]:
+    async def get_homebrew_categories(self) -> tuple[HomebrewCatResponse, ...]:
         """Get all homebrew categories."""
-        result = await session.execute(
-            select(HomebrewCat).order_by(HomebrewCat.catname)
-        )
-        return list(result.scalars().all())
+        return (await self.get_store()).homebrew_categories
 
-    async def get_util_categories(self, session: AsyncSession) -> list[UtilCat]:
+    async def get_util_categories(self) -> tuple[UtilCatResponse, ...]:
         """Get all utility categories."""
-        result = await session.execute(
-            select(UtilCat).order_by(UtilCat.catname)
-        )
-        return list(result.scalars().all())
+        return (await self.get_store()).util_categories
 
-    async def get_skill_levels(self, session: AsyncSession) -> list[SkillLevel]:
+    async def get_skill_levels(self) -> tuple[SkillLevelResponse, ...]:
         """Get all skill levels."""
-        result = await session.execute(
-            select(SkillLevel).order_by(SkillLevel.id)
-        )
-        return list(result.scalars().all())
+        return (await self.get_store()).skill_levels
 
-    async def get_operating_systems(self, session: AsyncSession) -> list[OS]:
+    async def get_operating_systems(self) -> tuple[OSResponse, ...]:
         """Get all operating systems."""
-        result = await session.execute(
-            select(OS).order_by(OS.name)
-        )
-        return list(result.scalars().all())
+        return (await self.get_store()).operating_systems
 
     async def get_licenses(self, session: AsyncSession) -> list[License]:
         """Get all licenses."""
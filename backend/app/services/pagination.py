@@ -0,0 +1,171 @@
+"""
+Pagination helpers shared by the list services.
+Provides sort column resolution and opt-in keyset (cursor) pagination.
+"""
+
+import base64
+import binascii
+import json
+from collections.abc import Callable, Mapping, Sequence
+from datetime import datetime
+from typing import Any, Optional, TypeVar
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+
+RowT = TypeVar("RowT")
+
+
+def resolve_sort_column(
+    model: Any,
+    sort_by: str,
+    default: str,
+    computed: Optional[Mapping[str, Optional[ColumnElement[Any]]]] = None,
+) -> tuple[str, ColumnElement[Any]]:
+    """
+    Resolve a ``sort_by`` value to a mapped column of ``model``.
+
+    Unknown names fall back to ``default`` so callers keep the previous
+    lenient behaviour for invalid sort fields.
+
+    Args:
+        model: ORM model being listed
+        sort_by: Requested sort field
+        default: Column name used for unknown fields
+        computed: Extra sort keys mapped to SQL expressions (such as search
+            relevance); keys whose expression is None are unavailable
+
+    Returns:
+        Tuple of (effective sort key, column)
+    """
+    if computed and computed.get(sort_by) is not None:
+        return sort_by, computed[sort_by]
+    key = sort_by if sort_by in model.__table__.columns else default
+    return key, getattr(model, key)
+
+
+def encode_cursor(sort_key: str, descending: bool, value: Any, pk: int) -> str:
+    """Encode the last row of a page as an opaque, URL-safe cursor."""
+    if isinstance(value, datetime):
+        value = {"dt": value.isoformat()}
+    payload = {"s": sort_key, "o": "desc" if descending else "asc", "v": value, "k": pk}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, sort_key: str, descending: bool) -> tuple[Any, int]:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Args:
+        cursor: Opaque cursor string from a previous response
+        sort_key: Effective sort key of the current request
+        descending: Sort direction of the current request
+
+    Returns:
+        Tuple of (sort column value, primary key) of the last row seen
+
+    Raises:
+        HTTPException: If the cursor is malformed or was issued for a different sort
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        value, pk = payload["v"], int(payload["k"])
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["dt"])
+        cursor_sort, cursor_order = payload["s"], payload["o"]
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+    if cursor_sort != sort_key or cursor_order != ("desc" if descending else "asc"):
+        raise HTTPException(
+            status_code=400,
+            detail="Pagination cursor does not match the requested sort_by/sort_order",
+        )
+    return value, pk
+
+
+def keyset_clause(
+    column: ColumnElement[Any],
+    pk_column: ColumnElement[Any],
+    value: Any,
+    pk: int,
+    descending: bool,
+) -> ColumnElement[bool]:
+    """
+    Build the seek predicate for rows after ``(value, pk)``.
+
+    MySQL sorts NULLs first in ascending order and last in descending order,
+    so NULL sort values need their own branch next to the row comparison.
+    """
+    if descending:
+        if value is None:
+            return and_(column.is_(None), pk_column < pk)
+        return or_(tuple_(column, pk_column) < tuple_(value, pk), column.is_(None))
+
+    if value is None:
+        return or_(and_(column.is_(None), pk_column > pk), column.is_not(None))
+    return tuple_(column, pk_column) > tuple_(value, pk)
+
+
+def paginate(
+    query: Select,
+    sort_column: ColumnElement[Any],
+    pk_column: ColumnElement[Any],
+    *,
+    sort_key: str,
+    descending: bool,
+    page: int,
+    page_size: int,
+    cursor: Optional[str] = None,
+) -> Select:
+    """
+    Apply ordering and either offset or keyset pagination to a list query.
+
+    The primary key is always used as a tie-breaker so page boundaries are
+    stable. One extra row is fetched to detect whether a next page exists.
+    """
+    if descending:
+        query = query.order_by(sort_column.desc(), pk_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), pk_column.asc())
+
+    if cursor:
+        value, last_pk = decode_cursor(cursor, sort_key, descending)
+        query = query.where(keyset_clause(sort_column, pk_column, value, last_pk, descending))
+    else:
+        query = query.offset((page - 1) * page_size)
+
+    return query.limit(page_size + 1)
+
+
+def split_page(
+    rows: Sequence[RowT],
+    page_size: int,
+    *,
+    sort_key: str,
+    descending: bool,
+    key: Optional[Callable[[RowT], tuple[Any, int]]],
+) -> tuple[list[RowT], Optional[str]]:
+    """
+    Trim the look-ahead row fetched by ``paginate`` and build the next cursor.
+
+    Args:
+        rows: Rows returned by the paginated query
+        page_size: Requested page size
+        sort_key: Effective sort key
+        descending: Sort direction
+        key: Extracts (sort value, primary key) from a row; None when the
+            sort key is computed and pages cannot be resumed by cursor
+
+    Returns:
+        Tuple of (rows for this page, cursor for the next page or None)
+    """
+    page_rows = list(rows[:page_size])
+    if key is None or len(rows) <= page_size or not page_rows:
+        return page_rows, None
+    value, pk = key(page_rows[-1])
+    return page_rows, encode_cursor(sort_key, descending, value, pk)
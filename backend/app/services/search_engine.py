@@ -0,0 +1,201 @@
+"""
+Title search for list endpoints.
+Translates a ``q`` string into a primary-key lookup from the in-process
+trigram index, a similarity-ranked fuzzy match, or an index-backed MySQL
+FULLTEXT predicate with a relevance score, falling back to LIKE when
+none of them can help. Description searches are ranked by the in-process
+BM25 index.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlalchemy import and_, case, false, or_
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.config import settings
+from app.services.search_keys import search_key
+from app.services.text_index import text_index
+from app.services.title_index import title_index
+
+SEARCH_MODES = ("auto", "substring", "natural", "boolean", "fuzzy")
+
+# What ``q`` is matched against: titles, or titles plus descriptions
+SEARCH_SCOPES = ("title", "description")
+
+# Sort key that orders by search relevance instead of a column
+RELEVANCE = "relevance"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize_query(q: Optional[str]) -> Optional[str]:
+    """``q`` without surrounding whitespace, or None if nothing is left to search for."""
+    q = q.strip() if q else ""
+    return q or None
+
+
+@dataclass(frozen=True)
+class SearchTarget:
+    """
+    What a list endpoint searches.
+
+    Attributes:
+        index: Name of the in-memory index (``title_index.INDEX_SOURCES``, or
+            ``text_index.TEXT_SOURCES`` for description searches)
+        columns: Searched columns, all matched by LIKE fallbacks
+        pk: Column matched against the primary keys returned by the index
+        fulltext: Whether ``columns`` are exactly one FULLTEXT index, in order
+    """
+
+    index: str
+    columns: tuple[ColumnElement[Any], ...]
+    pk: ColumnElement[Any]
+    fulltext: bool = True
+
+
+@dataclass(frozen=True)
+class SearchPlan:
+    """
+    How a search string is applied to a list query.
+
+    Attributes:
+        clause: WHERE predicate selecting matching rows
+        relevance: Score to sort by, or None for unranked searches
+        key: Hashable, normalized description used in count cache keys
+    """
+
+    clause: ColumnElement[bool]
+    relevance: Optional[ColumnElement[Any]]
+    key: tuple[str, ...]
+
+
+class SearchEngine:
+    """
+    Builds search predicates for a ``SearchTarget``.
+
+    Modes:
+        auto: Substring match from the trigram index, else LIKE; when a
+            ranking is requested, every word must match as a prefix
+            (``+word*`` in FULLTEXT boolean mode), with words shorter than
+            the FULLTEXT minimum token size matched by LIKE.
+        substring: Substring match from the trigram index, else LIKE.
+        natural: Natural-language MATCH of the raw query, ranked by relevance.
+        boolean: Raw MySQL boolean-mode syntax (``+``, ``-``, ``*``, quotes).
+        fuzzy: Typo-tolerant match from the word trigram index, ranked by
+            similarity and limited to the ``fuzzy_max_results`` best titles.
+
+    Queries that no index can serve fall back to ``LIKE '%q%'`` on the
+    title columns. The in-memory indexes match normalized search keys
+    (see ``search_key``), so they ignore accents, kana script, punctuation
+    and roman numeral style; LIKE and FULLTEXT do not.
+    """
+
+    def plan(
+        self,
+        target: SearchTarget,
+        q: str,
+        mode: str = "auto",
+        *,
+        ranked: bool = False,
+    ) -> SearchPlan:
+        """
+        Build the search plan for ``q`` over ``target``.
+
+        Args:
+            target: Searched columns and title index
+            q: Search string from the request
+            mode: "auto", "substring", "natural", "boolean" or "fuzzy"
+            ranked: Whether the caller sorts by relevance
+
+        Returns:
+            The predicate, relevance score and cache key for the search
+        """
+        q = q.strip()
+        fulltext = target.fulltext and settings.fulltext_search_enabled
+
+        if mode == "fuzzy":
+            matches = title_index.fuzzy(target.index, q)
+            if matches is None:
+                return self._like(target, q)
+            return self._ranked(target, matches, ("fuzzy", search_key(q)))
+
+        if mode == "substring" or (mode == "auto" and not (ranked and fulltext)):
+            pks = title_index.search(target.index, q)
+            if pks is not None:
+                # Only the matching keys are fetched; no title scan in MySQL
+                clause = target.pk.in_(pks) if pks else false()
+                return SearchPlan(clause=clause, relevance=None, key=("substring", search_key(q)))
+            # Unranked searches keep substring semantics when the index cannot answer
+            return self._like(target, q)
+
+        min_size = settings.fulltext_min_token_size
+        tokens = [token.lower() for token in _TOKEN_RE.findall(q)]
+        indexable = [token for token in tokens if len(token) >= min_size]
+        if not fulltext or not indexable:
+            return self._like(target, q)
+
+        # A bare MATCH in WHERE is what lets MySQL drive the query from the index
+        if mode == "natural":
+            score = match(*target.columns, against=q).in_natural_language_mode()
+            return SearchPlan(clause=score, relevance=score, key=("natural", q.lower()))
+
+        if mode == "boolean":
+            score = match(*target.columns, against=q).in_boolean_mode()
+            return SearchPlan(clause=score, relevance=score, key=("boolean", q))
+
+        against = " ".join(f"+{token}*" for token in dict.fromkeys(indexable))
+        score = match(*target.columns, against=against).in_boolean_mode()
+        short = [token for token in dict.fromkeys(tokens) if len(token) < min_size]
+        clause = and_(score, *(self._contains(target, token) for token in short))
+        return SearchPlan(clause=clause, relevance=score, key=("auto", " ".join(tokens)))
+
+    def plan_description(self, target: SearchTarget, q: str) -> SearchPlan:
+        """
+        Build a BM25-ranked search of titles and descriptions.
+
+        Args:
+            target: Text index name, primary key, and the title and
+                description columns used by the LIKE fallback
+            q: Search string from the request
+
+        Returns:
+            A primary-key predicate over the ``text_search_max_results``
+            best matches, ranked by BM25 score
+        """
+        q = q.strip()
+        matches = text_index.search(target.index, q)
+        if matches is None:
+            return self._like(target, q)
+        return self._ranked(target, matches, ("description", search_key(q)))
+
+    @staticmethod
+    def _ranked(
+        target: SearchTarget, matches: list[tuple[int, float]], key: tuple[str, ...]
+    ) -> SearchPlan:
+        """Restrict to scored primary keys and rank by their in-memory scores."""
+        if not matches:
+            return SearchPlan(clause=false(), relevance=None, key=key)
+        scores = dict(matches)
+        score = case(scores, value=target.pk, else_=0)
+        return SearchPlan(clause=target.pk.in_(list(scores)), relevance=score, key=key)
+
+    @staticmethod
+    def _contains(target: SearchTarget, text: str) -> ColumnElement[bool]:
+        """Any title column contains ``text``."""
+        return or_(*(column.ilike(f"%{text}%") for column in target.columns))
+
+    @classmethod
+    def _like(cls, target: SearchTarget, q: str) -> SearchPlan:
+        """Substring match on the title columns (full scan, no ranking)."""
+        return SearchPlan(
+            clause=cls._contains(target, q),
+            relevance=None,
+            key=("title", q.lower()),
+        )
+
+
+# Singleton instance
+search_engine = SearchEngine()
@@ -0,0 +1,84 @@
+"""
+Search key normalization.
+Titles and queries are reduced to the same canonical form before they are
+indexed or matched, so width, case, accents, kana script, punctuation,
+roman numerals and a leading "The" no longer affect whether they match.
+"""
+
+import re
+import unicodedata
+
+# Combining voiced / semi-voiced sound marks; they change the kana itself,
+# so they are kept when other diacritics are stripped
+_KANA_MARKS = frozenset("゙゚")
+
+# Katakana letters that have a hiragana counterpart 0x60 code points lower
+_KATAKANA_TO_HIRAGANA = {code: code - 0x60 for code in range(0x30A1, 0x30F7)}
+
+# Apostrophes join words ("Kirby's" -> "kirbys"); other punctuation separates them
+_APOSTROPHES = str.maketrans("", "", "'‘’`´")
+
+# "Legend of Zelda, The" is the archive's sort form of "The Legend of Zelda"
+_TRAILING_ARTICLE_RE = re.compile(r",\s*the\s*$")
+
+_LEADING_ARTICLE = "the "
+
+# Boundary between ASCII letters/digits and other scripts ("じー6", "rpgツクール")
+_SCRIPT_BOUNDARY_RE = re.compile(r"(?<=[a-z0-9])(?=[^\x00-\x7f])|(?<=[^\x00-\x7f])(?=[a-z0-9])")
+
+# Roman numerals from 2 to 39; single letters are left alone ("Mega Man X")
+_ROMAN_RE = re.compile(r"^x{0,3}(ix|iv|v?i{0,3})$")
+_ROMAN_VALUES = {"i": 1, "v": 5, "x": 10}
+
+
+def _roman_to_int(word: str) -> int:
+    total = 0
+    for i, char in enumerate(word):
+        value = _ROMAN_VALUES[char]
+        if i + 1 < len(word) and _ROMAN_VALUES[word[i + 1]] > value:
+            total -= value
+        else:
+            total += value
+    return total
+
+
+def _fold_word(word: str) -> str:
+    if len(word) > 1 and _ROMAN_RE.match(word):
+        return str(_roman_to_int(word))
+    return word
+
+
+def search_key(text: str) -> str:
+    """
+    Normalize a title or query for matching.
+
+    Steps: NFKC (full/half width and compatibility forms such as "Ⅱ"),
+    case folding, accent stripping, katakana to hiragana, punctuation to
+    spaces, splitting Latin from other scripts, roman numerals to digits
+    ("vi" -> "6") and dropping a leading or trailing "the". Whitespace is
+    collapsed.
+
+    Args:
+        text: Title or search query
+
+    Returns:
+        The search key; empty if ``text`` has no letters or digits
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = "".join(
+        char
+        for char in unicodedata.normalize("NFD", text)
+        if char in _KANA_MARKS or not unicodedata.combining(char)
+    )
+    text = unicodedata.normalize("NFC", text).translate(_KATAKANA_TO_HIRAGANA)
+    text = _TRAILING_ARTICLE_RE.sub("", text.translate(_APOSTROPHES))
+    text = _SCRIPT_BOUNDARY_RE.sub(" ", text)
+
+    words = "".join(
+        char if char.isalnum() or unicodedata.category(char) == "Mn" else " "
+        for char in text
+    ).split()
+    key = " ".join(_fold_word(word) for word in words)
+    if key.startswith(_LEADING_ARTICLE):
+        key = key[len(_LEADING_ARTICLE):]
+    return key
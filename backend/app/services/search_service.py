@@ -0,0 +1,183 @@
+"""
+Global search service.
+Fans a query out to every content section concurrently under a time budget.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any, Optional
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.db.session import async_session_maker
+from app.schemas import (
+    GlobalSearchResponse,
+    SearchSection,
+    Suggestion,
+    SuggestResponse,
+)
+from app.services.document_service import document_service
+from app.services.game_service import game_service
+from app.services.hack_service import hack_service
+from app.services.homebrew_service import homebrew_service
+from app.services.search_engine import normalize_query
+from app.services.title_index import INDEX_SOURCES, title_index
+from app.services.translation_service import translation_service
+from app.services.utility_service import utility_service
+
+logger = get_logger(__name__)
+
+# Section name -> list method searched for that section
+SECTION_LISTERS: dict[str, Callable[..., Awaitable[dict[str, Any]]]] = {
+    "games": game_service.get_games,
+    "hacks": hack_service.get_hacks,
+    "translations": translation_service.get_translations,
+    "utilities": utility_service.get_utilities,
+    "documents": document_service.get_documents,
+    "homebrew": homebrew_service.get_homebrews,
+}
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def _validate_sections(requested: Optional[list[str]], available: Iterable[str]) -> list[str]:
+    """
+    Resolve a requested section list, defaulting to every available section.
+
+    Raises:
+        HTTPException: If an unknown section is requested
+    """
+    available = list(available)
+    if not requested:
+        return available
+    unknown = [name for name in requested if name not in available]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown search section(s): {', '.join(unknown)}",
+        )
+    return list(dict.fromkeys(requested))
+
+
+class SearchService:
+    """
+    Service for searching all content sections at once.
+
+    Each section runs on its own pooled session so the sections query the
+    database in parallel. Sections that miss the time budget are cancelled
+    and reported as ``timeout``; failing sections are reported as ``error``.
+    Either way the remaining sections are still returned.
+
+    Suggestions are answered from the in-memory title indexes only.
+    """
+
+    async def search(
+        self,
+        q: str,
+        *,
+        sections: Optional[list[str]] = None,
+        limit: int = 5,
+        include_total: bool = False,
+        budget_ms: Optional[int] = None,
+    ) -> GlobalSearchResponse:
+        """
+        Search every requested section concurrently.
+
+        Args:
+            q: Search query for titles
+            sections: Sections to search (default: all)
+            limit: Maximum items returned per section
+            include_total: Whether to count all matches per section
+            budget_ms: Overall time budget (default: ``search_time_budget_ms``)
+
+        Returns:
+            Categorized results with per-section status
+
+        Raises:
+            HTTPException: If ``q`` is blank or an unknown section is requested
+        """
+        requested = _validate_sections(sections, SECTION_LISTERS)
+        if normalize_query(q) is None:
+            raise HTTPException(status_code=400, detail="Search query is empty")
+        budget = (budget_ms or settings.search_time_budget_ms) / 1000
+
+        start = time.perf_counter()
+        tasks = {
+            name: asyncio.create_task(self._search_section(name, q, limit, include_total))
+            for name in requested
+        }
+        _, pending = await asyncio.wait(tasks.values(), timeout=budget)
+        for task in pending:
+            task.cancel()
+
+        results: dict[str, SearchSection] = {}
+        for name, task in tasks.items():
+            if task in pending:
+                logger.warning(f"Search section '{name}' exceeded the {budget:.2f}s budget")
+                results[name] = SearchSection(status="timeout")
+            elif task.exception() is not None:
+                logger.error(f"Search section '{name}' failed", exc_info=task.exception())
+                results[name] = SearchSection(status="error")
+            else:
+                results[name] = task.result()
+
+        for name in SECTION_LISTERS:
+            results.setdefault(name, SearchSection(status="skipped"))
+
+        return GlobalSearchResponse(
+            query=q,
+            partial=any(r.status in ("timeout", "error") for r in results.values()),
+            elapsed_ms=_elapsed_ms(start),
+            **results,
+        )
+
+    def suggest(
+        self, q: str, *, sections: Optional[list[str]] = None, limit: int = 8
+    ) -> SuggestResponse:
+        """
+        Autocomplete titles starting with ``q`` from the in-memory prefix index.
+
+        Args:
+            q: Text typed so far; matches the start of any word in a title
+            sections: Sections to suggest from (default: all indexed sections)
+            limit: Maximum number of suggestions
+
+        Returns:
+            Suggestions across sections, most downloaded first
+
+        Raises:
+            HTTPException: 400 for unknown sections, 503 before the index is built
+        """
+        suggestions: list[Suggestion] = []
+        for name in _validate_sections(sections, INDEX_SOURCES):
+            hits = title_index.suggest(name, q, limit)
+            if hits is None:
+                raise HTTPException(status_code=503, detail="Suggestions are not available yet")
+            suggestions.extend(
+                Suggestion(section=name, id=pk, title=title, downloads=downloads)
+                for pk, title, downloads in hits
+            )
+        suggestions.sort(key=lambda s: -s.downloads)
+        return SuggestResponse(query=q, items=suggestions[:limit])
+
+    async def _search_section(
+        self, name: str, q: str, limit: int, include_total: bool
+    ) -> SearchSection:
+        """Search one section on its own session."""
+        start = time.perf_counter()
+        async with async_session_maker() as session:
+            page = await SECTION_LISTERS[name](
+                session, q=q, page_size=limit, include_total=include_total
+            )
+        return SearchSection(
+            items=page["items"], total=page["total"], elapsed_ms=_elapsed_ms(start)
+        )
+
+
+# Singleton instance
+search_service = SearchService()
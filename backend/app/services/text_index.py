@@ -0,0 +1,290 @@
+"""
+In-process BM25 index over titles and descriptions.
+Descriptions hold most of the searchable detail ("1-up", "difficulty
+patch", "SA-1"); this index ranks them in memory so list queries only
+fetch the best matching primary keys.
+"""
+
+import asyncio
+import heapq
+import math
+import re
+from array import array
+from collections import Counter
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from functools import partial
+from types import MappingProxyType
+from typing import Any, Optional
+
+from sqlalchemy import Select, select
+
+from app.core.config import settings
+from app.models import Document, Game, Hack, Homebrew, Translation, Utility
+from app.services.index_layers import LayeredIndex
+from app.services.search_keys import search_key
+
+try:  # NumPy is optional; scoring falls back to pure Python without it
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@dataclass(frozen=True)
+class TextSource:
+    """
+    Columns loaded into the text index of one entity.
+
+    Attributes:
+        pk: Primary key column
+        title: Title column (weighted above the description)
+        description: Description column
+        lastmod: Modification time column used for incremental refreshes
+        join: Optional ``(model, onclause)`` outer join providing ``title``
+    """
+
+    pk: Any
+    title: Any
+    description: Any
+    lastmod: Any
+    join: Optional[tuple[Any, Any]] = None
+
+
+# Translations have no title of their own; they are indexed with their game's
+TEXT_SOURCES: Mapping[str, TextSource] = {
+    "hacks": TextSource(Hack.hackkey, Hack.hacktitle, Hack.description, Hack.lastmod),
+    "translations": TextSource(
+        Translation.transkey,
+        Game.gametitle,
+        Translation.description,
+        Translation.lastmod,
+        (Game, Translation.gamekey == Game.gamekey),
+    ),
+    "utilities": TextSource(
+        Utility.utilkey, Utility.title, Utility.description, Utility.lastmod
+    ),
+    "documents": TextSource(
+        Document.dockey, Document.title, Document.description, Document.lastmod
+    ),
+    "homebrew": TextSource(
+        Homebrew.homebrewkey, Homebrew.title, Homebrew.description, Homebrew.lastmod
+    ),
+}
+
+# BM25 term frequency saturation and document length normalization
+_K1 = 1.2
+_B = 0.75
+
+# A title term counts as this many description terms
+_TITLE_WEIGHT = 2
+
+# Largest stored term frequency (postings keep frequencies as unsigned shorts)
+_MAX_TF = 0xFFFF
+
+# Hyphenated or dotted words ("SA-1", "1-up") are also indexed joined ("sa1", "1up")
+_COMPOUND_RE = re.compile(r"\w+(?:[-./]\w+)+", re.UNICODE)
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    """Search-key words of ``text`` plus its joined compounds."""
+    if not text:
+        return []
+    tokens = search_key(text).split()
+    for compound in _COMPOUND_RE.findall(text):
+        joined = search_key(compound).replace(" ", "")
+        if joined:
+            tokens.append(joined)
+    return tokens
+
+
+class BM25Index:
+    """
+    Immutable BM25 inverted index over the title and description of one entity.
+
+    Postings of all terms are stored back to back in two typed arrays,
+    ``array('i')`` document ordinals and ``array('H')`` term frequencies,
+    with ``array('i')`` start offsets per term id; ``pks`` maps ordinals
+    back to primary keys. Per-document length normalization is computed
+    once at build time, so a query only walks the postings of its terms
+    (vectorized with NumPy when it is installed).
+
+    An index over a few changed rows is normalized with the average length
+    of the full index it complements (``average``) and scored with the
+    document frequencies of both (``corpus``), so their scores compare.
+    """
+
+    def __init__(
+        self,
+        docs: Iterable[tuple[int, Optional[str], Optional[str]]],
+        average: Optional[float] = None,
+    ) -> None:
+        pks = array("i")
+        lengths = array("i")
+        postings: dict[str, list[tuple[int, int]]] = {}
+        for ordinal, (pk, title, description) in enumerate(docs):
+            counts: Counter = Counter(tokenize(description))
+            for token in tokenize(title):
+                counts[token] += _TITLE_WEIGHT
+            pks.append(pk)
+            lengths.append(sum(counts.values()))
+            for token, tf in counts.items():
+                postings.setdefault(token, []).append((ordinal, min(tf, _MAX_TF)))
+
+        terms: dict[str, int] = {}
+        starts = array("i", [0])
+        ordinals = array("i")
+        frequencies = array("H")
+        for term_id, (term, entries) in enumerate(postings.items()):
+            terms[term] = term_id
+            ordinals.extend(ordinal for ordinal, _ in entries)
+            frequencies.extend(tf for _, tf in entries)
+            starts.append(len(ordinals))
+
+        if average is None:
+            average = (sum(lengths) / len(lengths)) or 1.0 if lengths else 1.0
+        self.average = average
+        self.pks = pks
+        self._terms = MappingProxyType(terms)
+        self._starts = starts
+        self._ordinals = ordinals
+        self._frequencies = frequencies
+        # Denominator term of BM25 that depends only on the document
+        self._norms = array("d", (_K1 * (1 - _B + _B * length / average) for length in lengths))
+        if numpy is not None:
+            self._np_ordinals = numpy.frombuffer(ordinals, dtype=numpy.int32)
+            self._np_frequencies = numpy.frombuffer(frequencies, dtype=numpy.uint16)
+            self._np_norms = numpy.frombuffer(self._norms, dtype=numpy.float64)
+
+    def __len__(self) -> int:
+        return len(self.pks)
+
+    def df(self, term: str) -> int:
+        """Number of documents containing ``term``."""
+        term_id = self._terms.get(term)
+        return 0 if term_id is None else self._starts[term_id + 1] - self._starts[term_id]
+
+    def search(
+        self, q: str, limit: int, corpus: Sequence["BM25Index"] = ()
+    ) -> list[tuple[int, float]]:
+        """
+        Best matching documents for ``q`` by BM25.
+
+        Args:
+            q: Search string
+            limit: Maximum number of results
+            corpus: Indexes whose documents, with this index's, make up
+                the collection inverse document frequencies are computed over
+
+        Returns:
+            ``(primary key, score)`` pairs, best first
+        """
+        indexes = (self, *corpus)
+        size = sum(len(index) for index in indexes)
+        spans = []
+        for token in dict.fromkeys(tokenize(q)):
+            term_id = self._terms.get(token)
+            if term_id is not None:
+                start, end = self._starts[term_id], self._starts[term_id + 1]
+                df = sum(index.df(token) for index in indexes)
+                spans.append((start, end, math.log(1 + (size - df + 0.5) / (df + 0.5))))
+        if not spans:
+            return []
+        if numpy is not None:
+            scored = self._score_numpy(spans)
+        else:
+            scored = self._score_python(spans)
+        best = heapq.nsmallest(limit, scored, key=lambda item: (-item[1], item[0]))
+        return [(self.pks[ordinal], round(score, 4)) for ordinal, score in best]
+
+    def _score_numpy(self, spans: list[tuple[int, int, float]]) -> list[tuple[int, float]]:
+        """Vectorized BM25 accumulation."""
+        scores = numpy.zeros(len(self.pks), dtype=numpy.float64)
+        for start, end, idf in spans:
+            ordinals = self._np_ordinals[start:end]
+            tf = self._np_frequencies[start:end].astype(numpy.float64)
+            # Ordinals are unique within one posting list, so fancy += is safe
+            scores[ordinals] += idf * tf * (_K1 + 1) / (tf + self._np_norms[ordinals])
+        matched = numpy.flatnonzero(scores)
+        return list(zip(matched.tolist(), scores[matched].tolist()))
+
+    def _score_python(self, spans: list[tuple[int, int, float]]) -> list[tuple[int, float]]:
+        """BM25 accumulation without NumPy."""
+        scores: dict[int, float] = {}
+        norms = self._norms
+        for start, end, idf in spans:
+            weight = idf * (_K1 + 1)
+            for ordinal, tf in zip(self._ordinals[start:end], self._frequencies[start:end]):
+                scores[ordinal] = scores.get(ordinal, 0.0) + weight * tf / (tf + norms[ordinal])
+        return list(scores.items())
+
+
+class TextIndexService:
+    """
+    Holds one BM25 index per entity with descriptions.
+
+    Indexes are loaded at startup by the index refresh job (see
+    ``index_refresh``); rows changed later go into a small delta layer (see
+    ``LayeredIndex``) that is replaced atomically, one entity at a time.
+    Until an entity is loaded (or if building failed) its searches return
+    None and callers fall back to database matching.
+    """
+
+    sources = TEXT_SOURCES
+
+    def __init__(self) -> None:
+        self._layers: Mapping[str, LayeredIndex[BM25Index]] = MappingProxyType({})
+
+    @staticmethod
+    def rows_query(name: str) -> Select:
+        """Rows an entity's index is built from: ``(pk, title, description)``."""
+        source = TEXT_SOURCES[name]
+        query = select(source.pk, source.title, source.description)
+        if source.join is not None:
+            query = query.outerjoin(*source.join)
+        return query
+
+    async def load(self, name: str, rows: Sequence[Sequence[Any]]) -> None:
+        """Build the index of one entity from ``rows_query`` rows and swap it in."""
+        # Building is CPU-bound; keep the event loop responsive
+        layers = await asyncio.to_thread(LayeredIndex.build, BM25Index, rows)
+        self._layers = MappingProxyType({**self._layers, name: layers})
+
+    async def update(
+        self, name: str, rows: Sequence[Sequence[Any]], removed: Iterable[int]
+    ) -> None:
+        """Apply inserted, updated (``rows_query`` rows) and deleted rows of a loaded entity."""
+        layers = self._layers[name]
+        build = partial(BM25Index, average=layers.base.average)
+        layers = await asyncio.to_thread(layers.changed, build, rows, removed)
+        self._layers = MappingProxyType({**self._layers, name: layers})
+
+    def pending(self, name: str) -> int:
+        """Rows of an entity changed since its last full load."""
+        layers = self._layers.get(name)
+        return 0 if layers is None else layers.pending
+
+    def search(self, name: str, q: str) -> Optional[list[tuple[int, float]]]:
+        """
+        Titles and descriptions of one entity best matching ``q``.
+
+        Returns:
+            Up to ``text_search_max_results`` ``(primary key, score)`` pairs,
+            best first, or None if the index is not built
+        """
+        layers = self._layers.get(name)
+        if layers is None:
+            return None
+        limit = settings.text_search_max_results
+        masked = layers.masked
+        found = [
+            (pk, score)
+            for pk, score in layers.base.search(q, limit + len(masked), (layers.delta,))
+            if pk not in masked
+        ]
+        found += layers.delta.search(q, limit, (layers.base,))
+        found.sort(key=lambda item: (-item[1], item[0]))
+        return found[:limit]
+
+
+# Singleton instance
+text_index = TextIndexService()
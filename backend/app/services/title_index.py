@@ -0,0 +1,566 @@
+"""
+In-process indexes over content titles.
+A trigram index answers substring title searches from memory so list
+queries only need to fetch the matching primary keys; a sorted prefix
+index answers autocomplete suggestions ranked by popularity, and a word
+vocabulary index ranks typo-tolerant (fuzzy) matches by similarity.
+"""
+
+import asyncio
+import heapq
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Collection, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Optional
+
+from sqlalchemy import Select, func, literal, select
+
+from app.core.config import settings
+from app.models import Document, Game, Hack, Homebrew, Translation, Utility
+from app.services.index_layers import LayeredIndex
+from app.services.search_keys import search_key
+
+try:  # NumPy is optional; scoring falls back to pure Python without it
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@dataclass(frozen=True)
+class TitleSource:
+    """
+    Columns loaded into the indexes of one entity.
+
+    Attributes:
+        pk: Primary key column
+        titles: Title columns; the first non-empty one is the display title
+        rank: Popularity expression ordering suggestions (higher first)
+        lastmod: Modification time column used for incremental refreshes
+            (None: the entity is reloaded in full)
+    """
+
+    pk: Any
+    titles: tuple[Any, ...]
+    rank: Any = None
+    lastmod: Any = None
+
+
+def _downloads_of(model: Any) -> Any:
+    """Total downloads of ``model`` rows attached to each game."""
+    return (
+        select(func.coalesce(func.sum(model.downloads), 0))
+        .where(model.gamekey == Game.gamekey)
+        .scalar_subquery()
+    )
+
+
+# Games have no downloads of their own; rank them by their hacks and translations
+INDEX_SOURCES: Mapping[str, TitleSource] = {
+    "games": TitleSource(
+        Game.gamekey,
+        (Game.gametitle, Game.japtitle),
+        _downloads_of(Hack) + _downloads_of(Translation),
+    ),
+    "hacks": TitleSource(Hack.hackkey, (Hack.hacktitle,), Hack.downloads, Hack.lastmod),
+    "utilities": TitleSource(
+        Utility.utilkey, (Utility.title,), Utility.downloads, Utility.lastmod
+    ),
+    "documents": TitleSource(
+        Document.dockey, (Document.title,), Document.downloads, Document.lastmod
+    ),
+    "homebrew": TitleSource(
+        Homebrew.homebrewkey, (Homebrew.title,), Homebrew.downloads, Homebrew.lastmod
+    ),
+}
+
+# Largest number of suggestions a prefix lookup returns
+SUGGEST_MAX_LIMIT = 20
+
+# Prefixes up to this length match too many keys to rank per request;
+# their top suggestions are computed when the index is built
+_PRECOMPUTED_PREFIX_LENGTH = 3
+
+# Sorts after every character, so ``prefix + _MAX_CHAR`` bounds a prefix range
+_MAX_CHAR = "\U0010ffff"
+
+# Joins the titles of one document; never part of a query, so no trigram spans it
+_TITLE_SEPARATOR = "\x00"
+
+# Vocabulary words sharing the most trigrams with a query word that are
+# checked by edit distance
+_FUZZY_CANDIDATE_WORDS = 50
+
+
+def trigrams(text: str) -> set[str]:
+    """All distinct 3-character substrings of ``text``."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _intersect(sorted_a: array, sorted_b: array) -> array:
+    """Intersect two ascending integer arrays, probing the larger by bisection."""
+    if len(sorted_a) > len(sorted_b):
+        sorted_a, sorted_b = sorted_b, sorted_a
+    result = array("i")
+    lo, size = 0, len(sorted_b)
+    for value in sorted_a:
+        lo = bisect_left(sorted_b, value, lo)
+        if lo == size:
+            break
+        if sorted_b[lo] == value:
+            result.append(value)
+    return result
+
+
+class TrigramIndex:
+    """
+    Immutable trigram inverted index over the titles of one entity.
+
+    Documents are numbered by ordinal; each posting list is an ascending
+    ``array('i')`` of ordinals, and ``pks`` maps ordinals back to primary keys.
+    Titles are indexed by their search keys (see ``search_key``) and
+    candidates from the posting lists are verified against those keys, so
+    results are exact substring matches of the normalized query.
+    """
+
+    def __init__(self, docs: Iterable[tuple[int, Iterable[Optional[str]]]]) -> None:
+        pks = array("i")
+        texts: list[str] = []
+        postings: dict[str, array] = {}
+        for ordinal, (pk, titles) in enumerate(docs):
+            text = _TITLE_SEPARATOR.join(search_key(t) for t in titles if t)
+            pks.append(pk)
+            texts.append(text)
+            for gram in trigrams(text):
+                posting = postings.get(gram)
+                if posting is None:
+                    posting = postings[gram] = array("i")
+                posting.append(ordinal)
+
+        self.pks = pks
+        self._texts = tuple(texts)
+        self._postings = MappingProxyType(postings)
+
+    def __len__(self) -> int:
+        return len(self.pks)
+
+    def search(self, q: str) -> Optional[list[int]]:
+        """
+        Primary keys of all documents whose search keys contain ``q``'s.
+
+        Returns None for queries shorter than a trigram: they have no
+        posting list to narrow the candidates, and scanning every title in
+        Python is slower than letting the database match them.
+        """
+        needle = search_key(q)
+        grams = trigrams(needle)
+        if not grams:
+            return None
+        lists = sorted((self._postings.get(g, array("i")) for g in grams), key=len)
+        candidates = lists[0]
+        for posting in lists[1:]:
+            if not candidates:
+                break
+            candidates = _intersect(candidates, posting)
+        return [self.pks[i] for i in candidates if needle in self._texts[i]]
+
+
+class PrefixIndex:
+    """
+    Immutable sorted array of title search keys for autocomplete.
+
+    Every title contributes one key per word (the title from that word on),
+    so "mario" suggests "Super Mario World". Lookups bisect the sorted keys
+    for the prefix range and return the most popular documents in it; the
+    answers for short prefixes are precomputed.
+    """
+
+    def __init__(self, docs: Iterable[tuple[int, int, Iterable[Optional[str]]]]) -> None:
+        pks = array("i")
+        ranks = array("q")
+        titles: list[str] = []
+        entries: list[tuple[str, int]] = []
+        for ordinal, (pk, rank, doc_titles) in enumerate(docs):
+            doc_titles = [t for t in doc_titles if t]
+            pks.append(pk)
+            ranks.append(int(rank or 0))
+            titles.append(doc_titles[0] if doc_titles else "")
+            keys: set[str] = set()
+            for title in doc_titles:
+                words = search_key(title).split(" ")
+                keys.update(" ".join(words[i:]) for i in range(len(words)))
+            entries.extend((key, ordinal) for key in keys if key)
+        entries.sort()
+
+        self.pks = pks
+        self.ranks = ranks
+        self.titles = tuple(titles)
+        self._keys = [key for key, _ in entries]
+        self._ordinals = array("i", (ordinal for _, ordinal in entries))
+
+        # Position of each document in (most downloads, title) order
+        by_rank = sorted(range(len(pks)), key=lambda o: (-ranks[o], titles[o].casefold()))
+        self._position = array("i", bytes(4 * len(pks)))
+        for position, ordinal in enumerate(by_rank):
+            self._position[ordinal] = position
+
+        top: dict[str, tuple[int, ...]] = {}
+        for length in range(1, _PRECOMPUTED_PREFIX_LENGTH + 1):
+            for prefix in {key[:length] for key in self._keys if len(key) >= length}:
+                top[prefix] = tuple(self._best(prefix, SUGGEST_MAX_LIMIT))
+        self._top = MappingProxyType(top)
+
+    def __len__(self) -> int:
+        return len(self.pks)
+
+    def _best(self, prefix: str, limit: int) -> list[int]:
+        """Most popular document ordinals having a key that starts with ``prefix``."""
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + _MAX_CHAR, lo)
+        candidates = set(self._ordinals[lo:hi])
+        return heapq.nsmallest(limit, candidates, key=self._position.__getitem__)
+
+    def suggest(
+        self, prefix: str, limit: int, exclude: Collection[int] = ()
+    ) -> list[int]:
+        """
+        Ordinals of the most downloaded documents matching ``prefix``.
+
+        Args:
+            prefix: Text typed so far
+            limit: Maximum results (at most ``SUGGEST_MAX_LIMIT``)
+            exclude: Primary keys to leave out
+
+        Returns:
+            Document ordinals, most popular first
+        """
+        folded = search_key(prefix)
+        if not folded:
+            return []
+        if len(folded) <= _PRECOMPUTED_PREFIX_LENGTH:
+            top = self._top.get(folded, ())
+            kept = [o for o in top if self.pks[o] not in exclude]
+            # A full precomputed list may have lost entries that rank next
+            if len(kept) >= limit or len(top) < SUGGEST_MAX_LIMIT:
+                return kept[:limit]
+        best = self._best(folded, limit + len(exclude))
+        return [o for o in best if self.pks[o] not in exclude][:limit]
+
+
+def word_trigrams(word: str) -> set[str]:
+    """Distinct trigrams of one word, padded as in ``pg_trgm`` (two spaces before, one after)."""
+    return trigrams(f"  {word} ")
+
+
+def max_edits(word: str) -> int:
+    """Typos tolerated in a query word: none up to 2 characters, 1 up to 5, else 2."""
+    return 0 if len(word) <= 2 else 1 if len(word) <= 5 else 2
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent transpositions).
+
+    Returns ``limit + 1`` as soon as the distance is known to exceed ``limit``.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before: list[int] = []
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            cost = 0 if ca == cb else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                value = min(value, before[j - 2] + 1)
+            current.append(value)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+class FuzzyIndex:
+    """
+    Immutable word-level index for typo-tolerant title search.
+
+    Titles are split into words and every distinct word is indexed once by
+    its padded trigrams. A query word is matched against the vocabulary
+    words sharing the most trigrams with it, verified by edit distance
+    (so "metriod" finds "metroid" and "zleda" finds "zelda"), and a title
+    scores the average best word similarity over the query words. Titles
+    with extra words rank slightly lower, so closer titles come first.
+    Per-title scores are accumulated with vectorized NumPy arrays when
+    NumPy is installed.
+    """
+
+    def __init__(self, docs: Iterable[tuple[int, Iterable[Optional[str]]]]) -> None:
+        pks = array("i")
+        sizes = array("i")
+        vocabulary: dict[str, int] = {}
+        word_docs: list[array] = []
+        for ordinal, (pk, titles) in enumerate(docs):
+            words = set(search_key(" ".join(t for t in titles if t)).split())
+            pks.append(pk)
+            sizes.append(len(words))
+            for word in words:
+                word_id = vocabulary.setdefault(word, len(vocabulary))
+                if word_id == len(word_docs):
+                    word_docs.append(array("i"))
+                word_docs[word_id].append(ordinal)
+
+        grams: dict[str, array] = {}
+        for word, word_id in vocabulary.items():
+            for gram in word_trigrams(word):
+                posting = grams.get(gram)
+                if posting is None:
+                    posting = grams[gram] = array("i")
+                posting.append(word_id)
+
+        self.pks = pks
+        self._sizes = sizes
+        self._vocabulary = MappingProxyType(vocabulary)
+        self._words = tuple(vocabulary)
+        self._word_docs = tuple(word_docs)
+        self._grams = MappingProxyType(grams)
+        if numpy is not None:
+            self._np_sizes = numpy.frombuffer(sizes, dtype=numpy.int32)
+
+    def __len__(self) -> int:
+        return len(self.pks)
+
+    def similar_words(self, word: str) -> list[tuple[int, float]]:
+        """
+        Vocabulary words within the typo allowance of ``word``.
+
+        Returns:
+            ``(word id, similarity)`` pairs; similarity is
+            ``1 - distance / longest length``, 1.0 for the word itself
+        """
+        limit = max_edits(word)
+        exact = self._vocabulary.get(word)
+        if limit == 0:
+            return [] if exact is None else [(exact, 1.0)]
+
+        # Rank vocabulary words by shared trigrams; only the best are verified
+        shared: Counter = Counter()
+        for gram in word_trigrams(word):
+            posting = self._grams.get(gram)
+            if posting is not None:
+                shared.update(posting)
+        matches = []
+        for word_id, _ in shared.most_common(_FUZZY_CANDIDATE_WORDS):
+            candidate = self._words[word_id]
+            distance = edit_distance(word, candidate, limit)
+            if distance <= limit:
+                matches.append((word_id, 1 - distance / max(len(word), len(candidate))))
+        return matches
+
+    def search(self, q: str, min_similarity: float, limit: int) -> list[tuple[int, float]]:
+        """
+        Documents most similar to ``q``.
+
+        Args:
+            q: Search string, possibly misspelled
+            min_similarity: Minimum average word similarity of a result
+            limit: Maximum number of results
+
+        Returns:
+            ``(primary key, score)`` pairs, best first; scores are in (0, 1]
+        """
+        query_words = list(dict.fromkeys(search_key(q).split()))
+        if not query_words:
+            return []
+        matches = [self.similar_words(word) for word in query_words]
+        if not any(matches):
+            return []
+        if numpy is not None:
+            scored = self._score_numpy(matches, min_similarity)
+        else:
+            scored = self._score_python(matches, min_similarity)
+        best = heapq.nsmallest(limit, scored, key=lambda item: (-item[1], item[0]))
+        return [(self.pks[ordinal], round(score, 4)) for ordinal, score in best]
+
+    def _score_numpy(
+        self, matches: list[list[tuple[int, float]]], min_similarity: float
+    ) -> list[tuple[int, float]]:
+        """Vectorized per-document scores."""
+        total = numpy.zeros(len(self.pks), dtype=numpy.float64)
+        for word_matches in matches:
+            best = numpy.zeros(len(self.pks), dtype=numpy.float64)
+            # Ascending similarity, so a document keeps its best matching word
+            for word_id, similarity in sorted(word_matches, key=lambda m: m[1]):
+                best[numpy.frombuffer(self._word_docs[word_id], dtype=numpy.int32)] = similarity
+            total += best
+        coverage = total / len(matches)
+        ordinals = numpy.flatnonzero(coverage >= min_similarity)
+        scores = _fuzzy_score(coverage[ordinals], len(matches), self._np_sizes[ordinals])
+        return list(zip(ordinals.tolist(), scores.tolist()))
+
+    def _score_python(
+        self, matches: list[list[tuple[int, float]]], min_similarity: float
+    ) -> list[tuple[int, float]]:
+        """Per-document scores without NumPy."""
+        total: Counter = Counter()
+        for word_matches in matches:
+            best: dict[int, float] = {}
+            for word_id, similarity in sorted(word_matches, key=lambda m: m[1]):
+                best.update(dict.fromkeys(self._word_docs[word_id], similarity))
+            total.update(best)
+        sizes = self._sizes
+        scored = []
+        for ordinal, value in total.items():
+            coverage = value / len(matches)
+            if coverage >= min_similarity:
+                scored.append((ordinal, _fuzzy_score(coverage, len(matches), sizes[ordinal])))
+        return scored
+
+
+def _fuzzy_score(coverage: Any, query_words: int, title_words: Any) -> Any:
+    """
+    Final fuzzy score from word coverage (works on scalars and NumPy arrays).
+
+    Up to 10% is taken off for title words the query does not mention.
+    """
+    if numpy is not None and isinstance(title_words, numpy.ndarray):
+        extra = numpy.maximum(title_words, query_words)
+    else:
+        extra = max(title_words, query_words)
+    return coverage * (0.9 + 0.1 * query_words / extra)
+
+
+@dataclass(frozen=True)
+class TitleIndexes:
+    """Trigram, prefix and fuzzy index over the same rows."""
+
+    trigram: TrigramIndex
+    prefix: PrefixIndex
+    fuzzy: FuzzyIndex
+
+
+def _build_indexes(rows: Sequence[Sequence[Any]]) -> TitleIndexes:
+    """Build all title indexes of one entity from ``rows_query`` rows."""
+    docs = [(row[0], row[1], tuple(row[2:])) for row in rows]
+    titles = [(pk, doc_titles) for pk, _, doc_titles in docs]
+    return TitleIndexes(TrigramIndex(titles), PrefixIndex(docs), FuzzyIndex(titles))
+
+
+class TitleIndexService:
+    """
+    Holds one trigram, prefix and fuzzy index per searchable entity.
+
+    Indexes are loaded at startup by the index refresh job (see
+    ``index_refresh``); rows changed later go into a small delta layer (see
+    ``LayeredIndex``) that is replaced atomically, one entity at a time.
+    Until an entity is loaded (or if building failed) its searches return
+    None and callers fall back to database matching.
+    """
+
+    sources = INDEX_SOURCES
+
+    def __init__(self) -> None:
+        self._layers: Mapping[str, LayeredIndex[TitleIndexes]] = MappingProxyType({})
+
+    @staticmethod
+    def rows_query(name: str) -> Select:
+        """Rows an entity's indexes are built from: ``(pk, rank, *titles)``."""
+        source = INDEX_SOURCES[name]
+        rank = source.rank if source.rank is not None else literal(0)
+        return select(source.pk, rank, *source.titles)
+
+    @staticmethod
+    def watch_query(name: str) -> Select:
+        """Columns whose changes are detected for entities without ``lastmod``."""
+        source = INDEX_SOURCES[name]
+        return select(source.pk, *source.titles)
+
+    async def load(self, name: str, rows: Sequence[Sequence[Any]]) -> None:
+        """Build the indexes of one entity from ``rows_query`` rows and swap them in."""
+        # Building is CPU-bound; keep the event loop responsive
+        layers = await asyncio.to_thread(LayeredIndex.build, _build_indexes, rows)
+        self._layers = MappingProxyType({**self._layers, name: layers})
+
+    async def update(
+        self, name: str, rows: Sequence[Sequence[Any]], removed: Iterable[int]
+    ) -> None:
+        """Apply inserted, updated (``rows_query`` rows) and deleted rows of a loaded entity."""
+        layers = await asyncio.to_thread(self._layers[name].changed, _build_indexes, rows, removed)
+        self._layers = MappingProxyType({**self._layers, name: layers})
+
+    def pending(self, name: str) -> int:
+        """Rows of an entity changed since its last full load."""
+        layers = self._layers.get(name)
+        return 0 if layers is None else layers.pending
+
+    def search(self, name: str, q: str) -> Optional[list[int]]:
+        """
+        Primary keys whose titles contain ``q``.
+
+        Returns:
+            Matching keys, or None if the index is not built, ``q`` is
+            shorter than a trigram, or the match is too broad to pass as an
+            ``IN`` list (``title_index_max_candidates``)
+        """
+        layers = self._layers.get(name)
+        if layers is None:
+            return None
+        base = layers.base.trigram.search(q)
+        if base is None:
+            return None
+        masked = layers.masked
+        pks = [pk for pk in base if pk not in masked]
+        pks += layers.delta.trigram.search(q) or []
+        if len(pks) > settings.title_index_max_candidates:
+            return None
+        return pks
+
+    def suggest(self, name: str, prefix: str, limit: int) -> Optional[list[tuple[int, str, int]]]:
+        """
+        Most downloaded titles of one entity starting with ``prefix``.
+
+        Returns:
+            ``(primary key, title, downloads)`` tuples, most popular first,
+            or None if the index is not built
+        """
+        layers = self._layers.get(name)
+        if layers is None:
+            return None
+        found = []
+        for index, exclude in ((layers.base.prefix, layers.masked), (layers.delta.prefix, ())):
+            found += [
+                (index.pks[o], index.titles[o], index.ranks[o])
+                for o in index.suggest(prefix, limit, exclude)
+            ]
+        found.sort(key=lambda item: (-item[2], item[1].casefold()))
+        return found[:limit]
+
+    def fuzzy(self, name: str, q: str) -> Optional[list[tuple[int, float]]]:
+        """
+        Titles of one entity similar to ``q``, tolerating typos.
+
+        Returns:
+            Up to ``fuzzy_max_results`` ``(primary key, score)`` pairs, best
+            first, or None if the index is not built
+        """
+        layers = self._layers.get(name)
+        if layers is None:
+            return None
+        limit = settings.fuzzy_max_results
+        masked = layers.masked
+        found = [
+            (pk, score)
+            for pk, score in layers.base.fuzzy.search(
+                q, settings.fuzzy_min_similarity, limit + len(masked)
+            )
+            if pk not in masked
+        ]
+        found += layers.delta.fuzzy.search(q, settings.fuzzy_min_similarity, limit)
+        found.sort(key=lambda item: (-item[1], item[0]))
+        return found[:limit]
+
+
+# Singleton instance
+title_index = TitleIndexService()
@@ -3,26 +3,72 @@ Translation service for translation-related operations.
 Handles fetching, filtering, and searching translations.
 """
 
-from typing import Optional
+from typing import Any, Optional
 
 from fastapi import HTTPException
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import (
-    Console,
-    Game,
-    Language,
-    PatchHints,
-    PatchStatus,
-    TransImage,
-    Translation,
+from app.models import Game, TransImage, Translation
+from app.schemas import TransImageResponse, TranslationDetail, TranslationListItem
+from app.services.counting import (
+    Facet,
+    FilterTerm,
+    active_terms,
+    count_strategy,
+    facet_values,
+    page_payload,
+    parse_facets,
+    with_total,
+)
+from app.services.fields import FieldSet, ItemField
+from app.services.lookup import lookup_by_ids
+from app.services.metadata_service import metadata_service
+from app.services.pagination import paginate, resolve_sort_column, split_page
+from app.services.search_engine import RELEVANCE, SearchTarget, normalize_query, search_engine
+
+
+# Searches the game titles: trigram index over games, else LIKE on the joined titles
+TRANSLATION_SEARCH = SearchTarget(
+    "games", (Game.gametitle, Game.japtitle), Translation.gamekey, fulltext=False
+)
+
+# Description search: BM25 index over the title and description
+TRANSLATION_TEXT_SEARCH = SearchTarget(
+    "translations", (Game.gametitle, Translation.description), Translation.transkey, fulltext=False
 )
-from app.schemas import (
-    PaginatedResponse,
-    TransImageResponse,
+
+# Facets: filter parameter -> column and lookup naming its values
+TRANSLATION_FACETS = {
+    "console": Facet(Translation.consolekey, "consoles"),
+    "language": Facet(Translation.language, "languages"),
+    "status": Facet(Translation.patchstatus, "patch_statuses"),
+}
+
+# Response fields that are not plain translation columns
+_GAME_JOIN = (Game, Translation.gamekey == Game.gamekey)
+_TRANSLATION_SOURCES = {
+    "version": Translation.patchver,
+    "game_title": ItemField(Game.gametitle, join=_GAME_JOIN),
+    "console_name": ItemField(Translation.consolekey, lookup="consoles"),
+    "language_name": ItemField(Translation.language, lookup="languages"),
+    "status_name": ItemField(Translation.patchstatus, lookup="patch_statuses"),
+    "releasedate": Translation.patchrel,
+}
+TRANSLATION_LIST_FIELDS = FieldSet(Translation, TranslationListItem, **_TRANSLATION_SOURCES)
+TRANSLATION_DETAIL_FIELDS = FieldSet(
+    Translation,
     TranslationDetail,
-    TranslationListItem,
+    **_TRANSLATION_SOURCES,
+    filename=Translation.patchfile,
+    filesize=ItemField(),
+    patchtype=ItemField(),
+    hintskey=Translation.patchhint,
+    patch_hint=ItemField(Translation.patchhint, lookup="patch_hints"),
+    image_count=select(func.count())
+    .select_from(TransImage)
+    .where(TransImage.transkey == Translation.transkey)
+    .scalar_subquery(),
 )
 
 
@@ -42,155 +88,155 @@ class TranslationService:
         page_size: int = 50,
         sort_by: str = "created",
         sort_order: str = "desc",
-    ) -> PaginatedResponse[TranslationListItem]:
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        count_mode: str = "exact",
+        q_scope: str = "title",
+        facets: Optional[str] = None,
+        fields: Optional[str] = None,
+    ) -> dict[str, Any]:
         """
         Get paginated list of translations with filters.
         
         Args:
             session: Database session
-            q: Search query for game title
+            q: Search query for the English or Japanese game title
             game: Filter by game ID
             console: Filter by console ID
             language: Filter by language ID
             status: Filter by patch status ID
             page: Page number (1-indexed)
             page_size: Items per page
-            sort_by: Field to sort by
+            sort_by: Field to sort by, or "relevance" when searching descriptions
             sort_order: Sort direction (asc/desc)
+            cursor: Keyset cursor from a previous page (overrides page)
+            include_total: Whether to compute the total item count
+            count_mode: How to compute the total ("exact" or "estimate")
+            q_scope: Match ``q`` against the "title" or the "description"
+                (title plus description, ranked by BM25)
+            facets: Comma-separated facets to count per value (console, language, status)
+            fields: Comma-separated item fields to select and return (default: all)
         
         Returns:
-            Paginated response with translation list items
+            Page payload shaped like ``PaginatedResponse[TranslationListItem]``
         """
-        # Build base query with joins for resolved names
-        query = (
-            select(
-                Translation,
-                Game.gametitle.label("game_title"),
-                Console.description.label("console_name"),
-                Language.name.label("language_name"),
-                PatchStatus.description.label("status_name"),
-            )
-            .outerjoin(Game, Translation.gamekey == Game.gamekey)
-            .outerjoin(Console, Translation.consolekey == Console.consoleid)
-            .outerjoin(Language, Translation.language == Language.id)
-            .outerjoin(PatchStatus, Translation.patchstatus == PatchStatus.id)
-        )
-
-        # Apply filters
-        if q:
-            query = query.where(Game.gametitle.ilike(f"%{q}%"))
-        if game:
-            query = query.where(Translation.gamekey == game)
-        if console:
-            query = query.where(Translation.consolekey == console)
-        if language:
-            query = query.where(Translation.language == language)
-        if status:
-            query = query.where(Translation.patchstatus == status)
+        facet_names = parse_facets(facets, TRANSLATION_FACETS)
 
-        # Get total count
-        count_query = (
-            select(func.count())
-            .select_from(Translation)
-            .outerjoin(Game, Translation.gamekey == Game.gamekey)
+        # Collect filters; the page query is built once its columns are known
+        terms = active_terms(
+            FilterTerm(Translation.gamekey, game),
+            FilterTerm(Translation.consolekey, console),
+            FilterTerm(Translation.language, language),
+            FilterTerm(Translation.patchstatus, status),
         )
+        count_query = select(func.count()).select_from(Translation)
+        search: tuple[str, ...] = ()
+        relevance = None
+        clauses = []
+        q = normalize_query(q)
+        if q and q_scope == "description":
+            # BM25 matches are only meaningful best-first
+            sort_by = RELEVANCE
         if q:
-            count_query = count_query.where(Game.gametitle.ilike(f"%{q}%"))
-        if game:
-            count_query = count_query.where(Translation.gamekey == game)
-        if console:
-            count_query = count_query.where(Translation.consolekey == console)
-        if language:
-            count_query = count_query.where(Translation.language == language)
-        if status:
-            count_query = count_query.where(Translation.patchstatus == status)
-
-        total_result = await session.execute(count_query)
-        total = total_result.scalar() or 0
-
-        # Apply sorting
-        sort_column = getattr(Translation, sort_by, Translation.created)
-        if sort_order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
+            plan = (
+                search_engine.plan_description(TRANSLATION_TEXT_SEARCH, q)
+                if q_scope == "description"
+                else search_engine.plan(TRANSLATION_SEARCH, q)
+            )
+            clauses.append(plan.clause)
+            count_query = count_query.outerjoin(
+                Game, Translation.gamekey == Game.gamekey
+            ).where(plan.clause)
+            search, relevance = plan.key, plan.relevance
+        facet_query = count_query
+        for term in terms:
+            clauses.append(term.clause)
+            count_query = count_query.where(term.clause)
 
-        # Apply pagination
-        offset = (page - 1) * page_size
-        query = query.offset(offset).limit(page_size)
+        # Apply sorting and pagination (offset, or keyset when a cursor is given);
+        # relevance always ranks best matches first and is offset-paginated
+        sort_key, sort_column = resolve_sort_column(
+            Translation, sort_by, "created", {RELEVANCE: relevance}
+        )
+        descending = sort_key == RELEVANCE or sort_order.lower() == "desc"
 
-        # Execute query
-        result = await session.execute(query)
-        rows = result.all()
+        # Select only the requested fields, plus the sort and primary key the
+        # next cursor is built from; lookup names come from the in-memory snapshot
+        projection = TRANSLATION_LIST_FIELDS.project(
+            fields,
+            () if sort_key == RELEVANCE else (sort_column, Translation.transkey),
+            joins=(_GAME_JOIN,) if q else (),
+        )
+        query = paginate(
+            projection.query.where(*clauses),
+            sort_column,
+            Translation.transkey,
+            sort_key=sort_key,
+            descending=descending,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+        )
 
-        # Build response items
-        items = []
-        for row in rows:
-            trans = row[0]
-            items.append(
-                TranslationListItem(
-                    transkey=trans.transkey,
-                    version=trans.patchver,
-                    description=trans.description,
-                    gamekey=trans.gamekey,
-                    consolekey=trans.consolekey,
-                    language=trans.language,
-                    patchstatus=trans.patchstatus,
-                    game_title=row[1],
-                    console_name=row[2],
-                    language_name=row[3],
-                    status_name=row[4],
-                    downloads=trans.downloads,
-                    releasedate=trans.patchrel,
-                    created=trans.created,
-                    lastmod=trans.lastmod,
-                )
+        # Run the count (cached, estimated or skipped per the count strategy),
+        # the page query and any facet counts concurrently on separate connections
+        count, result, facet_counts = await with_total(
+            count_strategy.count(
+                Translation,
+                count_query,
+                terms=terms,
+                search=search,
+                include_total=include_total,
+                mode=count_mode,
+            ),
+            session.execute(query),
+            count_strategy.facets(
+                Translation, facet_query, TRANSLATION_FACETS, facet_names, terms=terms, search=search
             )
+            if facet_names
+            else None,
+        )
+        rows, next_cursor = split_page(
+            result.all(),
+            page_size,
+            sort_key=sort_key,
+            descending=descending,
+            key=None if sort_key == RELEVANCE else projection.key,
+        )
 
-        total_pages = (total + page_size - 1) // page_size
+        # Build response items
+        lookups = await metadata_service.get_lookups()
+        items = [projection.item(row, lookups) for row in rows]
 
-        return PaginatedResponse[TranslationListItem](
-            items=items,
-            total=total,
+        return page_payload(
+            items,
+            count,
             page=page,
             page_size=page_size,
-            total_pages=total_pages,
+            next_cursor=next_cursor,
+            facets=facet_values(facet_counts, TRANSLATION_FACETS, lookups),
         )
 
     async def get_translation(
-        self, session: AsyncSession, transkey: int
-    ) -> TranslationDetail:
+        self, session: AsyncSession, transkey: int, *, fields: Optional[str] = None
+    ) -> dict[str, Any]:
         """
         Get a single translation by ID with full details.
         
         Args:
             session: Database session
             transkey: Translation primary key
+            fields: Comma-separated fields to select and return (default: all)
         
         Returns:
-            Detailed translation information
+            Translation shaped like ``TranslationDetail``, narrowed to ``fields``
         
         Raises:
-            HTTPException: If translation not found
+            HTTPException: If translation not found or an unknown field is requested
         """
-        query = (
-            select(
-                Translation,
-                Game.gametitle.label("game_title"),
-                Console.description.label("console_name"),
-                Language.name.label("language_name"),
-                PatchStatus.description.label("status_name"),
-                PatchHints.description.label("patch_hint"),
-            )
-            .outerjoin(Game, Translation.gamekey == Game.gamekey)
-            .outerjoin(Console, Translation.consolekey == Console.consoleid)
-            .outerjoin(Language, Translation.language == Language.id)
-            .outerjoin(PatchStatus, Translation.patchstatus == PatchStatus.id)
-            .outerjoin(PatchHints, Translation.patchhint == PatchHints.id)
-            .where(Translation.transkey == transkey)
-        )
-
-        result = await session.execute(query)
+        # The screenshot count is a subquery, selected only when requested
+        projection = TRANSLATION_DETAIL_FIELDS.project(fields, (Translation.transkey,))
+        result = await session.execute(projection.query.where(Translation.transkey == transkey))
         row = result.first()
 
         if not row:
@@ -198,41 +244,28 @@ class TranslationService:
                 status_code=404, detail=f"Translation with ID {transkey} not found"
             )
 
-        trans = row[0]
+        lookups = await metadata_service.get_lookups()
+        return projection.item(row, lookups)
 
-        # Get image count
-        image_count_result = await session.execute(
-            select(func.count())
-            .select_from(TransImage)
-            .where(TransImage.transkey == transkey)
-        )
-        image_count = image_count_result.scalar() or 0
-
-        return TranslationDetail(
-            transkey=trans.transkey,
-            version=trans.patchver,
-            description=trans.description,
-            gamekey=trans.gamekey,
-            consolekey=trans.consolekey,
-            language=trans.language,
-            groupkey=trans.groupkey,
-            patchstatus=trans.patchstatus,
-            game_title=row[1],
-            console_name=row[2],
-            language_name=row[3],
-            status_name=row[4],
-            patch_hint=row[5],
-            filename=trans.patchfile,
-            filesize=None,
-            downloads=trans.downloads,
-            releasedate=trans.patchrel,
-            patchtype=None,
-            hintskey=trans.patchhint,
-            nofile=trans.nofile,
-            noreadme=trans.noreadme,
-            created=trans.created,
-            lastmod=trans.lastmod,
-            image_count=image_count,
+    async def get_translations_by_ids(
+        self, session: AsyncSession, ids: str, *, fields: Optional[str] = None
+    ) -> dict[str, Any]:
+        """
+        Get translation details for a list of IDs with a single query.
+        
+        Args:
+            session: Database session
+            ids: Comma-separated translation IDs
+            fields: Comma-separated fields to select and return (default: all)
+        
+        Returns:
+            Payload shaped like ``BatchResponse[TranslationDetail]``, in requested order
+        
+        Raises:
+            HTTPException: If the IDs are invalid or an unknown field is requested
+        """
+        return await lookup_by_ids(
+            session, TRANSLATION_DETAIL_FIELDS, Translation.transkey, ids, fields
         )
 
     async def get_translation_images(
@@ -279,7 +312,10 @@ class TranslationService:
         *,
         page: int = 1,
         page_size: int = 50,
-    ) -> PaginatedResponse[TranslationListItem]:
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        fields: Optional[str] = None,
+    ) -> dict[str, Any]:
         """
         Get all translations for a specific game.
         
@@ -288,15 +324,21 @@ class TranslationService:
             gamekey: Game primary key
             page: Page number
             page_size: Items per page
+            cursor: Keyset cursor from a previous page (overrides page)
+            include_total: Whether to compute the total item count
+            fields: Comma-separated item fields to select and return (default: all)
         
         Returns:
-            Paginated response with translation list items
+            Page payload shaped like ``PaginatedResponse[TranslationListItem]``
         """
         return await self.get_translations(
             session,
             game=gamekey,
             page=page,
             page_size=page_size,
+            cursor=cursor,
+            include_total=include_total,
+            fields=fields,
         )
 
 
@@ -3,15 +3,56 @@ Utility service for utility-related operations.
 Handles fetching, filtering, and searching utilities.
 """
 
-from typing import Optional
+from typing import Any, Optional
 
 from fastapi import HTTPException
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Console, Game, OS, UtilCat, Utility
-from app.schemas.common import PaginatedResponse
+from app.models import Game, Utility
 from app.schemas.utilities import UtilityDetail, UtilityListItem
+from app.services.counting import (
+    Facet,
+    FilterTerm,
+    active_terms,
+    count_strategy,
+    facet_values,
+    page_payload,
+    parse_facets,
+    with_total,
+)
+from app.services.fields import FieldSet, ItemField
+from app.services.lookup import lookup_by_ids
+from app.services.metadata_service import metadata_service
+from app.services.pagination import paginate, resolve_sort_column, split_page
+from app.services.search_engine import RELEVANCE, SearchTarget, normalize_query, search_engine
+
+
+# Title search: trigram index, then the FULLTEXT index on these columns
+UTILITY_SEARCH = SearchTarget("utilities", (Utility.title,), Utility.utilkey)
+
+# Description search: BM25 index over the title and description
+UTILITY_TEXT_SEARCH = SearchTarget(
+    "utilities", (Utility.title, Utility.description), Utility.utilkey, fulltext=False
+)
+
+# Facets: filter parameter -> column and lookup naming its values
+UTILITY_FACETS = {
+    "category": Facet(Utility.categorykey, "util_categories"),
+    "console": Facet(Utility.consolekey, "consoles"),
+    "os": Facet(Utility.os, "operating_systems"),
+}
+
+# Response fields that are not plain utility columns
+_GAME_JOIN = (Game, Utility.gamekey == Game.gamekey)
+_UTILITY_SOURCES = {
+    "category_name": ItemField(Utility.categorykey, lookup="util_categories"),
+    "console_name": ItemField(Utility.consolekey, lookup="consoles"),
+    "game_title": ItemField(Game.gametitle, join=_GAME_JOIN),
+    "os_name": ItemField(Utility.os, lookup="operating_systems"),
+}
+UTILITY_LIST_FIELDS = FieldSet(Utility, UtilityListItem, **_UTILITY_SOURCES)
+UTILITY_DETAIL_FIELDS = FieldSet(Utility, UtilityDetail, **_UTILITY_SOURCES)
 
 
 class UtilityService:
@@ -22,6 +63,7 @@ class UtilityService:
         session: AsyncSession,
         *,
         q: Optional[str] = None,
+        game: Optional[int] = None,
         category: Optional[int] = None,
         console: Optional[int] = None,
         os: Optional[int] = None,
@@ -29,143 +71,152 @@ class UtilityService:
         page_size: int = 50,
         sort_by: str = "title",
         sort_order: str = "asc",
-    ) -> PaginatedResponse[UtilityListItem]:
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        count_mode: str = "exact",
+        search_mode: str = "auto",
+        q_scope: str = "title",
+        facets: Optional[str] = None,
+        fields: Optional[str] = None,
+    ) -> dict[str, Any]:
         """
         Get paginated list of utilities with filters.
 
         Args:
             session: Database session
-            q: Search query for title
+            q: Search query for title (FULLTEXT, LIKE for short words)
+            game: Filter by game ID
             category: Filter by category ID
             console: Filter by console ID
             os: Filter by OS ID
             page: Page number (1-indexed)
             page_size: Items per page
-            sort_by: Field to sort by
+            sort_by: Field to sort by, or "relevance" when searching
             sort_order: Sort direction (asc/desc)
+            cursor: Keyset cursor from a previous page (overrides page)
+            include_total: Whether to compute the total item count
+            count_mode: How to compute the total ("exact" or "estimate")
+            search_mode: How ``q`` is matched ("auto", "substring", "natural" or "boolean")
+            q_scope: Match ``q`` against the "title" or the "description"
+                (title plus description, ranked by BM25)
+            facets: Comma-separated facets to count per value (category, console, os)
+            fields: Comma-separated item fields to select and return (default: all)
 
         Returns:
-            Paginated response with utility list items
+            Page payload shaped like ``PaginatedResponse[UtilityListItem]``
         """
-        # Build base query with joins for resolved names
-        query = (
-            select(
-                Utility,
-                UtilCat.catname.label("category_name"),
-                Console.description.label("console_name"),
-                Game.gametitle.label("game_title"),
-                OS.name.label("os_name"),
-            )
-            .outerjoin(UtilCat, Utility.categorykey == UtilCat.categorykey)
-            .outerjoin(Console, Utility.consolekey == Console.consoleid)
-            .outerjoin(Game, Utility.gamekey == Game.gamekey)
-            .outerjoin(OS, Utility.os == OS.oskey)
-        )
+        facet_names = parse_facets(facets, UTILITY_FACETS)
 
-        # Apply filters
-        if q:
-            query = query.where(Utility.title.ilike(f"%{q}%"))
-        if category:
-            query = query.where(Utility.categorykey == category)
-        if console:
-            query = query.where(Utility.consolekey == console)
-        if os:
-            query = query.where(Utility.os == os)
-
-        # Get total count
+        # Collect filters; the page query is built once its columns are known
+        terms = active_terms(
+            FilterTerm(Utility.gamekey, game),
+            FilterTerm(Utility.categorykey, category),
+            FilterTerm(Utility.consolekey, console),
+            FilterTerm(Utility.os, os),
+        )
         count_query = select(func.count()).select_from(Utility)
+        search: tuple[str, ...] = ()
+        relevance = None
+        clauses = []
+        q = normalize_query(q)
+        if q and q_scope == "description":
+            # BM25 matches are only meaningful best-first
+            sort_by = RELEVANCE
         if q:
-            count_query = count_query.where(Utility.title.ilike(f"%{q}%"))
-        if category:
-            count_query = count_query.where(Utility.categorykey == category)
-        if console:
-            count_query = count_query.where(Utility.consolekey == console)
-        if os:
-            count_query = count_query.where(Utility.os == os)
-
-        total_result = await session.execute(count_query)
-        total = total_result.scalar() or 0
-
-        # Apply sorting
-        sort_column = getattr(Utility, sort_by, Utility.title)
-        if sort_order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-
-        # Apply pagination
-        offset = (page - 1) * page_size
-        query = query.offset(offset).limit(page_size)
-
-        # Execute query
-        result = await session.execute(query)
-        rows = result.all()
+            plan = (
+                search_engine.plan_description(UTILITY_TEXT_SEARCH, q)
+                if q_scope == "description"
+                else search_engine.plan(UTILITY_SEARCH, q, search_mode, ranked=sort_by == RELEVANCE)
+            )
+            clauses.append(plan.clause)
+            count_query = count_query.where(plan.clause)
+            search, relevance = plan.key, plan.relevance
+        facet_query = count_query
+        for term in terms:
+            clauses.append(term.clause)
+            count_query = count_query.where(term.clause)
 
-        # Build response items
-        items = []
-        for row in rows:
-            util = row[0]
-            items.append(
-                UtilityListItem(
-                    utilkey=util.utilkey,
-                    title=util.title,
-                    version=util.version,
-                    description=util.description,
-                    categorykey=util.categorykey,
-                    consolekey=util.consolekey,
-                    gamekey=util.gamekey,
-                    os=util.os,
-                    category_name=row[1],
-                    console_name=row[2],
-                    game_title=row[3],
-                    os_name=row[4],
-                    downloads=util.downloads,
-                    reldate=util.reldate,
-                    created=util.created,
-                    lastmod=util.lastmod,
-                )
+        # Apply sorting and pagination (offset, or keyset when a cursor is given);
+        # relevance always ranks best matches first and is offset-paginated
+        sort_key, sort_column = resolve_sort_column(
+            Utility, sort_by, "title", {RELEVANCE: relevance}
+        )
+        descending = sort_key == RELEVANCE or sort_order.lower() == "desc"
+
+        # Select only the requested fields, plus the sort and primary key the
+        # next cursor is built from; lookup names come from the in-memory snapshot
+        projection = UTILITY_LIST_FIELDS.project(
+            fields, () if sort_key == RELEVANCE else (sort_column, Utility.utilkey)
+        )
+        query = paginate(
+            projection.query.where(*clauses),
+            sort_column,
+            Utility.utilkey,
+            sort_key=sort_key,
+            descending=descending,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+        )
+
+        # Run the count (cached, estimated or skipped per the count strategy),
+        # the page query and any facet counts concurrently on separate connections
+        count, result, facet_counts = await with_total(
+            count_strategy.count(
+                Utility,
+                count_query,
+                terms=terms,
+                search=search,
+                include_total=include_total,
+                mode=count_mode,
+            ),
+            session.execute(query),
+            count_strategy.facets(
+                Utility, facet_query, UTILITY_FACETS, facet_names, terms=terms, search=search
             )
+            if facet_names
+            else None,
+        )
+        rows, next_cursor = split_page(
+            result.all(),
+            page_size,
+            sort_key=sort_key,
+            descending=descending,
+            key=None if sort_key == RELEVANCE else projection.key,
+        )
 
-        total_pages = (total + page_size - 1) // page_size
+        # Build response items
+        lookups = await metadata_service.get_lookups()
+        items = [projection.item(row, lookups) for row in rows]
 
-        return PaginatedResponse[UtilityListItem](
-            items=items,
-            total=total,
+        return page_payload(
+            items,
+            count,
             page=page,
             page_size=page_size,
-            total_pages=total_pages,
+            next_cursor=next_cursor,
+            facets=facet_values(facet_counts, UTILITY_FACETS, lookups),
         )
 
-    async def get_utility(self, session: AsyncSession, utilkey: int) -> UtilityDetail:
+    async def get_utility(
+        self, session: AsyncSession, utilkey: int, *, fields: Optional[str] = None
+    ) -> dict[str, Any]:
         """
         Get a single utility by ID with full details.
-
+        
         Args:
             session: Database session
             utilkey: Utility primary key
-
+            fields: Comma-separated fields to select and return (default: all)
+        
         Returns:
-            Detailed utility information
-
+            Utility shaped like ``UtilityDetail``, narrowed to ``fields``
+        
         Raises:
-            HTTPException: If utility not found
+            HTTPException: If utility not found or an unknown field is requested
         """
-        query = (
-            select(
-                Utility,
-                UtilCat.catname.label("category_name"),
-                Console.description.label("console_name"),
-                Game.gametitle.label("game_title"),
-                OS.name.label("os_name"),
-            )
-            .outerjoin(UtilCat, Utility.categorykey == UtilCat.categorykey)
-            .outerjoin(Console, Utility.consolekey == Console.consoleid)
-            .outerjoin(Game, Utility.gamekey == Game.gamekey)
-            .outerjoin(OS, Utility.os == OS.oskey)
-            .where(Utility.utilkey == utilkey)
-        )
-
-        result = await session.execute(query)
+        projection = UTILITY_DETAIL_FIELDS.project(fields, (Utility.utilkey,))
+        result = await session.execute(projection.query.where(Utility.utilkey == utilkey))
         row = result.first()
 
         if not row:
@@ -173,30 +224,62 @@ class UtilityService:
                 status_code=404, detail=f"Utility with ID {utilkey} not found"
             )
 
-        util = row[0]
-
-        return UtilityDetail(
-            utilkey=util.utilkey,
-            title=util.title,
-            version=util.version,
-            description=util.description,
-            categorykey=util.categorykey,
-            consolekey=util.consolekey,
-            gamekey=util.gamekey,
-            authorkey=util.authorkey,
-            os=util.os,
-            license=util.license,
-            source=util.source,
-            category_name=row[1],
-            console_name=row[2],
-            game_title=row[3],
-            os_name=row[4],
-            filename=util.filename,
-            downloads=util.downloads,
-            reldate=util.reldate,
-            nofile=util.nofile,
-            created=util.created,
-            lastmod=util.lastmod,
+        lookups = await metadata_service.get_lookups()
+        return projection.item(row, lookups)
+
+    async def get_utilities_by_ids(
+        self, session: AsyncSession, ids: str, *, fields: Optional[str] = None
+    ) -> dict[str, Any]:
+        """
+        Get utility details for a list of IDs with a single query.
+        
+        Args:
+            session: Database session
+            ids: Comma-separated utility IDs
+            fields: Comma-separated fields to select and return (default: all)
+        
+        Returns:
+            Payload shaped like ``BatchResponse[UtilityDetail]``, in requested order
+        
+        Raises:
+            HTTPException: If the IDs are invalid or an unknown field is requested
+        """
+        return await lookup_by_ids(session, UTILITY_DETAIL_FIELDS, Utility.utilkey, ids, fields)
+
+    async def get_utilities_for_game(
+        self,
+        session: AsyncSession,
+        gamekey: int,
+        *,
+        page: int = 1,
+        page_size: int = 50,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        fields: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """
+        Get all utilities for a specific game.
+        
+        Args:
+            session: Database session
+            gamekey: Game primary key
+            page: Page number
+            page_size: Items per page
+            cursor: Keyset cursor from a previous page (overrides page)
+            include_total: Whether to compute the total item count
+            fields: Comma-separated item fields to select and return (default: all)
+        
+        Returns:
+            Page payload shaped like ``PaginatedResponse[UtilityListItem]``
+        """
+        return await self.get_utilities(
+            session,
+            game=gamekey,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            include_total=include_total,
+            fields=fields,
         )
 
 
@@ -4,9 +4,11 @@ RomHacking.net Archive Explorer - Backend Entry Point
 A high-performance API for browsing the RomHacking.net 2024 data archive.
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from collections.abc import AsyncGenerator
+from typing import Optional
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -14,8 +16,13 @@ from fastapi.responses import JSONResponse
 
 from app.core.config import settings
 from app.core.logging_config import setup_logging, get_logger
+from app.core.http_cache import CompressionMiddleware, ConditionalGetMiddleware
 from app.core.middleware import LoggingMiddleware
+from app.core.response_cache import ResponseCacheMiddleware, response_cache
 from app.api.v1 import router as v1_router
+from app.api.v1.cache import cached_routes
+from app.services import metadata_service
+from app.services.index_refresh import index_refresh
 
 # Initialize logging before anything else
 setup_logging()
@@ -28,9 +35,38 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Startup
     logger.info(f"🚀 Starting {settings.app_name} v{settings.app_version}")
     logger.info(f"📦 Database: {settings.database_name}@{settings.database_host}")
+
+    # Load lookup tables into memory; metadata routes and name lookups are served from there
+    try:
+        await metadata_service.reload()
+    except Exception:
+        logger.exception("Failed to load metadata store; it will be loaded on first use")
+
+    # Load the title and description indexes from the saved snapshot plus the
+    # rows changed since; searches fall back to MySQL until they exist
+    try:
+        await index_refresh.start()
+    except Exception:
+        logger.exception("Failed to load search indexes; searching via the database")
+
+    reload_task: Optional[asyncio.Task] = None
+    if settings.metadata_reload_interval_seconds > 0:
+        reload_task = asyncio.create_task(
+            metadata_service.auto_reload(settings.metadata_reload_interval_seconds)
+        )
+
+    refresh_task: Optional[asyncio.Task] = None
+    if settings.index_refresh_interval_seconds > 0:
+        refresh_task = asyncio.create_task(
+            index_refresh.auto_refresh(settings.index_refresh_interval_seconds)
+        )
+
     yield
     # Shutdown
     logger.info("👋 Shutting down...")
+    for task in (reload_task, refresh_task):
+        if task is not None:
+            task.cancel()
 
 
 app = FastAPI(
@@ -57,6 +93,21 @@ async def global_exception_handler(request: Request, exc: Exception) -> JSONResp
     )
 
 
+# Serve cached content responses (innermost, so hits are still logged)
+app.add_middleware(ResponseCacheMiddleware, routes=cached_routes(), cache=response_cache)
+
+# Validators and 304s for API GETs, including cache hits
+app.add_middleware(
+    ConditionalGetMiddleware,
+    path_prefix="/api/",
+    cache_control=settings.api_cache_control,
+    compression=settings.compression_enabled,
+)
+
+# Compress bodies not already served precompressed from the response cache
+if settings.compression_enabled:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_min_bytes)
+
 # Add logging middleware (must be added before CORS)
 app.add_middleware(LoggingMiddleware)
 
@@ -30,4 +30,12 @@ export type {
   TranslationImage,
   TranslationListItem,
   TranslationQueryParams,
+  // Search
+  GlobalSearchParams,
+  GlobalSearchResponse,
+  SearchSection,
+  FacetValue,
+  SuggestParams,
+  SuggestResponse,
+  Suggestion,
 } from "./types";
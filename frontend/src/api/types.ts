@@ -18,12 +18,31 @@ export interface HealthResponse {
 /**
  * Generic paginated response wrapper.
  */
+export interface FacetValue {
+  value: number;
+  name: string | null;
+  count: number;
+}
+
+/** Details looked up with `ids`, in requested order. */
+export interface BatchResponse<T> {
+  items: T[];
+  /** Requested IDs that do not exist. */
+  missing: number[];
+}
+
 export interface PaginatedResponse<T> {
   items: T[];
   total: number;
   page: number;
   page_size: number;
   total_pages: number;
+  /** Whether `total` is exact or estimated; null when requested with include_total=false. */
+  total_accuracy?: "exact" | "estimated" | null;
+  /** Keyset cursor for the next page (pass back as `cursor`); null on the last page. */
+  next_cursor?: string | null;
+  /** Per-value counts of the requested `facets`; each ignores its own filter. */
+  facets?: Record<string, FacetValue[]> | null;
 }
 
 /**
@@ -90,6 +109,7 @@ export interface OperatingSystem {
 }
 
 export interface AllMetadata {
+  version: number;
   consoles: Console[];
   genres: Genre[];
   languages: Language[];
@@ -126,8 +146,16 @@ export interface GameDetail extends GameListItem {
   translation_count: number;
   utility_count: number;
   document_count: number;
+  /** First pages of related content, present only when requested with `include`. */
+  hacks?: PaginatedResponse<HackListItem>;
+  translations?: PaginatedResponse<TranslationListItem>;
+  utilities?: PaginatedResponse<UtilityListItem>;
+  documents?: PaginatedResponse<DocumentListItem>;
 }
 
+/** Related sections a game detail can embed. */
+export type GameInclude = "hacks" | "translations" | "utilities" | "documents";
+
 export interface GameQueryParams {
   q?: string;
   platform?: number;
@@ -138,6 +166,10 @@ export interface GameQueryParams {
   page_size?: number;
   sort_by?: string;
   sort_order?: "asc" | "desc";
+  /** Comma-separated item fields to return (default: all). */
+  fields?: string;
+  /** Comma-separated IDs to look up instead of listing; returns a `BatchResponse` of details. */
+  ids?: string;
 }
 
 // =============================================================================
@@ -188,6 +220,12 @@ export interface HackQueryParams {
   page_size?: number;
   sort_by?: string;
   sort_order?: "asc" | "desc";
+  /** Comma-separated facets to count per value. */
+  facets?: string;
+  /** Comma-separated item fields to return (default: all). */
+  fields?: string;
+  /** Comma-separated IDs to look up instead of listing; returns a `BatchResponse` of details. */
+  ids?: string;
 }
 
 // =============================================================================
@@ -240,6 +278,12 @@ export interface TranslationQueryParams {
   page_size?: number;
   sort_by?: string;
   sort_order?: "asc" | "desc";
+  /** Comma-separated facets to count per value. */
+  facets?: string;
+  /** Comma-separated item fields to return (default: all). */
+  fields?: string;
+  /** Comma-separated IDs to look up instead of listing; returns a `BatchResponse` of details. */
+  ids?: string;
 }
 
 // =============================================================================
@@ -275,6 +319,7 @@ export interface UtilityDetail extends UtilityListItem {
 
 export interface UtilityQueryParams {
   q?: string;
+  game?: number;
   category?: number;
   console?: number;
   os?: number;
@@ -282,6 +327,12 @@ export interface UtilityQueryParams {
   page_size?: number;
   sort_by?: string;
   sort_order?: "asc" | "desc";
+  /** Comma-separated facets to count per value. */
+  facets?: string;
+  /** Comma-separated item fields to return (default: all). */
+  fields?: string;
+  /** Comma-separated IDs to look up instead of listing; returns a `BatchResponse` of details. */
+  ids?: string;
 }
 
 // =============================================================================
@@ -315,6 +366,7 @@ export interface DocumentDetail extends DocumentListItem {
 
 export interface DocumentQueryParams {
   q?: string;
+  game?: number;
   category?: number;
   console?: number;
   skill_level?: number;
@@ -322,6 +374,12 @@ export interface DocumentQueryParams {
   page_size?: number;
   sort_by?: string;
   sort_order?: "asc" | "desc";
+  /** Comma-separated facets to count per value. */
+  facets?: string;
+  /** Comma-separated item fields to return (default: all). */
+  fields?: string;
+  /** Comma-separated IDs to look up instead of listing; returns a `BatchResponse` of details. */
+  ids?: string;
 }
 
 // =============================================================================
@@ -360,5 +418,85 @@ export interface HomebrewQueryParams {
   page_size?: number;
   sort_by?: string;
   sort_order?: "asc" | "desc";
+  /** Comma-separated facets to count per value. */
+  facets?: string;
+  /** Comma-separated item fields to return (default: all). */
+  fields?: string;
+  /** Comma-separated IDs to look up instead of listing; returns a `BatchResponse` of details. */
+  ids?: string;
+}
+
+
+// =============================================================================
+// Search Types
+// =============================================================================
+
+export interface SearchSection<T> {
+  status: "ok" | "timeout" | "error" | "skipped";
+  items: T[];
+  total: number | null;
+  elapsed_ms: number | null;
+}
+
+export interface GlobalSearchResponse {
+  query: string;
+  partial: boolean;
+  elapsed_ms: number;
+  games: SearchSection<GameListItem>;
+  hacks: SearchSection<HackListItem>;
+  translations: SearchSection<TranslationListItem>;
+  utilities: SearchSection<UtilityListItem>;
+  documents: SearchSection<DocumentListItem>;
+  homebrew: SearchSection<HomebrewListItem>;
 }
 
+export interface GlobalSearchParams {
+  q: string;
+  limit?: number;
+  sections?: string;
+  include_total?: boolean;
+}
+
+export interface Suggestion {
+  section: "games" | "hacks" | "utilities" | "documents" | "homebrew";
+  id: number;
+  title: string;
+  downloads: number;
+}
+
+export interface SuggestResponse {
+  query: string;
+  items: Suggestion[];
+}
+
+export interface SuggestParams {
+  q: string;
+  limit?: number;
+  sections?: string;
+}
+
+// =============================================================================
+// Batch Types
+// =============================================================================
+
+export interface BatchRequestItem {
+  /** Client reference, echoed in the result. */
+  id?: string;
+  /** HTTP method (only GET is supported). */
+  method?: "GET";
+  /** Path relative to /api/v1, with its query string. */
+  path: string;
+}
+
+export interface BatchResultItem<T = unknown> {
+  id: string | null;
+  path: string;
+  status: number;
+  body: T;
+  elapsed_ms: number;
+}
+
+export interface BatchResult {
+  results: BatchResultItem[];
+  elapsed_ms: number;
+}
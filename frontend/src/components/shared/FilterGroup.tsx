@@ -3,6 +3,7 @@ import { Input } from "@/components/ui/input";
 import { ScrollArea } from "@/components/ui/scroll-area";
 import { cn } from "@/utils/cn";
 import { Search, Check } from "lucide-react";
+import type { FacetValue } from "@/api/types";
 
 interface FilterOption {
   id: number;
@@ -14,11 +15,25 @@ interface FilterGroupProps {
   options: FilterOption[];
   selected: number[];
   onChange: (selected: number[]) => void;
+  /** Result count per option id (from a list response's `facets`). */
+  counts?: Record<number, number>;
   searchable?: boolean;
   maxHeight?: string;
   className?: string;
 }
 
+/**
+ * Map one facet of a list response to FilterGroup counts.
+ */
+export function facetCounts(
+  facets: Record<string, FacetValue[]> | null | undefined,
+  name: string
+): Record<number, number> | undefined {
+  const values = facets?.[name];
+  if (!values) return undefined;
+  return Object.fromEntries(values.map((v) => [v.value, v.count]));
+}
+
 /**
  * Searchable checkbox list for metadata facets.
  */
@@ -27,6 +42,7 @@ export function FilterGroup({
   options,
   selected,
   onChange,
+  counts,
   searchable = true,
   maxHeight = "200px",
   className,
@@ -94,6 +110,11 @@ export function FilterGroup({
                   <span className="truncate flex-1 text-left">
                     {option.label}
                   </span>
+                  {counts && (
+                    <span className="tabular-nums text-muted-foreground">
+                      {counts[option.id] ?? 0}
+                    </span>
+                  )}
                 </button>
               );
             })
@@ -3,9 +3,7 @@ import { Command } from "cmdk";
 import { useNavigate } from "react-router-dom";
 import { Search, Gamepad2, Wrench, Languages, Loader2 } from "lucide-react";
 import { cn } from "@/utils/cn";
-import { useGames } from "@/hooks/useGames";
-import { useHacks } from "@/hooks/useHacks";
-import { useTranslations } from "@/hooks/useTranslations";
+import { useGlobalSearch, useSuggestions } from "@/hooks/useSearch";
 import { useDebounce } from "@/hooks/useDebounce";
 
 interface GlobalSearchProps {
@@ -21,23 +19,23 @@ export function GlobalSearch({ open, onOpenChange }: GlobalSearchProps) {
   const [search, setSearch] = React.useState("");
   const debouncedSearch = useDebounce(search, 300);
 
-  // Fetch results when search changes
-  const { data: gamesData, isLoading: gamesLoading } = useGames(
-    { q: debouncedSearch, page_size: 5 },
+  // Fetch results when search changes (one request for every rendered section)
+  const { data, isLoading } = useGlobalSearch(
+    { q: debouncedSearch, limit: 5, sections: "games,hacks,translations" },
     { enabled: debouncedSearch.length >= 2 }
   );
-  const { data: hacksData, isLoading: hacksLoading } = useHacks(
-    { q: debouncedSearch, page_size: 5 },
-    { enabled: debouncedSearch.length >= 2 }
+  // Suggestions follow every keystroke; they are answered from server memory
+  const { data: suggestData } = useSuggestions(
+    { q: search.trim(), limit: 5 },
+    { enabled: search.trim().length >= 2 }
   );
-  const { data: translationsData, isLoading: translationsLoading } =
-    useTranslations(
-      { q: debouncedSearch, page_size: 5 },
-      { enabled: debouncedSearch.length >= 2 }
-    );
+  const suggestions = suggestData?.items ?? [];
+  const gamesData = data?.games;
+  const hacksData = data?.hacks;
+  const translationsData = data?.translations;
 
-  const isLoading = gamesLoading || hacksLoading || translationsLoading;
   const hasResults =
+    suggestions.length > 0 ||
     (gamesData?.items?.length || 0) > 0 ||
     (hacksData?.items?.length || 0) > 0 ||
     (translationsData?.items?.length || 0) > 0;
@@ -100,6 +98,31 @@ export function GlobalSearch({ open, onOpenChange }: GlobalSearchProps) {
               </Command.Empty>
             ) : (
               <>
+                {/* Suggestions */}
+                {suggestions.length > 0 && (
+                  <Command.Group heading="Suggestions">
+                    {suggestions.map((suggestion) => (
+                      <Command.Item
+                        key={`suggest-${suggestion.section}-${suggestion.id}`}
+                        value={`suggest-${suggestion.section}-${suggestion.id}`}
+                        onSelect={() =>
+                          handleSelect(`/${suggestion.section}/${suggestion.id}`)
+                        }
+                        className={cn(
+                          "flex items-center gap-2 rounded-md px-2 py-2 text-sm cursor-pointer",
+                          "aria-selected:bg-accent aria-selected:text-accent-foreground"
+                        )}
+                      >
+                        <Search className="h-4 w-4 text-muted-foreground" />
+                        <span className="flex-1 truncate">{suggestion.title}</span>
+                        <span className="text-xs capitalize text-muted-foreground">
+                          {suggestion.section}
+                        </span>
+                      </Command.Item>
+                    ))}
+                  </Command.Group>
+                )}
+
                 {/* Games */}
                 {gamesData?.items && gamesData.items.length > 0 && (
                   <Command.Group heading="Games">
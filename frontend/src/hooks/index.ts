@@ -33,6 +33,12 @@ export { useDocuments, useDocument } from "./useDocuments";
 // Homebrew hooks
 export { useHomebrews, useHomebrew } from "./useHomebrew";
 
+// Search hooks
+export { useGlobalSearch, useSuggestions } from "./useSearch";
+
+// Batch hooks
+export { fetchBatch, useDashboard } from "./useBatch";
+
 // Common utility hooks
 export { useDebounce } from "./useDebounce";
 export { useUrlState } from "./useUrlState";
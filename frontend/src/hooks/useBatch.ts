@@ -0,0 +1,68 @@
+import { useQuery, useQueryClient, type QueryKey } from "@tanstack/react-query";
+import { apiClient } from "@/api/client";
+import type {
+  AllMetadata,
+  BatchRequestItem,
+  BatchResult,
+  GameListItem,
+  HackListItem,
+  HealthResponse,
+  PaginatedResponse,
+  TranslationListItem,
+} from "@/api/types";
+
+/**
+ * Runs several GET requests in one round trip; results are in request order.
+ */
+export async function fetchBatch(requests: BatchRequestItem[]): Promise<BatchResult> {
+  const response = await apiClient.post<BatchResult>("/batch", { requests });
+  return response.data;
+}
+
+/** A request of a batch and the query its response is cached under. */
+interface BatchedQuery {
+  queryKey: QueryKey;
+  path: string;
+}
+
+const DASHBOARD_QUERIES = {
+  health: { queryKey: ["health"], path: "/health" },
+  games: { queryKey: ["games", { page_size: 1 }], path: "/games?page_size=1" },
+  hacks: { queryKey: ["hacks", { page_size: 1 }], path: "/hacks?page_size=1" },
+  translations: {
+    queryKey: ["translations", { page_size: 1 }],
+    path: "/translations?page_size=1",
+  },
+  metadata: { queryKey: ["metadata"], path: "/metadata" },
+} satisfies Record<string, BatchedQuery>;
+
+export interface DashboardData {
+  health?: HealthResponse;
+  games?: PaginatedResponse<GameListItem>;
+  hacks?: PaginatedResponse<HackListItem>;
+  translations?: PaginatedResponse<TranslationListItem>;
+  metadata?: AllMetadata;
+}
+
+/**
+ * Hook to load everything the dashboard shows with a single batch request.
+ * Successful responses also seed the matching per-endpoint queries.
+ */
+export function useDashboard() {
+  const queryClient = useQueryClient();
+  return useQuery({
+    queryKey: ["dashboard"],
+    queryFn: async (): Promise<DashboardData> => {
+      const entries = Object.entries(DASHBOARD_QUERIES);
+      const { results } = await fetchBatch(entries.map(([id, { path }]) => ({ id, path })));
+      const data: Record<string, unknown> = {};
+      results.forEach((result, i) => {
+        if (result.status !== 200) return;
+        const [id, { queryKey }] = entries[i];
+        queryClient.setQueryData(queryKey, result.body);
+        data[id] = result.body;
+      });
+      return data as DashboardData;
+    },
+  });
+}
@@ -2,6 +2,7 @@ import { useQuery, type UseQueryOptions } from "@tanstack/react-query";
 import { apiClient } from "@/api/client";
 import type {
   GameDetail,
+  GameInclude,
   GameListItem,
   GameQueryParams,
   HackListItem,
@@ -52,20 +53,32 @@ export function useGames(params: GameQueryParams = {}, options?: GamesQueryOptio
 }
 
 /**
- * Fetches a single game by ID.
+ * Fetches a single game by ID, embedding the first page of each included section.
  */
-async function fetchGame(gamekey: number): Promise<GameDetail> {
-  const response = await apiClient.get<GameDetail>(`/games/${gamekey}`);
+async function fetchGame(
+  gamekey: number,
+  include: GameInclude[] = [],
+  includePageSize: number = 50
+): Promise<GameDetail> {
+  const query = include.length
+    ? `?include=${include.join(",")}&include_page_size=${includePageSize}`
+    : "";
+  const response = await apiClient.get<GameDetail>(`/games/${gamekey}${query}`);
   return response.data;
 }
 
 /**
- * Hook to fetch a single game with details.
+ * Hook to fetch a single game with details and, optionally, the first page
+ * of its related content in the same request.
  */
-export function useGame(gamekey: number) {
+export function useGame(
+  gamekey: number,
+  include: GameInclude[] = [],
+  includePageSize: number = 50
+) {
   return useQuery({
-    queryKey: ["games", gamekey],
-    queryFn: () => fetchGame(gamekey),
+    queryKey: ["games", gamekey, { include, includePageSize }],
+    queryFn: () => fetchGame(gamekey, include, includePageSize),
     enabled: !!gamekey,
   });
 }
@@ -87,11 +100,16 @@ async function fetchGameHacks(
 /**
  * Hook to fetch hacks for a specific game.
  */
-export function useGameHacks(gamekey: number, page: number = 1, pageSize: number = 50) {
+export function useGameHacks(
+  gamekey: number,
+  page: number = 1,
+  pageSize: number = 50,
+  enabled: boolean = true
+) {
   return useQuery({
     queryKey: ["games", gamekey, "hacks", { page, pageSize }],
     queryFn: () => fetchGameHacks(gamekey, page, pageSize),
-    enabled: !!gamekey,
+    enabled: !!gamekey && enabled,
   });
 }
 
@@ -115,11 +133,12 @@ async function fetchGameTranslations(
 export function useGameTranslations(
   gamekey: number,
   page: number = 1,
-  pageSize: number = 50
+  pageSize: number = 50,
+  enabled: boolean = true
 ) {
   return useQuery({
     queryKey: ["games", gamekey, "translations", { page, pageSize }],
     queryFn: () => fetchGameTranslations(gamekey, page, pageSize),
-    enabled: !!gamekey,
+    enabled: !!gamekey && enabled,
   });
 }
@@ -0,0 +1,70 @@
+import { useQuery, type UseQueryOptions } from "@tanstack/react-query";
+import { apiClient } from "@/api/client";
+import type {
+  GlobalSearchParams,
+  GlobalSearchResponse,
+  SuggestParams,
+  SuggestResponse,
+} from "@/api/types";
+
+/**
+ * Searches every content section in a single request.
+ */
+async function fetchGlobalSearch(
+  params: GlobalSearchParams
+): Promise<GlobalSearchResponse> {
+  const response = await apiClient.get<GlobalSearchResponse>("/search", {
+    params,
+  });
+  return response.data;
+}
+
+type GlobalSearchQueryOptions = Omit<
+  UseQueryOptions<GlobalSearchResponse>,
+  "queryKey" | "queryFn"
+>;
+
+/**
+ * Hook to search games, hacks, translations and the other sections at once.
+ */
+export function useGlobalSearch(
+  params: GlobalSearchParams,
+  options?: GlobalSearchQueryOptions
+) {
+  return useQuery({
+    queryKey: ["search", params],
+    queryFn: () => fetchGlobalSearch(params),
+    ...options,
+  });
+}
+
+/**
+ * Fetches title suggestions for a prefix.
+ */
+async function fetchSuggestions(params: SuggestParams): Promise<SuggestResponse> {
+  const response = await apiClient.get<SuggestResponse>("/search/suggest", {
+    params,
+  });
+  return response.data;
+}
+
+type SuggestionsQueryOptions = Omit<
+  UseQueryOptions<SuggestResponse>,
+  "queryKey" | "queryFn"
+>;
+
+/**
+ * Hook for as-you-type title suggestions (served from server memory, cheap
+ * enough to call on every keystroke without debouncing).
+ */
+export function useSuggestions(
+  params: SuggestParams,
+  options?: SuggestionsQueryOptions
+) {
+  return useQuery({
+    queryKey: ["search", "suggest", params],
+    queryFn: () => fetchSuggestions(params),
+    staleTime: 5 * 60 * 1000,
+    ...options,
+  });
+}
@@ -1,5 +1,4 @@
-import { useHealth } from "@/hooks/useHealth";
-import { useGames, useHacks, useTranslations, useMetadata } from "@/hooks";
+import { useDashboard } from "@/hooks";
 import {
   Card,
   CardContent,
@@ -22,35 +21,34 @@ import { Link } from "react-router-dom";
  * Dashboard page with archive metrics and system status.
  */
 export function DashboardPage() {
-  const { data: health, isLoading: healthLoading } = useHealth();
-  const { data: gamesData, isLoading: gamesLoading } = useGames({ page_size: 1 });
-  const { data: hacksData, isLoading: hacksLoading } = useHacks({ page_size: 1 });
-  const { data: translationsData, isLoading: translationsLoading } = useTranslations({ page_size: 1 });
-  const { data: metadata, isLoading: metadataLoading } = useMetadata();
+  // Every panel is loaded by one batch request
+  const { data: dashboard, isLoading } = useDashboard();
+  const health = dashboard?.health;
+  const metadata = dashboard?.metadata;
 
   const stats = [
     {
       label: "Total Games",
-      value: gamesData?.total,
+      value: dashboard?.games?.total,
       icon: Gamepad2,
       link: "/games",
-      loading: gamesLoading,
+      loading: isLoading,
       color: "text-blue-500",
     },
     {
       label: "ROM Hacks",
-      value: hacksData?.total,
+      value: dashboard?.hacks?.total,
       icon: Wrench,
       link: "/hacks",
-      loading: hacksLoading,
+      loading: isLoading,
       color: "text-green-500",
     },
     {
       label: "Translations",
-      value: translationsData?.total,
+      value: dashboard?.translations?.total,
       icon: Languages,
       link: "/translations",
-      loading: translationsLoading,
+      loading: isLoading,
       color: "text-purple-500",
     },
   ];
@@ -102,7 +100,7 @@ export function DashboardPage() {
             <CardDescription>Backend and database connectivity</CardDescription>
           </CardHeader>
           <CardContent className="space-y-4">
-            {healthLoading ? (
+            {isLoading ? (
               <div className="space-y-2">
                 <Skeleton className="h-4 w-full" />
                 <Skeleton className="h-4 w-full" />
@@ -160,7 +158,7 @@ export function DashboardPage() {
             <CardDescription>Reference data categories</CardDescription>
           </CardHeader>
           <CardContent>
-            {metadataLoading ? (
+            {isLoading ? (
               <div className="space-y-2">
                 <Skeleton className="h-4 w-full" />
                 <Skeleton className="h-4 w-full" />
@@ -15,10 +15,11 @@ import { Tabs, TabsContent, TabsList, TabsTrigger } from "@/components/ui/tabs";
 import { Button } from "@/components/ui/button";
 import { Skeleton } from "@/components/ui/skeleton";
 import { type ColumnDef } from "@tanstack/react-table";
-import type { HackListItem, TranslationListItem } from "@/api/types";
+import type { GameInclude, HackListItem, TranslationListItem } from "@/api/types";
 import { ArrowLeft, Wrench, Languages, Gamepad2 } from "lucide-react";
 
 const PAGE_SIZE = 20;
+const INCLUDE: GameInclude[] = ["hacks", "translations"];
 
 /**
  * Game details page with hacks and translations tabs.
@@ -32,14 +33,25 @@ export function GameDetailPage() {
   const [hacksPage, setHacksPage] = React.useState(1);
   const [translationsPage, setTranslationsPage] = React.useState(1);
 
-  const { data: game, isLoading: gameLoading, isError } = useGame(gameId);
-  const { data: hacksData, isLoading: hacksLoading } = useGameHacks(
+  // The first page of each tab comes with the game; later pages are fetched on demand
+  const { data: game, isLoading: gameLoading, isError } = useGame(
     gameId,
-    hacksPage,
+    INCLUDE,
     PAGE_SIZE
   );
-  const { data: translationsData, isLoading: translationsLoading } =
-    useGameTranslations(gameId, translationsPage, PAGE_SIZE);
+  const hacksQuery = useGameHacks(gameId, hacksPage, PAGE_SIZE, hacksPage > 1);
+  const translationsQuery = useGameTranslations(
+    gameId,
+    translationsPage,
+    PAGE_SIZE,
+    translationsPage > 1
+  );
+  const hacksData = hacksPage > 1 ? hacksQuery.data : game?.hacks;
+  const hacksLoading = hacksPage > 1 ? hacksQuery.isLoading : gameLoading;
+  const translationsData =
+    translationsPage > 1 ? translationsQuery.data : game?.translations;
+  const translationsLoading =
+    translationsPage > 1 ? translationsQuery.isLoading : gameLoading;
 
   // Hack columns
   const hackColumns: ColumnDef<HackListItem>[] = React.useMemo(
@@ -1,7 +1,7 @@
 import * as React from "react";
 import { useNavigate, useSearchParams } from "react-router-dom";
 import { useUtilities, useMetadata } from "@/hooks";
-import { FilterGroup } from "@/components/shared/FilterGroup";
+import { FilterGroup, facetCounts } from "@/components/shared/FilterGroup";
 import { Pagination } from "@/components/shared/Pagination";
 import { EmptyState } from "@/components/shared/EmptyState";
 import { StatusBadge } from "@/components/shared/StatusBadge";
@@ -56,6 +56,7 @@ export function UtilitiesPage() {
     os: osFilter,
     page: currentPage,
     page_size: PAGE_SIZE,
+    facets: "category,console,os",
   });
 
   const updateParams = (
@@ -176,6 +177,7 @@ export function UtilitiesPage() {
               <FilterGroup
                 title="Category"
                 options={categoryOptions}
+                counts={facetCounts(data?.facets, "category")}
                 selected={categoryFilter !== undefined ? [categoryFilter] : []}
                 onChange={(selected) =>
                   updateParams({ category: selected[0], page: 1 })
@@ -186,6 +188,7 @@ export function UtilitiesPage() {
               <FilterGroup
                 title="Console"
                 options={consoleOptions}
+                counts={facetCounts(data?.facets, "console")}
                 selected={consoleFilter !== undefined ? [consoleFilter] : []}
                 onChange={(selected) =>
                   updateParams({ console: selected[0], page: 1 })
@@ -196,6 +199,7 @@ export function UtilitiesPage() {
               <FilterGroup
                 title="Operating System"
                 options={osOptions}
+                counts={facetCounts(data?.facets, "os")}
                 selected={osFilter !== undefined ? [osFilter] : []}
                 onChange={(selected) =>
                   updateParams({ os: selected[0], page: 1 })
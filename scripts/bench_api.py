@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+API Latency Benchmark for RomHacking.net Archive Explorer
+
+Measures p50/p95/p99 latency of the list endpoints against a running server.
+To compare server-side strategies, run it once per server configuration
+and compare the reports, e.g. for concurrent count/page queries:
+
+    COUNT_CACHE_TTL_SECONDS=0 CONCURRENT_COUNT_QUERIES=false uvicorn main:app
+    python scripts/bench_api.py --label sequential
+
+    COUNT_CACHE_TTL_SECONDS=0 CONCURRENT_COUNT_QUERIES=true uvicorn main:app
+    python scripts/bench_api.py --label concurrent
+
+Disabling the count cache (TTL 0) makes every request pay for its COUNT query.
+
+Usage:
+    python scripts/bench_api.py [--base-url URL] [--requests N] [--concurrency N] [--label NAME]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+import requests
+from requests.exceptions import RequestException
+
+# Search terms used to vary filters between requests
+SEARCH_TERMS = ["mario", "zelda", "metroid", "pokemon", "sonic", "final", "dragon", "mega"]
+
+
+@dataclass
+class Scenario:
+    """A benchmarked endpoint and a generator for its query parameters."""
+
+    name: str
+    endpoint: str
+    params: Callable[[random.Random], dict[str, Any]]
+
+
+@dataclass
+class ScenarioResult:
+    """Latency samples collected for one scenario."""
+
+    name: str
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def percentile(self, pct: float) -> float:
+        """Return the given percentile of the collected latencies."""
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+        return ordered[index]
+
+
+SCENARIOS = [
+    Scenario(
+        "hacks: page 1",
+        "/hacks",
+        lambda rnd: {"page": 1, "page_size": 50},
+    ),
+    Scenario(
+        "hacks: search + console",
+        "/hacks",
+        lambda rnd: {"q": rnd.choice(SEARCH_TERMS), "console": rnd.randint(1, 40)},
+    ),
+    Scenario(
+        "hacks: deep page",
+        "/hacks",
+        lambda rnd: {"page": rnd.randint(50, 200), "page_size": 50},
+    ),
+    Scenario(
+        "translations: page 1",
+        "/translations",
+        lambda rnd: {"page": 1, "page_size": 50},
+    ),
+    Scenario(
+        "translations: search + language",
+        "/translations",
+        lambda rnd: {"q": rnd.choice(SEARCH_TERMS), "language": rnd.randint(1, 20)},
+    ),
+]
+
+
+class Benchmark:
+    """Runs each scenario with a pool of concurrent clients."""
+
+    def __init__(self, base_url: str, total_requests: int, concurrency: int, seed: int):
+        self.base_url = base_url.rstrip("/")
+        self.total_requests = total_requests
+        self.concurrency = concurrency
+        self.rnd = random.Random(seed)
+        self.session = requests.Session()
+
+    def _request(self, endpoint: str, params: dict[str, Any]) -> float | None:
+        """Issue one GET request and return its latency in ms (None on failure)."""
+        try:
+            start = time.perf_counter()
+            response = self.session.get(f"{self.base_url}{endpoint}", params=params, timeout=30)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        except RequestException:
+            return None
+        return elapsed_ms if response.status_code == 200 else None
+
+    def run_scenario(self, scenario: Scenario) -> ScenarioResult:
+        """Warm up, then collect latency samples for a scenario."""
+        result = ScenarioResult(name=scenario.name)
+        params = [scenario.params(self.rnd) for _ in range(self.total_requests)]
+
+        # Warm-up request so connection setup is not measured
+        self._request(scenario.endpoint, params[0])
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for latency in pool.map(lambda p: self._request(scenario.endpoint, p), params):
+                if latency is None:
+                    result.errors += 1
+                else:
+                    result.latencies_ms.append(latency)
+        return result
+
+    def run(self, label: str) -> list[ScenarioResult]:
+        """Run every scenario and print a latency report."""
+        print(f"\n📊 Benchmark [{label}] {self.total_requests} requests x {self.concurrency} clients")
+        print(f"{'Scenario':<34} {'p50':>9} {'p95':>9} {'p99':>9} {'mean':>9} {'errors':>7}")
+        print("-" * 82)
+        results = []
+        for scenario in SCENARIOS:
+            result = self.run_scenario(scenario)
+            mean = statistics.fmean(result.latencies_ms) if result.latencies_ms else 0.0
+            print(
+                f"{result.name:<34} "
+                f"{result.percentile(50):>7.1f}ms "
+                f"{result.percentile(95):>7.1f}ms "
+                f"{result.percentile(99):>7.1f}ms "
+                f"{mean:>7.1f}ms "
+                f"{result.errors:>7}"
+            )
+            results.append(result)
+        return results
+
+
+def main() -> None:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark RomHacking.net API list endpoint latency",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--base-url",
+        default="http://127.0.0.1:8000/api/v1",
+        help="Base URL for the API (default: http://127.0.0.1:8000/api/v1)",
+    )
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for query parameters")
+    parser.add_argument("--label", default="run", help="Label printed in the report header")
+
+    args = parser.parse_args()
+
+    bench = Benchmark(args.base_url, args.requests, args.concurrency, args.seed)
+    results = bench.run(args.label)
+    sys.exit(1 if any(r.errors for r in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
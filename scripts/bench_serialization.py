@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Serialization Microbenchmark for RomHacking.net Archive Explorer
+
+Compares the two ways a hack list page can be turned into response bytes,
+without a server or database:
+
+    models   HackListItem per row, PaginatedResponse validated again against
+             the response model and dumped (what FastAPI does for a route
+             returning models)
+    dicts    plain dict rows encoded by app.core.serialization (orjson when
+             installed, else the stdlib encoder; both are reported)
+
+Both paths must produce identical bytes; the script fails if they differ.
+
+Usage:
+    python scripts/bench_serialization.py [--rows N ...] [--iterations N]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.core import serialization  # noqa: E402
+from app.schemas import HackListItem, PaginatedResponse  # noqa: E402
+
+PAGE_MODEL = PaginatedResponse[HackListItem]
+PAGE_ADAPTER = TypeAdapter(PAGE_MODEL)
+
+
+def make_rows(count: int) -> list[dict[str, Any]]:
+    """Hack list rows shaped like the ones built by the hack service."""
+    stamp = datetime(2021, 6, 1, 12, 30, 15)
+    return [
+        {
+            "hackkey": i,
+            "hacktitle": f"Super Mario World: Return to Dinosaur Land {i}",
+            "version": "1.2",
+            "description": "Improvement hack with new levels, music and a harder final castle. " * 3,
+            "gamekey": 1000 + i % 50,
+            "consolekey": 9,
+            "category": 2,
+            "game_title": "Super Mario World",
+            "console_name": "Super Nintendo",
+            "category_name": "Improvement",
+            "downloads": 10_000 + i,
+            "releasedate": "2021-06-01",
+            "created": stamp,
+            "lastmod": None if i % 3 else stamp,
+        }
+        for i in range(count)
+    ]
+
+
+def page_fields(count: int) -> dict[str, Any]:
+    """Pagination fields of the benchmarked page."""
+    return {
+        "total": 5000,
+        "page": 1,
+        "page_size": count,
+        "total_pages": (5000 + count - 1) // count,
+        "total_accuracy": "exact",
+        "next_cursor": None,
+        "facets": None,
+    }
+
+
+def models_path(rows: list[dict[str, Any]]) -> bytes:
+    """Per-row models, response model validation, then dump."""
+    items = [HackListItem(**row) for row in rows]
+    page = PAGE_MODEL(items=items, **page_fields(len(rows)))
+    return PAGE_ADAPTER.dump_json(PAGE_ADAPTER.validate_python(page.model_dump()))
+
+
+def dicts_path(rows: list[dict[str, Any]]) -> bytes:
+    """Dict rows encoded directly."""
+    return serialization.dumps({"items": [dict(row) for row in rows], **page_fields(len(rows))})
+
+
+def stdlib_path(rows: list[dict[str, Any]]) -> bytes:
+    """Dict rows encoded with the stdlib fallback."""
+    return serialization.dumps_stdlib(
+        {"items": [dict(row) for row in rows], **page_fields(len(rows))}
+    )
+
+
+def measure(
+    fn: Callable[[list[dict[str, Any]]], bytes], rows: list[dict[str, Any]], iterations: int
+) -> float:
+    """Median time of one call in milliseconds."""
+    fn(rows)
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(rows)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Compare model and dict serialization of list pages",
+        epilog=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[20, 50, 200], help="Page sizes to benchmark"
+    )
+    parser.add_argument("--iterations", type=int, default=200, help="Timed calls per path")
+    args = parser.parse_args()
+
+    paths = [("models", models_path), ("dicts", dicts_path)]
+    if serialization.orjson is not None:
+        paths.append(("dicts (stdlib)", stdlib_path))
+    else:
+        print("⚠️  orjson is not installed; dicts use the stdlib encoder")
+
+    print(f"\n📊 Serialization [{args.iterations} iterations, median ms per page]")
+    print(f"{'Rows':>6} {'Path':<16} {'ms':>9} {'speedup':>9} {'bytes':>9}")
+    print("-" * 53)
+    for count in args.rows:
+        rows = make_rows(count)
+        expected = models_path(rows)
+        baseline = None
+        for name, fn in paths:
+            if fn(rows) != expected:
+                sys.exit(f"❌ {name} output differs from the models path ({count} rows)")
+            elapsed = measure(fn, rows, args.iterations)
+            baseline = baseline or elapsed
+            print(f"{count:>6} {name:<16} {elapsed:>9.3f} {baseline / elapsed:>8.1f}x {len(expected):>9}")
+    print("\n✅ All paths produced identical bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,19 +7,33 @@ Run this after starting the backend server with:
     uvicorn main:app --host 127.0.0.1 --port 8000
 
 Usage:
-    python scripts/test_api.py [--base-url URL] [--verbose]
+    python scripts/test_api.py [--base-url URL] [--verbose] [--without-title-index]
+
+Pass --without-title-index when the server runs with TITLE_INDEX_ENABLED=false,
+so suggestions are expected to be unavailable (503).
 """
 
 import argparse
 import json
+import re
 import sys
 import time
+from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any
 
 import requests
 from requests.exceptions import ConnectionError, RequestException
 
+# Global search sections and the key of their items
+SEARCH_SECTIONS = {
+    "games": "gamekey",
+    "hacks": "hackkey",
+    "translations": "transkey",
+    "utilities": "utilkey",
+    "documents": "dockey",
+    "homebrew": "homebrewkey",
+}
 
 @dataclass
 class TestResult:
@@ -38,15 +52,17 @@ class TestResult:
 class APITester:
     """Test runner for the RomHacking.net API."""
 
-    def __init__(self, base_url: str, verbose: bool = False):
+    def __init__(self, base_url: str, verbose: bool = False, title_index: bool = True):
         self.base_url = base_url.rstrip("/")
         self.verbose = verbose
+        self.title_index = title_index
         self.results: list[TestResult] = []
         self.session = requests.Session()
 
         # Store IDs discovered during testing for chained tests
         self.discovered_ids: dict[str, int | None] = {
             "game_id": None,
+            "game_with_hacks_id": None,
             "hack_id": None,
             "translation_id": None,
             "utility_id": None,
@@ -80,6 +96,12 @@ class APITester:
         except RequestException as e:
             return None, 0, str(e)
 
+    def _get_json(self, endpoint: str, params: dict[str, Any] | None = None) -> Any:
+        """GET an endpoint for a check; raises on transport or HTTP errors."""
+        response = self.session.get(f"{self.base_url}{endpoint}", params=params, timeout=30)
+        response.raise_for_status()
+        return response.json()
+
     def _format_response_preview(self, response: requests.Response, max_length: int = 200) -> str:
         """Format a preview of the response body."""
         try:
@@ -103,8 +125,15 @@ class APITester:
         json_data: dict[str, Any] | None = None,
         expected_status: int = 200,
         extract_id: str | None = None,
+        expected_headers: tuple[str, ...] = (),
+        check: Callable[[requests.Response], str | None] | None = None,
     ) -> TestResult:
-        """Test a single API endpoint."""
+        """
+        Test a single API endpoint.
+
+        ``check`` inspects a response with the expected status and returns an
+        error message, or None if the response is as expected.
+        """
         response, elapsed_ms, error = self._make_request(method, endpoint, params, json_data)
 
         if error:
@@ -119,6 +148,16 @@ class APITester:
             )
         else:
             passed = response.status_code == expected_status
+            missing = [h for h in expected_headers if h not in response.headers]
+            if missing:
+                passed = False
+                error = f"Missing header(s): {', '.join(missing)}"
+            elif passed and check:
+                try:
+                    error = check(response)
+                except (RequestException, ValueError, KeyError, IndexError, TypeError) as e:
+                    error = f"Unexpected response: {e!r}"
+                passed = error is None
             preview = self._format_response_preview(response) if self.verbose else None
 
             # Extract ID from response if requested
@@ -144,6 +183,7 @@ class APITester:
                 passed=passed,
                 status_code=response.status_code,
                 response_time_ms=elapsed_ms,
+                error=error,
                 response_preview=preview,
             )
 
@@ -157,6 +197,7 @@ class APITester:
         print("=" * 60)
         print(f"📍 Base URL: {self.base_url}")
         print(f"🔍 Verbose: {self.verbose}")
+        print(f"🗂️  Title index: {self.title_index}")
         print("=" * 60 + "\n")
 
         # Health Check
@@ -183,6 +224,12 @@ class APITester:
         # Homebrew Tests
         self._run_homebrew_tests()
 
+        # Search Tests
+        self._run_search_tests()
+
+        # Batch Tests
+        self._run_batch_tests()
+
         # Logging Tests
         self._run_logging_tests()
 
@@ -199,6 +246,11 @@ class APITester:
         self._print_section("Metadata Endpoints")
 
         self._run_test("Get All Metadata", "/metadata")
+        self._run_test(
+            "Get All Metadata (ETag per content coding)",
+            "/metadata",
+            check=self._check_coding_etags,
+        )
         self._run_test("Get Consoles", "/metadata/consoles")
         self._run_test("Get Genres", "/metadata/genres")
         self._run_test("Get Languages", "/metadata/languages")
@@ -222,12 +274,31 @@ class APITester:
             extract_id="game_id",
         )
 
+        self._run_test(
+            "List Games (revalidated, 304 keeps Vary)",
+            "/games",
+            params={"page": 1, "page_size": 10},
+            check=self._check_not_modified_vary,
+        )
+
         # Test with filters
+        cursor_params = {"sort_by": "genreid", "sort_order": "asc", "page_size": 20}
+        self._run_test(
+            "List Games (following next_cursor)",
+            "/games",
+            params=cursor_params,
+            check=lambda r: self._check_cursor_pages(r, "/games", cursor_params, "gamekey"),
+        )
         self._run_test(
             "List Games (with search)",
             "/games",
             params={"q": "mario", "page": 1, "page_size": 10},
         )
+        self._run_test(
+            "List Games (with search shorter than a trigram)",
+            "/games",
+            params={"q": "ma", "page": 1, "page_size": 10},
+        )
         self._run_test(
             "List Games (with platform filter)",
             "/games",
@@ -237,6 +308,7 @@ class APITester:
             "List Games (with has_hacks filter)",
             "/games",
             params={"has_hacks": True, "page": 1, "page_size": 10},
+            extract_id="game_with_hacks_id",
         )
 
         # Detail tests using discovered ID
@@ -259,6 +331,17 @@ class APITester:
         else:
             print("  ⚠️  Skipping game detail tests (no game ID found)")
 
+        game_id = self.discovered_ids.get("game_with_hacks_id")
+        if game_id:
+            self._run_test(
+                "Get Game Details (with include)",
+                f"/games/{game_id}",
+                params={"include": "hacks,translations", "include_page_size": 5},
+                check=lambda r: self._check_included(r, f"/games/{game_id}", 5),
+            )
+        else:
+            print("  ⚠️  Skipping game include tests (no game with hacks found)")
+
     def _run_hacks_tests(self) -> None:
         """Run hacks endpoint tests."""
         self._print_section("Hacks Endpoints")
@@ -277,6 +360,41 @@ class APITester:
             "/hacks",
             params={"q": "kaizo", "page": 1, "page_size": 10},
         )
+        cursor_params = {"sort_by": "downloads", "sort_order": "desc", "page_size": 20}
+        self._run_test(
+            "List Hacks (following next_cursor)",
+            "/hacks",
+            params=cursor_params,
+            check=lambda r: self._check_cursor_pages(r, "/hacks", cursor_params, "hackkey"),
+        )
+        self._run_test(
+            "List Hacks (by ids, in request order)",
+            "/hacks",
+            params={"page_size": 5},
+            check=lambda r: self._check_ids_order(r, "/hacks", "hackkey"),
+        )
+        self._run_test(
+            "List Hacks (with more than 200 ids)",
+            "/hacks",
+            params={"ids": ",".join(str(i) for i in range(1, 202))},
+            expected_status=400,
+        )
+        self._run_test(
+            "List Hacks (with search matching too many titles for the index)",
+            "/hacks",
+            params={"q": "ari", "page": 1, "page_size": 10},
+            check=lambda r: self._check_substring_search(r, "/hacks", "hacktitle", "ari"),
+        )
+        self._run_test(
+            "List Hacks (with search shorter than a trigram)",
+            "/hacks",
+            params={"q": "k", "search_mode": "substring", "page": 1, "page_size": 10},
+        )
+        self._run_test(
+            "List Hacks (with blank search)",
+            "/hacks",
+            params={"q": "   ", "page": 1, "page_size": 10},
+        )
         self._run_test(
             "List Hacks (with console filter)",
             "/hacks",
@@ -287,6 +405,13 @@ class APITester:
             "/hacks",
             params={"category": 1, "page": 1, "page_size": 10},
         )
+        facet_filters = {"q": "mario", "category": 1}
+        self._run_test(
+            "List Hacks (with facets)",
+            "/hacks",
+            params={**facet_filters, "facets": "console,category", "page_size": 10},
+            check=lambda r: self._check_facets(r, "/hacks", facet_filters),
+        )
 
         # Detail tests
         hack_id = self.discovered_ids.get("hack_id")
@@ -295,6 +420,12 @@ class APITester:
                 "Get Hack Details",
                 f"/hacks/{hack_id}",
             )
+            self._run_test(
+                "Get Hack Details (fields, Last-Modified)",
+                f"/hacks/{hack_id}",
+                params={"fields": "hacktitle"},
+                expected_headers=("Last-Modified",),
+            )
             self._run_test(
                 "Get Hack Images",
                 f"/hacks/{hack_id}/images",
@@ -330,6 +461,13 @@ class APITester:
             "/translations",
             params={"status": 1, "page": 1, "page_size": 10},
         )
+        facet_filters = {"language": 1}
+        self._run_test(
+            "List Translations (with facets)",
+            "/translations",
+            params={**facet_filters, "facets": "console,language,status", "page_size": 10},
+            check=lambda r: self._check_facets(r, "/translations", facet_filters),
+        )
 
         # Detail tests
         trans_id = self.discovered_ids.get("translation_id")
@@ -338,6 +476,12 @@ class APITester:
                 "Get Translation Details",
                 f"/translations/{trans_id}",
             )
+            self._run_test(
+                "Get Translation Details (fields, Last-Modified)",
+                f"/translations/{trans_id}",
+                params={"fields": "description"},
+                expected_headers=("Last-Modified",),
+            )
             self._run_test(
                 "Get Translation Images",
                 f"/translations/{trans_id}/images",
@@ -381,6 +525,12 @@ class APITester:
                 "Get Utility Details",
                 f"/utilities/{util_id}",
             )
+            self._run_test(
+                "Get Utility Details (fields, Last-Modified)",
+                f"/utilities/{util_id}",
+                params={"fields": "title"},
+                expected_headers=("Last-Modified",),
+            )
         else:
             print("  ⚠️  Skipping utility detail tests (no utility ID found)")
 
@@ -420,6 +570,12 @@ class APITester:
                 "Get Document Details",
                 f"/documents/{doc_id}",
             )
+            self._run_test(
+                "Get Document Details (fields, Last-Modified)",
+                f"/documents/{doc_id}",
+                params={"fields": "title"},
+                expected_headers=("Last-Modified",),
+            )
         else:
             print("  ⚠️  Skipping document detail tests (no document ID found)")
 
@@ -459,9 +615,113 @@ class APITester:
                 "Get Homebrew Details",
                 f"/homebrew/{homebrew_id}",
             )
+            self._run_test(
+                "Get Homebrew Details (fields, Last-Modified)",
+                f"/homebrew/{homebrew_id}",
+                params={"fields": "title"},
+                expected_headers=("Last-Modified",),
+            )
         else:
             print("  ⚠️  Skipping homebrew detail tests (no homebrew ID found)")
 
+    def _run_batch_tests(self) -> None:
+        """Run batch endpoint tests."""
+        self._print_section("Batch Endpoint")
+
+        requests_ = [
+            {"id": "games", "path": "/games?page_size=2"},
+            {"id": "hacks", "path": "/hacks?page_size=2&sort_by=downloads"},
+            {"id": "missing", "path": "/games/999999999"},
+        ]
+        self._run_test(
+            "Batch Requests",
+            "/batch",
+            method="POST",
+            json_data={"requests": requests_},
+            check=lambda r: self._check_batch(r, requests_, (200, 200, 404)),
+        )
+        absolute = [
+            {"path": "http://example.com/api/v1/games"},
+            {"path": "games"},
+            {"path": "/batch"},
+        ]
+        self._run_test(
+            "Batch Requests (with absolute or relative paths)",
+            "/batch",
+            method="POST",
+            json_data={"requests": absolute},
+            check=lambda r: self._check_batch(r, absolute, (400, 400, 400)),
+        )
+        self._run_test(
+            "Batch Requests (with non-GET method)",
+            "/batch",
+            method="POST",
+            json_data={"requests": [{"method": "POST", "path": "/games"}]},
+            expected_status=422,
+        )
+        self._run_test(
+            "Batch Requests (empty)",
+            "/batch",
+            method="POST",
+            json_data={"requests": []},
+            expected_status=422,
+        )
+
+    def _run_search_tests(self) -> None:
+        """Run global search endpoint tests."""
+        self._print_section("Search Endpoints")
+
+        self._run_test(
+            "Global Search",
+            "/search",
+            params={"q": "mario", "limit": 3},
+            check=lambda r: self._check_search_sections(r, tuple(SEARCH_SECTIONS), limit=3),
+        )
+        self._run_test(
+            "Global Search (with sections filter and totals)",
+            "/search",
+            params={"q": "mario", "sections": "games,hacks", "include_total": True},
+            check=lambda r: self._check_search_sections(r, ("games", "hacks"), totals=True),
+        )
+        self._run_test(
+            "Global Search (with the shortest time budget)",
+            "/search",
+            params={"q": "mario", "budget_ms": 50},
+            check=self._check_search_partial,
+        )
+        # Suggestions are served from the title index only
+        suggest_status = 200 if self.title_index else 503
+        self._run_test(
+            "Search Suggestions",
+            "/search/suggest",
+            params={"q": "mar", "limit": 8},
+            expected_status=suggest_status,
+            check=(lambda r: self._check_suggestions(r, "mar", 8)) if self.title_index else None,
+        )
+        self._run_test(
+            "Search Suggestions (with sections filter)",
+            "/search/suggest",
+            params={"q": "legend", "sections": "games"},
+            expected_status=suggest_status,
+            check=(
+                (lambda r: self._check_suggestions(r, "legend", 8, sections=("games",)))
+                if self.title_index
+                else None
+            ),
+        )
+        self._run_test(
+            "Global Search (with unknown section)",
+            "/search",
+            params={"q": "mario", "sections": "games,bogus"},
+            expected_status=400,
+        )
+        self._run_test(
+            "Global Search (with blank query)",
+            "/search",
+            params={"q": "   "},
+            expected_status=400,
+        )
+
     def _run_logging_tests(self) -> None:
         """Run logging endpoint tests."""
         self._print_section("Logging Endpoints")
@@ -480,6 +740,246 @@ class APITester:
             expected_status=201,
         )
 
+    def _check_not_modified_vary(self, response: requests.Response) -> str | None:
+        """A 304 carries the ``Vary`` of the 200 it stands for (RFC 9110 section 15.4.5)."""
+        etag = response.headers.get("ETag")
+        if etag is None:
+            return "missing ETag"
+        # An uncompressed 200 would vary by Accept-Encoding all the same
+        revalidated = self.session.get(
+            response.url,
+            headers={"If-None-Match": etag, "Accept-Encoding": "identity"},
+            timeout=30,
+        )
+        if revalidated.status_code != 304:
+            return f"If-None-Match returned {revalidated.status_code}"
+        expected = {v.strip().lower() for v in response.headers.get("Vary", "").split(",")}
+        vary = {v.strip().lower() for v in revalidated.headers.get("Vary", "").split(",")}
+        if not expected <= vary:
+            return (
+                f"304 Vary {revalidated.headers.get('Vary')!r}, "
+                f"200 had {response.headers.get('Vary')!r}"
+            )
+        return None
+
+    def _check_batch(
+        self,
+        response: requests.Response,
+        sent: list[dict[str, str]],
+        statuses: tuple[int, ...],
+    ) -> str | None:
+        """Each sub-request gets its own status and the body the endpoint itself returns."""
+        results = response.json()["results"]
+        if len(results) != len(sent):
+            return f"{len(results)} results for {len(sent)} requests"
+        for request, result, status in zip(sent, results, statuses):
+            if (result["id"], result["path"]) != (request.get("id"), request["path"]):
+                return f"result for {result['path']} out of order"
+            if result["status"] != status:
+                return f"{request['path']} answered {result['status']}, expected {status}"
+            if status != 200:
+                if "detail" not in result["body"]:
+                    return f"{request['path']} error body has no detail"
+                continue
+            if result["body"] != self._get_json(request["path"]):
+                return f"{request['path']} body differs from a direct request"
+        return None
+
+    def _check_ids_order(
+        self, response: requests.Response, endpoint: str, key: str
+    ) -> str | None:
+        """``ids=`` returns the listed items in the requested order and reports unknown IDs."""
+        wanted = [item[key] for item in response.json()["items"]][::-1]
+        unknown = 2_000_000_000
+        data = self._get_json(endpoint, {"ids": ",".join(map(str, [*wanted, unknown]))})
+        found = [item[key] for item in data["items"]]
+        if found != wanted:
+            return f"ids={wanted} returned {found}"
+        if data["missing"] != [unknown]:
+            return f"missing is {data['missing']}, expected [{unknown}]"
+        return None
+
+    def _check_included(
+        self, response: requests.Response, endpoint: str, page_size: int
+    ) -> str | None:
+        """Embedded sections are the first page of the game's own section endpoints."""
+        data = response.json()
+        for section, key in (("hacks", "hackkey"), ("translations", "transkey")):
+            embedded = data[section]
+            if embedded is None:
+                return f"{section} not embedded"
+            page = self._get_json(f"{endpoint}/{section}", {"page_size": page_size})
+            if embedded["total"] != page["total"]:
+                return f"{section}: total {embedded['total']}, section endpoint has {page['total']}"
+            if [i[key] for i in embedded["items"]] != [i[key] for i in page["items"]]:
+                return f"{section}: items differ from {endpoint}/{section}"
+        if data.get("utilities") is not None:
+            return "utilities embedded without being included"
+        return None
+
+    def _check_facets(
+        self,
+        response: requests.Response,
+        endpoint: str,
+        filters: dict[str, Any],
+        values_per_facet: int = 3,
+    ) -> str | None:
+        """
+        Each facet value's count is the total the list returns when filtering
+        by that value as well; a facet ignores its own filter.
+        """
+        facets = response.json()["facets"]
+        if not facets:
+            return "no facets returned"
+        for name, values in facets.items():
+            for value in values[:values_per_facet]:
+                params = {**filters, name: value["value"], "page_size": 1}
+                total = self._get_json(endpoint, params)["total"]
+                if total != value["count"]:
+                    return f"{name}={value['value']}: count {value['count']}, total {total}"
+        return None
+
+    def _check_cursor_pages(
+        self,
+        response: requests.Response,
+        endpoint: str,
+        params: dict[str, Any],
+        key: str,
+        pages: int = 5,
+    ) -> str | None:
+        """
+        Following ``next_cursor`` for a few pages never skips or repeats an
+        item: the keys match one offset page of the same size and sort.
+        """
+        data = response.json()
+        walked = [item[key] for item in data["items"]]
+        for _ in range(pages - 1):
+            if not data["next_cursor"]:
+                break
+            data = self._get_json(endpoint, {**params, "cursor": data["next_cursor"]})
+            walked += [item[key] for item in data["items"]]
+        if len(set(walked)) != len(walked):
+            return "an item was repeated across cursor pages"
+        offset = self._get_json(
+            endpoint, {**params, "page": 1, "page_size": params["page_size"] * pages}
+        )
+        expected = [item[key] for item in offset["items"]]
+        if walked != expected:
+            return "cursor pages skip or reorder items compared to offset pagination"
+        return None
+
+    def _check_coding_etags(self, response: requests.Response) -> str | None:
+        """
+        Each content coding of a pre-rendered body has its own strong ETag,
+        and revalidating with any of them is answered with 304.
+        """
+        url = response.url
+        identity = self.session.get(url, headers={"Accept-Encoding": "identity"}, timeout=30)
+        gzipped = self.session.get(url, headers={"Accept-Encoding": "gzip"}, timeout=30)
+        etags = {identity.headers.get("ETag"), gzipped.headers.get("ETag")}
+        if None in etags or len(etags) != 2:
+            return f"expected one ETag per coding, got {sorted(map(str, etags))}"
+        revalidated = self.session.get(
+            url,
+            headers={"Accept-Encoding": "identity", "If-None-Match": gzipped.headers["ETag"]},
+            timeout=30,
+        )
+        if revalidated.status_code != 304:
+            return f"If-None-Match with the gzip ETag returned {revalidated.status_code}"
+        return None
+
+    def _check_search_sections(
+        self,
+        response: requests.Response,
+        searched: tuple[str, ...],
+        limit: int | None = None,
+        totals: bool = False,
+    ) -> str | None:
+        """
+        Global search results are grouped by section: searched sections hold
+        their own items (and, with ``totals``, the total of the section's list
+        endpoint), the others are skipped.
+        """
+        data = response.json()
+        for name, key in SEARCH_SECTIONS.items():
+            section = data[name]
+            if name not in searched:
+                if section["status"] != "skipped":
+                    return f"{name}: status {section['status']!r}, expected 'skipped'"
+                continue
+            if section["status"] != "ok":
+                return f"{name}: status {section['status']!r}"
+            if limit is not None and len(section["items"]) > limit:
+                return f"{name}: {len(section['items'])} items, limit {limit}"
+            if any(key not in item for item in section["items"]):
+                return f"{name}: items without {key}"
+            if totals:
+                listed = self._get_json(f"/{name}", {"q": data["query"], "page_size": 1})
+                if section["total"] != listed["total"]:
+                    return f"{name}: total {section['total']}, /{name} has {listed['total']}"
+        if data["partial"]:
+            return "partial is true although every section answered"
+        return None
+
+    def _check_suggestions(
+        self,
+        response: requests.Response,
+        prefix: str,
+        limit: int,
+        sections: tuple[str, ...] = tuple(SEARCH_SECTIONS),
+    ) -> str | None:
+        """
+        Suggestions continue ``prefix`` from the start of a word of their
+        title and are ordered by downloads, most first.
+        """
+        items = response.json()["items"]
+        if len(items) > limit:
+            return f"{len(items)} suggestions, limit {limit}"
+        for item in items:
+            if item["section"] not in sections:
+                return f"suggestion from section {item['section']!r}"
+            words = re.findall(r"\w+", item["title"].lower())
+            starts = (" ".join(words[i:]) for i in range(len(words)))
+            if not any(start.startswith(prefix) for start in starts):
+                return f"{item['title']!r} has no word starting with {prefix!r}"
+        downloads = [item["downloads"] for item in items]
+        if downloads != sorted(downloads, reverse=True):
+            return f"suggestions are not ordered by downloads: {downloads}"
+        return None
+
+    def _check_search_partial(self, response: requests.Response) -> str | None:
+        """
+        Sections that miss the time budget are reported as timed out and empty,
+        and the response is partial exactly when one timed out or failed.
+        """
+        data = response.json()
+        statuses = {name: data[name]["status"] for name in SEARCH_SECTIONS}
+        for name, status in statuses.items():
+            if status not in ("ok", "timeout", "error"):
+                return f"{name}: unexpected status {status!r}"
+            if status != "ok" and data[name]["items"]:
+                return f"{name}: {status} section has items"
+        incomplete = any(status != "ok" for status in statuses.values())
+        if data["partial"] != incomplete:
+            return f"partial is {data['partial']} with section statuses {statuses}"
+        return None
+
+    def _check_substring_search(
+        self, response: requests.Response, endpoint: str, title_key: str, q: str
+    ) -> str | None:
+        """
+        Unranked ``auto`` searches match substrings, like ``substring`` mode,
+        even when the title index declines a query with too many candidates.
+        """
+        data = response.json()
+        for item in data["items"]:
+            if q not in item[title_key].lower():
+                return f"{item[title_key]!r} does not contain {q!r}"
+        substring = self._get_json(endpoint, {"q": q, "search_mode": "substring", "page_size": 1})
+        if substring["total"] != data["total"]:
+            return f"total {data['total']} differs from substring mode ({substring['total']})"
+        return None
+
     def _run_test(
         self,
         name: str,
@@ -489,6 +989,8 @@ class APITester:
         json_data: dict[str, Any] | None = None,
         expected_status: int = 200,
         extract_id: str | None = None,
+        expected_headers: tuple[str, ...] = (),
+        check: Callable[[requests.Response], str | None] | None = None,
     ) -> None:
         """Run a single test and print the result."""
         result = self.test_endpoint(
@@ -499,6 +1001,8 @@ class APITester:
             json_data=json_data,
             expected_status=expected_status,
             extract_id=extract_id,
+            expected_headers=expected_headers,
+            check=check,
         )
 
         status_icon = "✅" if result.passed else "❌"
@@ -570,10 +1074,19 @@ def main() -> None:
         action="store_true",
         help="Show response previews",
     )
+    parser.add_argument(
+        "--without-title-index",
+        action="store_true",
+        help="The server runs without the title index (expect suggestions to answer 503)",
+    )
 
     args = parser.parse_args()
 
-    tester = APITester(base_url=args.base_url, verbose=args.verbose)
+    tester = APITester(
+        base_url=args.base_url,
+        verbose=args.verbose,
+        title_index=not args.without_title_index,
+    )
     tester.run_all_tests()
 
 